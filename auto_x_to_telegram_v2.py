@@ -4,12 +4,11 @@ import time
 import html
 import tweepy
 from tweepy.errors import TweepyException, TooManyRequests, HTTPException as TweepyHTTPException
-from typing import Optional, List
-import requests
+from typing import Optional, List, Tuple
 from requests.exceptions import RequestException, Timeout
 import re
 # from googletrans import Translator
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -21,8 +20,20 @@ import psutil
 import gc
 import feedparser
 from email.utils import parsedate_to_datetime
-from datetime import timezone, datetime
+from datetime import timezone, datetime, timedelta
 import json
+import logging
+import threading
+from translation_cache import get_translation_cache
+from telegram_outbox import get_outbox, enqueue_message
+from http_session import get_session, close_sessions
+import metrics
+import queue
+import itertools
+import math
+import heapq
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, Future, InvalidStateError
+from collections import deque, defaultdict, namedtuple
 
 load_dotenv()
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
@@ -41,20 +52,170 @@ EMOJI_PATTERN = re.compile("[\U0001F300-\U0001FAFF\U00002700-\U000027BF]+", flag
 URL_PATTERN = re.compile(r"https?://[^\s\)\]\}]+", re.IGNORECASE)
 NL_TOKEN = "[[NL]]"
 
+RATE_LIMIT_RESERVE = 1           # 엔드포인트별 남은 호출 수가 이 이하면 호출하지 않고 미룸
+RATE_LIMIT_DEFAULT_WAIT = 60     # 429인데 reset 헤더가 없을 때 미룰 시간(초)
+
+class RateLimitDeferred(Exception):
+    """호출 예산이 없어 이번 호출을 미룸 (retry_in초 뒤 다시 가능). 잠들지 않고 바로 호출 측으로 올라간다."""
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} 호출 예산 소진 → {retry_in:.0f}초 뒤 재개")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+class RateLimitTracker:
+    """
+    X API 엔드포인트별 토큰 버킷.
+    - 응답의 x-rate-limit-limit/remaining/reset 헤더로 잔량과 리셋 시각을 갱신 (서버 값이 기준)
+    - 호출 직전 acquire()로 1개 차감, 잔량이 RATE_LIMIT_RESERVE 이하면 RateLimitDeferred
+    - reset 시각이 지나면 limit까지 다시 채움
+    - 헤더를 본 적 없는 엔드포인트는 제한 없이 통과
+    """
+    def __init__(self, reserve: int = RATE_LIMIT_RESERVE):
+        self.reserve = reserve
+        self.deferred = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint(method: str, route: str) -> str:
+        # /2/users/123/tweets → GET /2/users/:id/tweets (ID마다가 아니라 엔드포인트 단위 제한)
+        version, _, path = route.lstrip("/").partition("/")
+        return f"{method.upper()} /{version}/" + re.sub(r"(?<![^/])\d+(?=/|$)", ":id", path)
+
+    def _bucket(self, endpoint: str, now: float) -> Optional[dict]:
+        b = self._buckets.get(endpoint)
+        if b and now >= b["reset"] and b["remaining"] < b["limit"]:
+            b["remaining"] = b["limit"]
+        return b
+
+    def acquire(self, endpoint: str):
+        now = time.time()
+        with self._lock:
+            b = self._bucket(endpoint, now)
+            if b is None:
+                return
+            if b["remaining"] <= self.reserve and now < b["reset"]:
+                self.deferred += 1
+                raise RateLimitDeferred(endpoint, b["reset"] - now)
+            b["remaining"] -= 1
+
+    def update(self, endpoint: str, headers, throttled: bool = False):
+        now = time.time()
+        try:
+            limit = int(headers.get("x-rate-limit-limit", 0)) or None
+            remaining = headers.get("x-rate-limit-remaining")
+            remaining = None if remaining is None else int(remaining)
+            reset = headers.get("x-rate-limit-reset")
+            reset = None if reset is None else float(reset)
+        except (AttributeError, TypeError, ValueError):
+            return  # 헤더가 없거나 숫자가 아님 → 이번 응답으로는 갱신하지 않음 (폴링은 계속)
+        if limit is None and remaining is None and not throttled:
+            return  # 제한 헤더가 없는 응답 → 예산 정보 없음
+        with self._lock:
+            b = self._buckets.setdefault(endpoint, {"limit": limit or 0, "remaining": 0, "reset": now})
+            if limit:
+                b["limit"] = limit
+            if remaining is not None:
+                b["remaining"] = remaining
+            if reset is not None:
+                b["reset"] = reset
+            if throttled:
+                b["remaining"] = 0
+                if reset is None:
+                    b["reset"] = now + RATE_LIMIT_DEFAULT_WAIT
+
+    def available(self, endpoint: str) -> Optional[int]:
+        """지금 쓸 수 있는 호출 수 (예비분 제외). 모르는 엔드포인트면 None"""
+        with self._lock:
+            b = self._bucket(endpoint, time.time())
+            return None if b is None else max(0, b["remaining"] - self.reserve)
+
+    def seconds_until_reset(self, endpoint: str) -> float:
+        with self._lock:
+            b = self._buckets.get(endpoint)
+            return max(0.0, b["reset"] - time.time()) if b else 0.0
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                ep: {
+                    "limit": b["limit"],
+                    "remaining": self._bucket(ep, now)["remaining"],
+                    "reset_in": max(0, round(b["reset"] - now)),
+                }
+                for ep, b in self._buckets.items()
+            }
+
+class BudgetedClient(tweepy.Client):
+    """모든 v2 호출 전에 예산을 확인하고, 응답 헤더로 예산을 갱신하는 tweepy.Client (429에도 잠들지 않음)"""
+    def __init__(self, *args, rate_limits: RateLimitTracker, **kwargs):
+        kwargs["wait_on_rate_limit"] = False
+        super().__init__(*args, **kwargs)
+        self.rate_limits = rate_limits
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        endpoint = self.rate_limits.endpoint(method, route)
+        self.rate_limits.acquire(endpoint)
+        try:
+            with metrics.timer("x_api", endpoint=endpoint):
+                response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except TooManyRequests as e:
+            self.rate_limits.update(endpoint, e.response.headers, throttled=True)
+            raise RateLimitDeferred(endpoint, self.rate_limits.seconds_until_reset(endpoint)) from e
+        except TweepyHTTPException as e:
+            if e.response is not None:
+                self.rate_limits.update(endpoint, e.response.headers)
+            raise
+        self.rate_limits.update(endpoint, response.headers)
+        return response
+
 # 초기 설정
-client = tweepy.Client(
+rate_limits = RateLimitTracker()
+client = BudgetedClient(
     bearer_token=TWITTER_BEARER_TOKEN,
-    wait_on_rate_limit=True  # 429일 때 자동 대기
+    rate_limits=rate_limits,  # 429/예산 소진 시 잠들지 않고 RateLimitDeferred → 스케줄러가 계정을 미룸
 )
 _gpt_client = OpenAI(api_key=OPENAI_API_KEY)
+session = get_session()  # 공용 keep-alive HTTP 세션
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CHECK_INTERVAL_SECONDS = 1000
 MAX_CAPTION_LENGTH = 1000  # 텔레그램 안전 범위
 TEXT_LENGTH_THRESHOLD = 250  # 크롤링을 시작할 텍스트 길이 임계값
 LAST_ID_JSON_PATH = os.path.join(BASE_DIR, "x_last_ids.json")
 HTTP_TIMEOUT = 10          # MyMemory, MS, DeepL, 텔레그램 등에 쓸 기본 HTTP 타임아웃
-TELEGRAM_TIMEOUT = 10      # 텔레그램 전송용
 OPENAI_TIMEOUT = 20        # GPT 번역용
+ACCOUNT_WORKERS = 3        # 계정 동시 처리 수 (1이면 기존처럼 순차 처리)
+CATCHUP_MAX_TWEETS = 300   # 장애 후 한 계정당 따라잡을 최대 트윗 수
+FETCH_MODE = "timeline"    # "timeline": 계정마다 get_users_tweets / "search": from: 묶음 검색 1회로 여러 계정 조회
+SEARCH_QUERY_MAX_LEN = 512 # 최근 검색 쿼리 길이 제한
+SEARCH_PAGE_SIZE = 100     # 최근 검색 한 페이지 트윗 수 (API 최대)
+SEARCH_WINDOW_SECONDS = 7 * 24 * 3600 - 3600  # 최근 검색이 보는 기간(7일)보다 조금 짧게 → last_id가 더 오래된 계정은 타임라인 방식
+TWITTER_EPOCH_MS = 1288834974657  # 트윗 ID(snowflake) 시각 기준점
+PIPELINE_ENABLED = True    # 수집 → 보강(크롤링) → 번역 → 전송을 단계별 스레드로 겹쳐서 처리 (False면 순차 처리, 크롤링 없음)
+ENRICH_WORKERS = 2         # 보강 단계(원문/크롤링/이미지) 워커 수
+TRANSLATE_WORKERS = 3      # 번역 단계 워커 수
+PIPELINE_QUEUE_SIZE = 20   # 단계 사이 큐 크기 (가득 차면 앞 단계가 대기 → back-pressure)
+PIPELINE_MAX_IN_FLIGHT = 50  # 전송 전까지 동시에 떠 있을 수 있는 트윗 수
+TRANSLATE_HEDGED = True      # 앞 엔진이 지연 예산 안에 응답 없으면 다음 엔진을 동시에 시작
+TRANSLATE_HEDGE_DELAY = 6.0  # 지연 예산 기본값/상한(초). 통계가 쌓이면 엔진별 p95로 줄어듦
+TRANSLATE_HEDGE_MIN_DELAY = 1.5  # 지연 예산 하한(초)
+TRANSLATE_ADAPTIVE_ORDER = True  # 실패율/p50 지연 기준으로 엔진 순서 자동 조정
+TRANSLATE_STATS_WINDOW = 50      # 엔진별 통계에 쓰는 최근 호출 수
+TRANSLATE_STATS_MIN_SAMPLES = 5  # 이보다 적게 호출된 엔진은 기본 순서 유지
+THROTTLE_COOLDOWN = 60           # 분당 호출 제한(429)류 차단 시 기본 대기(초)
+OPENAI_QUOTA_COOLDOWN = 6 * 3600 # OpenAI insufficient_quota(크레딧 소진) 차단 시간(초)
+MYMEMORY_CHUNK_LIMIT = 430       # MyMemory 요청 1건당 최대 글자 수
+MYMEMORY_PARALLEL = 3            # MyMemory 분할 조각 동시 요청 수
+QUOTA_PROBE_RETRY = 300          # 반개방(half-open) 시험 호출이 일반 오류로 실패했을 때 재차단 시간(초)
+ADAPTIVE_POLLING = True          # 계정별 작성 빈도(EWMA)/시간대에 맞춰 폴링 간격 조절 (False면 모든 계정 CHECK_INTERVAL_SECONDS)
+POLL_MIN_INTERVAL = 120          # 계정별 폴링 간격 하한(초)
+POLL_MAX_INTERVAL = 4 * 3600     # 계정별 폴링 간격 상한(초) → 조용한 계정도 이 안에는 한 번 확인
+POLL_TARGET_POSTS = 1.0          # 폴링 한 번에 평균 이만큼의 새 글이 쌓이도록 간격을 잡음
+POLL_BUDGET_PER_HOUR = None      # 시간당 계정 폴링 총량. None이면 고정 주기일 때와 같은 양(계정 수 × 3600/CHECK_INTERVAL_SECONDS)
+POLL_RATE_TAU = 6 * 3600         # 작성 빈도 EWMA의 시간 상수(초)
+POLL_HOURS_TAU = 14 * 24 * 3600  # 시간대별 활동 분포의 감쇠 시간 상수(초)
+POLL_SCHEDULE_PATH = os.path.join(BASE_DIR, "x_poll_schedule.json")
 
 # 특정 유저의 quoted 트윗은 제외할 때 쓰는 리스트
 EXCLUDE_QUOTE_USERS = [
@@ -65,8 +226,15 @@ EXCLUDE_QUOTE_USERS = [
 
 # TruthSocialTrump 추가
 RSS_URL = "https://trumpstruth.org/feed"
-TRUMP_STATE_FILE = "trump_truth_last_ts.txt"
+TRUMP_STATE_FILE = "trump_truth_last_ts.txt"      # 예전 형식(마지막 시각만) → 처음 한 번 읽어서 옮김
+TRUMP_STATE_JSON = "trump_truth_state.json"       # 마지막 시각 + ETag/Last-Modified + 본 글 GUID
 TRUMP_USERNAME = "TruthSocial_Trump"
+TRUMP_POLL_INTERVAL = 120      # 트루스소셜 RSS 폴링 간격(초) → X 라운드 주기와 별도
+TRUMP_BACKFILL_COUNT = 3       # 첫 실행 때 보낼 최신 글 수
+TRUMP_SEEN_LIMIT = 300         # 기억할 GUID/링크 수
+
+LAST_ID_FLUSH_INTERVAL = 30  # 변경된 last_id를 디스크에 반영하는 최소 간격(초)
+CATCHUP_CURSOR_KEY = "_cursors"  # x_last_ids.json 안에서 계정별 따라잡기 페이지 위치를 담는 키
 
 def _load_last_ids() -> dict:
     """x_last_ids.json에서 전체 매핑 불러오기"""
@@ -81,38 +249,128 @@ def _load_last_ids() -> dict:
         print(f"⚠️ x_last_ids.json 로드 오류: {e}")
     return {}
 
-def _save_last_ids(data: dict):
-    """전체 매핑을 x_last_ids.json에 저장"""
+def _save_last_ids(data: dict) -> bool:
+    """
+    전체 매핑을 x_last_ids.json에 저장.
+    임시 파일에 먼저 쓰고 os.replace로 교체하므로 도중에 죽어도 기존 파일은 온전하다.
+    """
+    tmp_path = LAST_ID_JSON_PATH + ".tmp"
     try:
-        with open(LAST_ID_JSON_PATH, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
             f.flush()
             os.fsync(f.fileno())
+        os.replace(tmp_path, LAST_ID_JSON_PATH)
+        return True
     except Exception as e:
         print(f"⚠️ last_ids.json 저장 오류: {e}")
+        return False
+
+class LastIdStore:
+    """
+    x_last_ids.json 메모리 캐시.
+    - 시작 시 한 번만 읽고, 조회는 메모리에서 처리
+    - 변경분은 백그라운드 스레드가 flush_interval마다 한 번씩 원자적으로 저장
+    - 라운드 끝/종료 시 flush()/close()로 즉시 반영
+    """
+    def __init__(self, flush_interval: float = LAST_ID_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # 백그라운드/메인 flush 동시 실행 방지
+        self._data = _load_last_ids()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, user_id: str) -> Optional[int]:
+        with self._lock:
+            value = self._data.get(user_id)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def set(self, user_id: str, tweet_id: int):
+        with self._lock:
+            self._data[user_id] = int(tweet_id)
+            self._dirty = True
+        self._ensure_flusher()
+
+    def get_cursor(self, user_id: str) -> Optional[dict]:
+        """중단된 따라잡기의 페이지 위치 (없으면 None)"""
+        with self._lock:
+            cursors = self._data.get(CATCHUP_CURSOR_KEY)
+            cursor = cursors.get(user_id) if isinstance(cursors, dict) else None
+        return dict(cursor) if isinstance(cursor, dict) else None
+
+    def set_cursor(self, user_id: str, cursor: Optional[dict]):
+        """따라잡기 페이지 위치 저장 (None이면 삭제). last_id와 같은 파일에 함께 저장된다"""
+        with self._lock:
+            cursors = self._data.get(CATCHUP_CURSOR_KEY)
+            if not isinstance(cursors, dict):
+                cursors = {}
+            if cursor is None:
+                if user_id not in cursors:
+                    return
+                cursors = {k: v for k, v in cursors.items() if k != user_id}
+            else:
+                cursors = {**cursors, user_id: cursor}
+            # 저장 스냅샷과 공유하지 않도록 새 dict로 교체
+            if cursors:
+                self._data[CATCHUP_CURSOR_KEY] = cursors
+            else:
+                self._data.pop(CATCHUP_CURSOR_KEY, None)
+            self._dirty = True
+        self._ensure_flusher()
+
+    def flush(self):
+        """변경분이 있으면 디스크에 저장"""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self._data)
+                self._dirty = False
+            if not _save_last_ids(snapshot):
+                # 저장 실패 시 다음 주기에 다시 시도
+                with self._lock:
+                    self._dirty = True
+
+    def close(self):
+        """백그라운드 저장 스레드 종료 + 남은 변경분 저장"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _ensure_flusher(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="last-id-flusher", daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+last_id_store = LastIdStore()
 
 def get_last_id(user_id: str) -> Optional[int]:
     """
-    x_last_ids.json에서 해당 user_id의 last_id를 가져온다.
+    해당 user_id의 last_id를 가져온다. (메모리 캐시 조회)
     없으면 None.
     """
-    data = _load_last_ids()
-    value = data.get(user_id)
-    if value is None:
-        return None
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
+    return last_id_store.get(user_id)
 
 def save_last_id(user_id: str, tweet_id: int):
     """
-    x_last_ids.json에 user_id -> tweet_id 매핑을 저장.
-    기존 값은 덮어씀.
+    user_id -> tweet_id 매핑을 저장. 기존 값은 덮어씀.
+    디스크 반영은 LastIdStore가 묶어서 처리한다.
     """
-    data = _load_last_ids()
-    data[user_id] = int(tweet_id)
-    _save_last_ids(data)
+    last_id_store.set(user_id, tweet_id)
 
 def mask_newlines(text: str) -> str:
     return text.replace("\r\n", "\n").replace("\n", NL_TOKEN)
@@ -123,6 +381,10 @@ def restore_newlines(text: str) -> str:
 
 class TwitterCrawler:
     def __init__(self):
+        self.created_at = time.time()
+        self.pages_served = 0          # 이 드라이버로 연 트윗 페이지 수
+        self.consecutive_failures = 0  # 연속 크롤링 실패 횟수
+        self.last_crawl_time = 0.0     # 이 드라이버의 마지막 크롤링 시각 (빈도 제한용)
         self.setup_driver()
         
     def setup_driver(self):
@@ -174,10 +436,11 @@ class TwitterCrawler:
             url = f"https://x.com/{username}/status/{tweet_id}"
             print(f"🔍 크롤링 시작: {url}")
             time.sleep(random.uniform(1.5, 3.5))
-            self.driver.get(url)
+            with metrics.timer("browser_render", site="x"):
+                self.driver.get(url)
 
-            # 본문이 보일 때까지 대기
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweetText"]')))
+                # 본문이 보일 때까지 대기
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweetText"]')))
 
             # 사람처럼 스크롤
             self.simulate_human_behavior()
@@ -271,42 +534,282 @@ class TwitterCrawler:
             print(f"❌ 텍스트 추출 실패: {e}")
             return None
     
+    def is_alive(self) -> bool:
+        """드라이버/브라우저가 아직 응답하는지 가벼운 스크립트로 확인"""
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def chrome_rss_mb(self) -> float:
+        """chromedriver 아래 Chrome 자식 프로세스들의 RSS 합계(MB)"""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            total = 0
+            for proc in root.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / 1024 / 1024
+        except Exception:
+            return 0.0
+
     def close(self):
         if self.driver:
             self.driver.quit()
 
-# 크롤러 인스턴스 생성 (지연 초기화)
-crawler = None
-crawler_created_time = None
-CRAWLER_RESTART_INTERVAL = 3600  # 1시간마다 크롤러 재시작
+CRAWLER_POOL_SIZE = 2              # 미리 띄워 둘 크롤러 수 (긴 트윗 동시 크롤링 수)
+CRAWLER_MAX_RSS_MB = 1500          # Chrome 자식 프로세스 RSS 합이 이 값을 넘으면 재생성
+CRAWLER_MAX_PAGES = 200            # 이만큼 페이지를 열면 재생성
+CRAWLER_MAX_FAILURES = 3           # 연속 실패가 이만큼이면 재생성
+CRAWLER_ACQUIRE_TIMEOUT = 120      # 빈 크롤러를 기다리는 최대 시간(초)
+CRAWL_MIN_INTERVAL = 30            # 같은 드라이버로 다시 크롤링하기까지 최소 간격(초)
+CRAWL_DEADLINE = 90                # 긴 트윗 하나를 크롤링 결과로 기다리는 최대 시간(초) → 넘기면 API 텍스트 사용
 
-def get_crawler():
-    """크롤러 인스턴스를 필요할 때만 생성하고 정기적으로 재시작"""
-    global crawler, crawler_created_time
-    
-    current_time = time.time()
-    
-    # 크롤러가 없거나 오래된 경우 재생성
-    if (crawler is None or 
-        crawler_created_time is None or 
-        current_time - crawler_created_time > CRAWLER_RESTART_INTERVAL):
-        
-        # 기존 크롤러 정리
-        if crawler:
+class CrawlerPool:
+    """
+    미리 띄워 둔 TwitterCrawler 풀.
+    - 빌려줄 때 생존 확인(is_alive) → 죽었으면 새로 띄움
+    - 돌려받을 때 RSS/페이지 수/연속 실패로 재생성 여부 판단 (고정 주기 재시작 대신)
+    """
+    def __init__(self, size: int = CRAWLER_POOL_SIZE):
+        self.size = size
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._all = set()
+
+    def _spawn(self) -> TwitterCrawler:
+        print("🔧 새 크롤러 초기화 중...")
+        c = TwitterCrawler()
+        with self._lock:
+            self._all.add(c)
+        print("✅ 새 크롤러 초기화 완료")
+        return c
+
+    def _discard(self, c: TwitterCrawler, reason: str):
+        print(f"🔄 크롤러 재생성 ({reason})")
+        with self._lock:
+            self._all.discard(c)
+            self._created -= 1
+        try:
+            c.close()
+        except Exception as e:
+            print(f"⚠️ 크롤러 정리 중 오류: {e}")
+
+    def warm(self):
+        """풀을 size만큼 미리 채움 (첫 긴 트윗의 콜드 스타트 제거)"""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                self._idle.put(self._spawn())
+            except Exception as e:
+                with self._lock:
+                    self._created -= 1
+                print(f"⚠️ 크롤러 예열 실패: {e}")
+                return
+
+    def acquire(self, timeout: float = CRAWLER_ACQUIRE_TIMEOUT) -> TwitterCrawler:
+        with self._lock:
+            can_create = self._created < self.size and self._idle.empty()
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._spawn()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        c = self._idle.get(timeout=timeout)
+        if not c.is_alive():
+            self._discard(c, "생존 확인 실패")
+            with self._lock:
+                self._created += 1
+            try:
+                return self._spawn()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return c
+
+    def release(self, c: TwitterCrawler, ok: bool):
+        c.pages_served += 1
+        c.consecutive_failures = 0 if ok else c.consecutive_failures + 1
+        rss = c.chrome_rss_mb()
+        reason = None
+        if c.consecutive_failures >= CRAWLER_MAX_FAILURES:
+            reason = f"연속 실패 {c.consecutive_failures}회"
+        elif c.pages_served >= CRAWLER_MAX_PAGES:
+            reason = f"페이지 {c.pages_served}개 처리"
+        elif rss > CRAWLER_MAX_RSS_MB:
+            reason = f"Chrome RSS {rss:.0f}MB"
+        if reason:
+            self._discard(c, reason)
+            # 빈자리는 백그라운드에서 다시 예열
+            threading.Thread(target=self.warm, name="crawler-warm", daemon=True).start()
+            return
+        self._idle.put(c)
+
+    def close_all(self):
+        with self._lock:
+            crawlers = list(self._all)
+            self._all.clear()
+            self._created = 0
+        for c in crawlers:
             try:
-                print("🔄 크롤러 재시작 중...")
-                crawler.close()
-                print("✅ 기존 크롤러 정리 완료")
+                c.close()
             except Exception as e:
                 print(f"⚠️ 크롤러 정리 중 오류: {e}")
-        
-        # 새 크롤러 생성
-        print("🔧 새 크롤러 초기화 중...")
-        crawler = TwitterCrawler()
-        crawler_created_time = current_time
-        print("✅ 새 크롤러 초기화 완료")
-    
-    return crawler
+
+crawler_pool = CrawlerPool()
+
+def _resolve_future(fut: Future, value) -> bool:
+    """이미 결과가 정해진 Future면 False (마감 타이머와 크롤 워커 중 먼저 온 쪽만 반영)"""
+    try:
+        fut.set_result(value)
+        return True
+    except InvalidStateError:
+        return False
+
+def _done_future(value) -> Future:
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+def _crawl_with_pool(tweet_id, username) -> Optional[str]:
+    """풀에서 크롤러를 빌려 간격 제한/랜덤 대기를 지킨 뒤 크롤링 (크롤 워커 스레드에서만 호출)"""
+    c = crawler_pool.acquire()
+    crawled_text = None
+    try:
+        # 크롤링 빈도 제한 (같은 드라이버로 너무 자주 크롤링하지 않도록)
+        time_since_last = time.time() - c.last_crawl_time
+        if time_since_last < CRAWL_MIN_INTERVAL:
+            wait_time = CRAWL_MIN_INTERVAL - time_since_last + 2
+            print(f"⏰ 크롤링 빈도 제한: {wait_time:.1f}초 대기 후 크롤링 진행")
+            time.sleep(wait_time)
+            print("✅ 대기 완료, 크롤링 시작")
+
+        # 크롤링 전 랜덤 대기
+        pre_crawl_delay = random.uniform(1, 3)
+        print(f"🔄 크롤링 전 대기: {pre_crawl_delay:.1f}초")
+        time.sleep(pre_crawl_delay)
+
+        crawled_text = c.crawl_full_tweet_text(tweet_id, username)
+
+        # 크롤링 시간 기록
+        c.last_crawl_time = time.time()
+    finally:
+        crawler_pool.release(c, ok=crawled_text is not None)
+    return crawled_text
+
+class DeferredCrawlQueue:
+    """
+    긴 트윗 크롤링 대기열.
+    - submit()은 바로 Future를 돌려주고, 크롤링(간격 제한/랜덤 대기 포함)은 백그라운드 워커가 처리
+      → 크롤링 대기 시간 동안 다른 계정의 짧은 트윗은 계속 흘러감
+    - 워커 수는 크롤러 풀 크기와 같음 (드라이버별 간격 정책은 그대로 유지)
+    - 트윗마다 마감 시간(deadline)이 있어 그때까지 못 끝내면 Future는 None으로 완료 → 호출 쪽이 API 텍스트 사용
+      마감이 지난 뒤 아직 시작 전인 작업은 크롤링 자체를 건너뜀
+    - 마감은 작업마다 타이머 스레드를 두지 않고, 마감 시각 힙 하나를 감시 스레드(reaper) 하나가 처리
+    """
+    def __init__(self, workers: int = CRAWLER_POOL_SIZE):
+        self.workers = max(1, workers)
+        self._q = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._deadlines = []  # (마감 시각(monotonic), 순번, Future, tweet_id) 힙
+        self._order = itertools.count()
+        self._closed = False
+        self.expired = 0
+
+    def _ensure_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            self._closed = False
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"crawl-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            t = threading.Thread(target=self._reap, name="crawl-deadline", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, tweet_id, username, deadline: float = CRAWL_DEADLINE) -> Future:
+        """크롤링 결과(str 또는 None)를 담을 Future 반환. deadline 초 안에 반드시 완료된다."""
+        self._ensure_workers()
+        fut = Future()
+        with self._cond:
+            heapq.heappush(self._deadlines, (time.monotonic() + deadline, next(self._order), fut, tweet_id))
+            self._cond.notify()
+        self._q.put((fut, tweet_id, username))
+        print(f"📥 크롤링 대기열에 추가: {tweet_id} (대기 {self._q.qsize()}건, 마감 {deadline:.0f}초)")
+        return fut
+
+    def _expire(self, fut: Future, tweet_id):
+        if _resolve_future(fut, None):
+            with self._lock:
+                self.expired += 1
+            print(f"⏰ 크롤링 마감 초과({tweet_id}) → API 텍스트 사용")
+
+    def _reap(self):
+        """가장 이른 마감까지 잠들었다가, 마감이 지난 작업을 None으로 완료 (이미 끝난 작업은 그냥 버림)"""
+        while True:
+            due = []
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._deadlines and self._deadlines[0][0] <= now:
+                        break
+                    self._cond.wait(self._deadlines[0][0] - now if self._deadlines else None)
+                if self._closed:
+                    return
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, _, fut, tweet_id = heapq.heappop(self._deadlines)
+                    if not fut.done():
+                        due.append((fut, tweet_id))
+            # Future 콜백이 락 밖에서 돌도록 완료 처리는 락을 놓은 뒤에
+            for fut, tweet_id in due:
+                self._expire(fut, tweet_id)
+
+    def _worker(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            fut, tweet_id, username = item
+            if fut.done():
+                continue  # 이미 마감 → 크롤링 생략
+            crawled_text = None
+            try:
+                crawled_text = _crawl_with_pool(tweet_id, username)
+            except Exception as e:
+                print(f"❌ 크롤링 중 오류 발생: {e}")
+            _resolve_future(fut, crawled_text)  # 마감이 먼저 왔으면 무시됨 (힙 항목은 마감 때 버려짐)
+
+    def pending(self) -> int:
+        return self._q.qsize()
+
+    def close(self):
+        """워커/감시 스레드 종료. 아직 결과가 없는 작업은 None(API 텍스트 사용)으로 완료"""
+        with self._cond:
+            threads, self._threads = self._threads, []
+            self._closed = True
+            leftover, self._deadlines = self._deadlines, []
+            self._cond.notify_all()
+        for _ in range(self.workers if threads else 0):
+            self._q.put(None)
+        for _, _, fut, _ in leftover:
+            _resolve_future(fut, None)
+
+crawl_queue = DeferredCrawlQueue()
 
 def replace_emojis_with_tags(text):
     emojis = []
@@ -337,22 +840,304 @@ def restore_urls(text, urls):
         text = pattern.sub(f" {url} ", text)
     return text
 
+class QuotaExceeded(Exception):
+    """번역 엔진의 사용량/호출 제한 신호. cooldown 동안 해당 엔진 호출을 건너뛴다."""
+    def __init__(self, message: str, cooldown: float):
+        super().__init__(message)
+        self.cooldown = cooldown
+
+def _seconds_until_next_utc_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+def _seconds_until_next_utc_month() -> float:
+    now = datetime.now(timezone.utc)
+    if now.month == 12:
+        first = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        first = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (first - now).total_seconds()
+
+def _retry_after_seconds(response, default: float = THROTTLE_COOLDOWN) -> float:
+    try:
+        return max(1.0, float(response.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return default
+
+class CircuitBreaker:
+    """
+    엔진별 차단기.
+    - closed: 정상 호출
+    - open: QuotaExceeded 이후 cooldown 동안 네트워크 호출 없이 건너뜀
+    - half_open: cooldown이 끝나면 시험 호출 1건만 허용 → 성공 시 closed, 실패 시 다시 open
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.open_until = 0.0
+        self.reason = ""
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.time() >= self.open_until:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                print(f"🔌 {self.name} 차단 해제 시험 호출")
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print(f"✅ {self.name} 차단 해제")
+            self.state = "closed"
+            self.reason = ""
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            probing = self._probe_in_flight
+            self._probe_in_flight = False
+            if isinstance(error, QuotaExceeded):
+                cooldown = error.cooldown
+            elif probing:
+                cooldown = QUOTA_PROBE_RETRY
+            else:
+                return  # 일반 오류는 차단하지 않음
+            self.state = "open"
+            self.open_until = time.time() + cooldown
+            self.reason = str(error)
+        print(f"⛔ {self.name} 차단 {cooldown/60:.0f}분 ({error})")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "reopen_in": max(0.0, self.open_until - time.time()) if self.state == "open" else 0.0,
+                "reason": self.reason,
+            }
+
+_breakers = {}
+
+def _breaker(engine) -> CircuitBreaker:
+    with _translate_stats_lock:
+        br = _breakers.get(engine.__name__)
+        if br is None:
+            br = _breakers[engine.__name__] = CircuitBreaker(engine.__name__)
+        return br
+
+class EngineStats:
+    """번역 엔진별 최근 호출 지연/성공 여부 (rolling window)"""
+    def __init__(self, name: str, window: int = TRANSLATE_STATS_WINDOW):
+        self.name = name
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+
+    def record(self, ok: bool, elapsed: float):
+        self.latencies.append(elapsed)
+        self.outcomes.append(ok)
+        self.calls += 1
+        if not ok:
+            self.failures += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "window": len(self.outcomes),
+            "failure_rate": round(self.failure_rate(), 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+        }
+
+_translate_stats_lock = threading.Lock()
+_translate_stats = {}
+_translate_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="translate")
+# 헤지 풀 안에서 다시 조각을 제출하므로 교착을 피하려고 별도 풀 사용 (전체 동시 요청 상한 역할도 함)
+_mymemory_pool = ThreadPoolExecutor(max_workers=MYMEMORY_PARALLEL, thread_name_prefix="mymemory")
+
+def _default_engines() -> list:
+    return [translate_with_gpt4omini, translate_with_mymemory, translate_with_microsoft, translate_with_deepl]
+
+def _engine_stats(engine) -> EngineStats:
+    with _translate_stats_lock:
+        st = _translate_stats.get(engine.__name__)
+        if st is None:
+            st = _translate_stats[engine.__name__] = EngineStats(engine.__name__)
+        return st
+
+def _ordered_engines() -> list:
+    """실패율 → p50 지연 순으로 정렬. 표본이 부족한 엔진은 기본 순서 자리를 유지."""
+    engines = _default_engines()
+    if not TRANSLATE_ADAPTIVE_ORDER:
+        return engines
+
+    def sort_key(item):
+        idx, engine = item
+        st = _engine_stats(engine)
+        with _translate_stats_lock:
+            if len(st.outcomes) < TRANSLATE_STATS_MIN_SAMPLES:
+                return (0.0, 0.0, idx)
+            return (round(st.failure_rate(), 1), st.percentile(0.5) or 0.0, idx)
+
+    return [engine for _, engine in sorted(enumerate(engines), key=sort_key)]
+
+def _hedge_delay(engine) -> float:
+    """이 엔진 응답을 기다릴 지연 예산: 최근 p95 (상/하한 적용)"""
+    st = _engine_stats(engine)
+    with _translate_stats_lock:
+        p95 = st.percentile(0.95) if len(st.latencies) >= TRANSLATE_STATS_MIN_SAMPLES else None
+    if p95 is None:
+        return TRANSLATE_HEDGE_DELAY
+    return max(TRANSLATE_HEDGE_MIN_DELAY, min(TRANSLATE_HEDGE_DELAY, p95))
+
+def _timed_translate(engine, text):
+    """엔진 호출 + 지연/성공 기록. 빈 결과도 실패로 본다."""
+    start = time.monotonic()
+    ok = False
+    breaker = _breaker(engine)
+    try:
+        result = engine(text)
+        ok = bool(result and result.strip())
+        if not ok:
+            raise Exception("빈 번역 결과")
+        breaker.record_success()
+        return result
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    finally:
+        elapsed = time.monotonic() - start
+        st = _engine_stats(engine)
+        with _translate_stats_lock:
+            st.record(ok, elapsed)
+        metrics.observe("translate", elapsed, engine=engine.__name__)
+        if not ok:
+            metrics.inc("failures_total", stage="translate", engine=engine.__name__)
+
+def get_translation_stats() -> dict:
+    """엔진별 지연(p50/p95)·실패율 통계 + 차단기 상태 (지연 예산 튜닝용)"""
+    engines = _default_engines()
+    stats = {}
+    for engine in engines:
+        st = _engine_stats(engine)
+        with _translate_stats_lock:
+            stats[engine.__name__] = st.snapshot()
+        stats[engine.__name__]["breaker"] = _breaker(engine).snapshot()
+    return stats
+
+def print_translation_stats():
+    for name, st in get_translation_stats().items():
+        if not st["calls"]:
+            continue
+        p50 = f"{st['p50']:.2f}s" if st["p50"] is not None else "-"
+        p95 = f"{st['p95']:.2f}s" if st["p95"] is not None else "-"
+        br = st["breaker"]
+        state = br["state"] if br["state"] != "open" else f"open ({br['reopen_in']/60:.0f}분 남음)"
+        print(f"📊 {name}: 호출 {st['calls']}회, 실패율 {st['failure_rate']:.0%}, p50 {p50}, p95 {p95}, 차단기 {state}")
+
 def translate(text):
-    for engine in [translate_with_gpt4omini, translate_with_mymemory, translate_with_microsoft, translate_with_deepl]:
-        try:
-            return engine(text)
-        except Exception as e:
-            print(f"⚠️ {engine.__name__} 실패: {e}")
+    translated, _ = translate_with_engine(text)
+    return translated
+
+def translate_with_engine(text):
+    """번역 결과와 실제로 답한 엔진 이름을 함께 반환. 모두 실패하면 (None, None)."""
+    engines = _ordered_engines()
+    if not TRANSLATE_HEDGED:
+        for engine in engines:
+            # 한도 소진으로 차단된 엔진은 네트워크 호출 없이 건너뜀
+            if not _breaker(engine).allow():
+                continue
+            try:
+                return _timed_translate(engine, text), engine.__name__
+            except Exception as e:
+                print(f"⚠️ {engine.__name__} 실패: {e}")
+        # 모든 번역 실패 시 None 반환
+        return None, None
+
+    # 헤지 모드: 앞 엔진이 지연 예산 안에 답하지 않거나 실패하면 다음 엔진을 추가로 시작하고,
+    # 가장 먼저 도착한 유효한 결과를 사용한다. (늦게 끝난 호출도 통계에는 반영)
+    remaining = list(engines)
+    running = {}
+    last_started = None
+    while remaining or running:
+        if remaining and last_started is None:
+            candidate = remaining.pop(0)
+            # 한도 소진으로 차단된 엔진은 네트워크 호출 없이 건너뜀
+            if not _breaker(candidate).allow():
+                continue
+            last_started = candidate
+            running[_translate_pool.submit(_timed_translate, last_started, text)] = last_started
+        if not running:
+            break
+        timeout = _hedge_delay(last_started) if remaining else None
+        done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            print(f"⏱️ {last_started.__name__} 응답 지연 → 다음 엔진 동시 시작")
+            last_started = None
+            continue
+        for fut in done:
+            engine = running.pop(fut)
+            try:
+                return fut.result(), engine.__name__
+            except Exception as e:
+                print(f"⚠️ {engine.__name__} 실패: {e}")
+        # 실패한 엔진이 있으면 기다리지 않고 다음 엔진 시작
+        last_started = None
     # 모든 번역 실패 시 None 반환
-    return None
+    return None, None
+
+def cached_translate(masked_text: str, target: str = "ko"):
+    """
+    디스크 번역 캐시를 먼저 보고, 없으면 엔진 체인으로 번역 후 저장.
+    캐시 키: 마스킹된 원문 + 대상 언어 + 엔진 (엔진 기본 선호 순서대로 조회)
+    """
+    if not masked_text or not masked_text.strip():
+        return masked_text
+    cache = get_translation_cache()
+    engine_names = [e.__name__ for e in _default_engines()]
+    hit = cache.get_any(masked_text, target, engine_names)
+    if hit:
+        print(f"💾 번역 캐시 적중 ({hit[1]})")
+        return hit[0]
+    translated, engine_name = translate_with_engine(masked_text)
+    if translated is not None:
+        cache.put(masked_text, target, engine_name, translated)
+    return translated
+
+def print_translation_cache_stats():
+    st = get_translation_cache().stats()
+    print(f"💾 번역 캐시: 적중 {st['hits']}회, 미스 {st['misses']}회, 적중률 {st['hit_rate']:.0%}, 항목 {st['entries']}개")
 
 def translate_preserving_emojis_and_urls(original_text):
     # 1. 이모지 마스킹
     emoji_tagged_text, emojis = replace_emojis_with_tags(original_text)
     # 2. URL 마스킹
     url_tagged_text, urls = mask_urls(emoji_tagged_text)
-    # 3. 번역
-    translated = translate(url_tagged_text)  # 순차적 번역기 호출
+    # 3. 번역 (마스킹된 텍스트 기준으로 캐시 조회 → 없으면 순차/헤지 번역)
+    translated = cached_translate(url_tagged_text)
+    if translated is None:
+        return None
     # 4. 이모지 복원
     text_with_emoji = restore_emojis(translated, emojis)
     # 5. URL 복원
@@ -394,47 +1179,40 @@ def translate_with_gpt4omini(text: str, target_lang: str = "ko", source_lang: st
         )
         out = resp.choices[0].message.content or ""
         return out.strip()
+    except RateLimitError as e:
+        print(f"⚠️ GPT 번역 실패: {e}")
+        if getattr(e, "code", None) == "insufficient_quota":
+            # 크레딧/결제 한도 소진 → 자동 복구가 느리므로 길게 차단
+            raise QuotaExceeded("OpenAI quota exhausted", OPENAI_QUOTA_COOLDOWN) from e
+        raise QuotaExceeded("OpenAI rate limit exceeded", _retry_after_seconds(e.response)) from e
     except Exception as e:
         print(f"⚠️ GPT 번역 실패: {e}")
         # translate() 쪽에서 다음 엔진으로 넘어가게 하기 위해 예외 유지
         raise
 
 def translate_with_mymemory(text, source="en", target="ko"):
-    # 480자 이상이면 문장 단위로 분할하여 번역
-    if len(text) > 430:
+    # 430자 초과면 문장 경계로 나눈 조각들을 동시에 번역하고 원래 순서대로 합친다
+    if len(text) > MYMEMORY_CHUNK_LIMIT:
         print(f"📏 긴 텍스트 감지 ({len(text)}자), MyMemory 분할 번역 시작")
-        sentences = split_text_into_sentences(text)
-        translated_parts = []
-        
-        current_part = ""
-        
-        for sentence in sentences:
-            # 현재 부분에 문장을 추가했을 때 길이 확인
-            if len(current_part + sentence) <= 430:
-                current_part += sentence
-            else:
-                # 현재 부분 번역
-                if current_part:
-                    translated_part = translate_mymemory_part(current_part, source, target)
-                    if translated_part:
-                        translated_parts.append(translated_part)
-                
-                # 새 부분 시작
-                current_part = sentence
-        
-        # 마지막 부분 번역
-        if current_part:
-            translated_part = translate_mymemory_part(current_part, source, target)
-            if translated_part:
-                translated_parts.append(translated_part)
-        
-        # 번역된 부분들을 합치기
-        if translated_parts:
-            return "".join(translated_parts)
+        chunks = chunk_text_by_sentences(text, MYMEMORY_CHUNK_LIMIT)
+        # map은 입력 순서대로 결과를 돌려주므로 재조립 순서가 보장됨
+        translated_parts = list(_mymemory_pool.map(
+            lambda part: translate_mymemory_part(part.strip(), source, target), chunks
+        ))
+
+        # 번역된 부분들을 원문 조각 사이의 공백/줄바꿈을 살려 합치기
+        pieces = []
+        for chunk, translated_part in zip(chunks, translated_parts):
+            if not translated_part:
+                continue
+            pieces.append(translated_part.strip())
+            pieces.append(chunk[len(chunk.rstrip()):] or " ")
+        if pieces:
+            return "".join(pieces[:-1])
         else:
             raise Exception("MyMemory 분할 번역 실패")
     
-    # 480자 이하면 기존 방식으로 번역
+    # 430자 이하면 기존 방식으로 번역
     return translate_mymemory_part(text, source, target)
 
 def translate_mymemory_part(text, source="en", target="ko"):
@@ -446,41 +1224,101 @@ def translate_mymemory_part(text, source="en", target="ko"):
     }
 
     try:
-        response = requests.get(url, params=params, timeout=HTTP_TIMEOUT)
+        response = session.get(url, params=params, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         result = data["responseData"]["translatedText"]
 
         if "MYMEMORY WARNING" in result.upper():
-            raise Exception("MyMemory usage limit reached")
+            # 무료 일일 한도 → 다음 UTC 자정까지 차단
+            raise QuotaExceeded("MyMemory usage limit reached", _seconds_until_next_utc_midnight())
 
         return result
     except (RequestException, Timeout) as e:
         print(f"⚠️ MyMemory 요청 실패: {e}")
         raise
 
+# 문장 끝: 영문 종결부호(+닫는 따옴표/괄호) 뒤 공백, 또는 CJK 종결부호(공백 없어도 됨)
+_SENTENCE_END_RE = re.compile(r"[.!?]+[\"'”’)\]]*\s+|[。！？]+[\"'”’」』)\]]*\s*")
+_INITIALS_RE = re.compile(r"^(?:[A-Za-z]\.)*[A-Za-z]$")  # U.S / U.K / A (이니셜)
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "inc", "ltd", "co", "corp",
+    "vs", "etc", "e.g", "i.e", "approx", "est", "no", "fig", "dept", "gov", "sen", "rep",
+    "gen", "pres", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec",
+})
+
+def _is_abbreviation(text: str, dot_pos: int) -> bool:
+    """dot_pos 위치의 '.'가 약어(Mr., U.S., Inc.)의 점인지 판단 (앞 단어만 보므로 상수 시간)"""
+    word_start = text.rfind(" ", max(0, dot_pos - 16), dot_pos) + 1
+    if word_start == 0 and dot_pos > 16:
+        return False  # 16자 넘는 단어는 약어가 아님
+    word = text[word_start:dot_pos].lstrip("(\"'“‘")
+    if len(word) == 1:
+        # 이니셜(J. Smith)은 영문 대문자만. 'I.'와 한글/한자 한 글자 단어 뒤의 '.'은 문장 끝
+        return "A" <= word <= "Z" and word != "I"
+    if word.lower() in ABBREVIATIONS:
+        return True
+    return "." in word and bool(_INITIALS_RE.match(word))
+
+def sentence_spans(text: str) -> List[tuple]:
+    """
+    문장 구간 (start, end) 리스트. 구간 끝에는 뒤따르는 공백이 포함되며
+    전체를 이어 붙이면 원문과 같다. 정규식 한 번 훑기라 길이에 선형.
+    - 약어(Mr., U.S., Inc.)와 소수점($1.5B)에서는 끊지 않음
+    - 한국어/중국어/일본어 종결부호(。！？)도 문장 끝으로 인식 (한국어 '.' 은 영문과 동일)
+    """
+    spans = []
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(text):
+        # 종결부호가 '.' 하나이고 앞 단어가 약어면 문장 끝이 아님
+        dot = m.start()
+        if text[dot] == "." and text[dot + 1] != "." and _is_abbreviation(text, dot):
+            continue
+        spans.append((start, m.end()))
+        start = m.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
 def split_text_into_sentences(text):
     """텍스트를 문장 단위로 분할"""
-    # 문장 구분자들
-    sentence_endings = ['.', '!', '?']
-    
     sentences = []
-    current_sentence = ""
-    
-    for char in text:
-        current_sentence += char
-        
-        if char in sentence_endings:
-            if current_sentence.strip():
-                sentences.append(current_sentence.strip())
-            current_sentence = ""
-    
-    # 마지막 문장 처리
-    if current_sentence.strip():
-        sentences.append(current_sentence.strip())
-    
+    for a, b in sentence_spans(text):
+        sentence = text[a:b].strip()
+        if sentence:
+            sentences.append(sentence)
     return sentences
 
+def chunk_text_by_sentences(text: str, limit: int) -> List[str]:
+    """
+    문장 경계를 지키며 limit 글자 이하 조각으로 묶는다. (조각을 이어 붙이면 원문과 같음)
+    한 문장이 limit보다 길면 공백 기준으로 다시 자른다.
+    """
+    chunks = []
+    chunk_start = 0
+    chunk_end = 0
+    for a, b in sentence_spans(text):
+        if b - chunk_start <= limit:
+            chunk_end = b
+            continue
+        if chunk_end > chunk_start:
+            chunks.append(text[chunk_start:chunk_end])
+            chunk_start = chunk_end
+        # 문장 하나가 limit을 넘는 경우
+        while b - chunk_start > limit:
+            cut = text.rfind(" ", chunk_start, chunk_start + limit)
+            if cut <= chunk_start:
+                cut = chunk_start + limit
+            else:
+                cut += 1
+            chunks.append(text[chunk_start:cut])
+            chunk_start = cut
+        chunk_end = b
+    if chunk_end > chunk_start:
+        chunks.append(text[chunk_start:chunk_end])
+    return chunks
+
 # def translate_with_googletrans(text, dest='ko'):
 #     translator = Translator()
 #     try:
@@ -490,6 +1328,15 @@ def split_text_into_sentences(text):
 #         print("❌ googletrans 오류:", e)
 #         return "[Google Translate 실패]"
 
+MS_QUOTA_EXCEEDED_CODE = 403001  # Microsoft Translator: 무료(F0) 월 한도 소진 (401000/403000 등 키·리전 오류와 구분)
+
+def _ms_error_code(response) -> Optional[int]:
+    """Microsoft Translator 오류 응답 본문의 error.code (없거나 형식이 다르면 None)"""
+    try:
+        return int(response.json()["error"]["code"])
+    except (ValueError, TypeError, KeyError):
+        return None
+
 def translate_with_microsoft(text):
     url = "https://api.cognitive.microsofttranslator.com/translate?api-version=3.0&from=en&to=ko"
     headers = {
@@ -499,9 +1346,13 @@ def translate_with_microsoft(text):
     }
     body = [{"text": text}]
     try:
-        response = requests.post(url, headers=headers, json=body, timeout=HTTP_TIMEOUT)
+        response = session.post(url, headers=headers, json=body, timeout=HTTP_TIMEOUT)
         if response.status_code == 429:
-            raise Exception("Microsoft usage limit exceeded")
+            # 분당/초당 호출 제한
+            raise QuotaExceeded("Microsoft rate limit exceeded", _retry_after_seconds(response))
+        if response.status_code == 403 and _ms_error_code(response) == MS_QUOTA_EXCEEDED_CODE:
+            # 무료(F0) 월 한도 소진 → 다음 달까지 차단 (그 밖의 403은 일반 실패로 처리)
+            raise QuotaExceeded("Microsoft usage limit exceeded", _seconds_until_next_utc_month())
         response.raise_for_status()
         return response.json()[0]["translations"][0]["text"]
     except (RequestException, Timeout) as e:
@@ -516,9 +1367,12 @@ def translate_with_deepl(text):
         "target_lang": "KO",  # 한국어
     }
     try:
-        response = requests.post(url, headers=headers, data=data, timeout=HTTP_TIMEOUT)
+        response = session.post(url, headers=headers, data=data, timeout=HTTP_TIMEOUT)
         if response.status_code == 456:
-            raise Exception("DeepL usage limit exceeded")
+            # 월 글자 수 한도 소진 → 다음 달까지 차단
+            raise QuotaExceeded("DeepL usage limit exceeded", _seconds_until_next_utc_month())
+        if response.status_code == 429:
+            raise QuotaExceeded("DeepL rate limit exceeded", _retry_after_seconds(response))
         response.raise_for_status()
         return response.json()["translations"][0]["text"]
     except (RequestException, Timeout) as e:
@@ -541,71 +1395,385 @@ def get_latest_tweet(user_id, last_id=None, max_results=10):
         max_results=max_results,
         # ✅ 답글/리트윗 제외 → Posts 탭과 일치
         exclude=["replies", "retweets"],
-        tweet_fields=["created_at", "id", "text", "attachments", "referenced_tweets"],
+        tweet_fields=["created_at", "id", "text", "attachments", "referenced_tweets", "note_tweet"],
         expansions=["attachments.media_keys", "referenced_tweets.id"],
         media_fields=["url", "type"]
     )
 
-def iterate_user_tweets(user_id: str, since_id: Optional[int], page_size: int = 10):
+# 원본(참조) 트윗과 그 트윗의 media까지 페이지 includes에 함께 받아온다
+TWEET_EXPANSIONS = ["attachments.media_keys", "referenced_tweets.id", "referenced_tweets.id.attachments.media_keys"]
+GET_TWEETS_MAX_IDS = 100  # get_tweets(ids=[...]) 한 번에 조회 가능한 최대 ID 수
+
+TweetRef = namedtuple("TweetRef", ["type", "id"])  # referenced_tweets 항목 (tweepy ReferencedTweet과 같은 속성)
+
+class CompactTweet:
+    """
+    전송에 필요한 필드만 남긴 트윗.
+    tweepy.Tweet은 응답 JSON(data)을 통째로 들고 있어 밀린 트윗을 쌓아 두면 무거우므로,
+    같은 속성 이름만 남겨 보강/번역/전송 코드가 그대로 사용한다.
+    """
+    __slots__ = ("id", "text", "created_at", "author_id", "attachments", "referenced_tweets", "note_tweet")
+
+    def __init__(self, id, text, created_at=None, author_id=None, attachments=None,
+                 referenced_tweets=None, note_tweet=None):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.author_id = author_id
+        self.attachments = attachments
+        self.referenced_tweets = referenced_tweets
+        self.note_tweet = note_tweet
+
+    def __repr__(self):
+        return f"CompactTweet(id={self.id})"
+
+def compact_tweet(tweet) -> CompactTweet:
+    if isinstance(tweet, CompactTweet):
+        return tweet
+    keys = _media_keys(tweet)
+    refs = getattr(tweet, "referenced_tweets", None)
+    note = note_tweet_text(tweet)
+    return CompactTweet(
+        id=tweet.id,
+        text=tweet.text,
+        created_at=getattr(tweet, "created_at", None),
+        author_id=getattr(tweet, "author_id", None),
+        attachments={"media_keys": list(keys)} if keys else None,
+        referenced_tweets=[TweetRef(ref.type, ref.id) for ref in refs] if refs else None,
+        note_tweet={"text": note} if note else None,
+    )
+
+def _compact_media(media) -> dict:
+    return {"media_key": media["media_key"], "type": media["type"], "url": media.get("url")}
+
+def _index_media(includes) -> dict:
+    """페이지 includes의 media를 media_key 기준으로 한 번만 인덱싱"""
+    if not includes:
+        return {}
+    return {m["media_key"]: m for m in includes.get("media", []) or []}
+
+def _index_tweets(includes) -> dict:
+    """페이지 includes의 참조 트윗(tweets)을 id 기준으로 인덱싱"""
+    if not includes:
+        return {}
+    return {str(t.id): t for t in includes.get("tweets", []) or []}
+
+def _retweeted_id(tweet) -> Optional[str]:
+    for ref in getattr(tweet, "referenced_tweets", None) or []:
+        if ref.type == "retweeted":
+            return str(ref.id)
+    return None
+
+def _media_keys(tweet) -> list:
+    attachments = getattr(tweet, "attachments", None)
+    if attachments and "media_keys" in attachments:
+        return attachments["media_keys"]
+    return []
+
+def _resolve_missing_originals(page_tweets, tweet_index: dict, media_index: dict, api_client=None):
+    """
+    페이지 includes에 없는 리트윗 원본을 get_tweets(ids=[...]) 한 번(최대 100개씩)으로 모아 조회해
+    tweet_index / media_index에 채워 넣는다. 실패하면 그대로 두고(개별 조회로 대체) 넘어간다.
+    """
+    missing = []
+    for t in page_tweets:
+        rid = _retweeted_id(t)
+        if rid and rid not in tweet_index and rid not in missing:
+            missing.append(rid)
+    if not missing:
+        return
+    api_client = api_client or client
+    for i in range(0, len(missing), GET_TWEETS_MAX_IDS):
+        ids = missing[i:i + GET_TWEETS_MAX_IDS]
+        try:
+            resp = call_with_retry(
+                api_client.get_tweets,
+                ids=ids,
+                tweet_fields=["created_at", "text", "attachments", "note_tweet"],
+                expansions=["attachments.media_keys"],
+                media_fields=["url", "type"],
+            )
+        except Exception as e:
+            explain_tweepy_error(e)
+            print(f"⚠️ 리트윗 원본 일괄 조회 실패 ({len(ids)}건): {e}")
+            continue
+        for t in resp.data or []:
+            tweet_index[str(t.id)] = t
+        media_index.update(_index_media(resp.includes))
+        print(f"🔁 리트윗 원본 {len(ids)}건을 한 번에 조회")
+
+def _compact_includes(tweet, media_index: dict, tweet_index: Optional[dict] = None) -> dict:
+    """
+    페이지 전체 includes 대신, 이 트윗이 참조하는 media(와 리트윗 원본, 그 원본의 media)만 담은 작은 includes.
+    원본 트윗/media도 축약본으로 담고, extract_image_urls() / fetch_original_retweet()가 그대로 사용할 수 있는 형태를 유지한다.
+    """
+    keys = list(_media_keys(tweet))
+    compact = {}
+    rid = _retweeted_id(tweet)
+    original = (tweet_index or {}).get(rid) if rid else None
+    if original is not None:
+        compact["tweets"] = [compact_tweet(original)]
+        keys += _media_keys(original)
+    media = [_compact_media(media_index[k]) for k in keys if k in media_index]
+    if media:
+        compact["media"] = media
+    return compact
+
+def _compact_page(resp, api_client=None) -> list:
+    """응답 한 페이지 → [(CompactTweet, 축약 includes), ...] (응답 순서 그대로). 페이지 includes 전체는 보관하지 않음"""
+    media_index = _index_media(resp.includes)
+    tweet_index = _index_tweets(resp.includes)
+    _resolve_missing_originals(resp.data, tweet_index, media_index, api_client)
+    return [(compact_tweet(t), _compact_includes(t, media_index, tweet_index)) for t in resp.data]
+
+def _fetch_timeline_page(api_client, user_id: str, since_id: Optional[int], page_size: int,
+                         token: Optional[str] = None, until_id: Optional[int] = None):
+    return call_with_retry(
+        api_client.get_users_tweets,
+        id=user_id,
+        since_id=since_id or None,  # 0(warm-start 때 트윗 없음) → 최근 타임라인부터 (max_backlog개까지)
+        until_id=until_id,
+        max_results=page_size,
+        exclude=["replies", "retweets"],  # Posts 탭과 일치
+        tweet_fields=["created_at", "id", "text", "attachments", "referenced_tweets", "note_tweet"],
+        expansions=TWEET_EXPANSIONS,
+        media_fields=["url", "type"],
+        pagination_token=token
+    )
+
+def _resume_catchup(api_client, user_id: str, since_id: Optional[int], cursor: dict):
+    """
+    저장된 페이지 위치에서 남은 페이지만 오래된 것부터 다시 받아 yield.
+    페이지는 [최신 id, 최소 id] 범위로 저장돼 있어 since_id/until_id로 그 구간만 정확히 다시 받는다
+    (그 사이 새 트윗이 올라와도 페이지 경계가 밀리지 않음).
+    반환: 이어서 새로 조회할 since_id (따라잡기를 시작할 때 본 가장 최신 id)
+    """
+    done = since_id or 0
+    pages = [p for p in cursor["pages"] if p[0] > done]
+    if pages:
+        print(f"↪️ 중단된 따라잡기 이어서: 남은 {len(pages)}페이지 (user_id={user_id})")
+    for newest_id, oldest_id in pages:
+        resp = _fetch_timeline_page(api_client, user_id, max(done, oldest_id - 1), cursor["page_size"],
+                                    until_id=newest_id + 1)
+        records = _compact_page(resp, api_client) if resp.data else []
+        for t, includes in reversed(records):
+            yield t, includes
+    return max(done, cursor["pages"][-1][0])
+
+def iterate_user_tweets(user_id: str, since_id: Optional[int], page_size: int = 10,
+                        max_backlog: int = CATCHUP_MAX_TWEETS, api_client=None):
     """
-    since_id 이후의 모든 트윗을 '오래된 것부터' yield.
-    각 yield는 (tweet, includes) 튜플.
+    since_id 이후의 트윗을 '오래된 것부터' 페이지 단위로 yield.
+    각 yield는 (CompactTweet, includes) 튜플이며, includes는 해당 트윗의 media(와 리트윗 원본)만 담은 축약본.
     - page_size: 10~100 (트위터 제한). 100 권장.
+    - max_backlog: 한 번에 따라잡을 최대 트윗 수. 넘으면 최신 max_backlog개만 전송하고
+      그보다 오래된 밀린 트윗은 건너뛴다. (경고 로그 + metrics tweet_dropped)
+    - 여러 페이지를 따라잡을 때는 페이지 위치(페이지별 최신/최소 id)를 last_id 옆에 저장해 두고,
+      중간에 끊기면 다음 라운드는 처음부터 다시 훑지 않고 남은 페이지만 다시 받아 이어서 보낸다.
+    호출 측이 트윗마다(전송 후) last_id를 저장하므로 이미 보낸 트윗은 다시 나오지 않는다.
+    - api_client: 테스트용 가짜 tweepy.Client 주입 가능 (기본값은 전역 client)
     """
-    next_token = None
-    pages = []
+    api_client = api_client or client
+    cursor = last_id_store.get_cursor(user_id)
+    if cursor is not None:
+        # last_id보다 뒤에서 시작한 위치(파일을 손으로 고친 경우 등)는 버리고 새로 훑음
+        if cursor.get("since_id", 0) <= (since_id or 0):
+            try:
+                since_id = yield from _resume_catchup(api_client, user_id, since_id, cursor)
+            except (TweepyException, KeyError, TypeError, ValueError) as e:
+                # 조회/형식 오류 → 위치를 버리고 last_id부터 새로 훑음 (이미 보낸 트윗은 last_id로 걸러짐)
+                print(f"⚠️ 따라잡기 위치로 이어받기 실패 → 처음부터 다시 조회 (user_id={user_id}): {e}")
+        last_id_store.set_cursor(user_id, None)
 
+    # 최신 → 과거 순으로 훑어 페이지별로 모음 (max_backlog개까지, 축약본만 보관)
+    next_token = None
+    pages = []  # 페이지별 [(tweet, includes), ...] (최신→과거)
+    fetched = 0
+    more_left = False
     while True:
-        resp = call_with_retry(
-            client.get_users_tweets,
-            id=user_id,
-            since_id=since_id,
-            max_results=page_size,
-            exclude=["replies", "retweets"],  # Posts 탭과 일치
-            tweet_fields=["created_at", "id", "text", "attachments", "referenced_tweets"],
-            expansions=["attachments.media_keys", "referenced_tweets.id"],
-            media_fields=["url", "type"],
-            pagination_token=next_token
-        )
+        resp = _fetch_timeline_page(api_client, user_id, since_id, page_size, next_token)
 
         # 응답에 데이터가 없으면 종료
-        if not resp.data or len(resp.data) == 0:
+        if not resp.data:
             break
-
-        # 트위터는 보통 최신→과거 순으로 전달하므로, 페이지 내에서 뒤집어 '과거→최신' 순서로 정렬
-        page_tweets = list(reversed(resp.data))
-        pages.append((page_tweets, resp.includes))
+        records = _compact_page(resp, api_client)
+        pages.append(records)
+        fetched += len(records)
 
         # 다음 페이지가 있으면 이어서, 없으면 종료
         next_token = getattr(resp.meta, "next_token", None)
         if not next_token:
             break
+        if fetched >= max_backlog:
+            more_left = True
+            break
 
-    # 가장 오래된 페이지부터, 페이지 내부도 오래된 트윗부터 순차 처리
-    for page_tweets, includes in pages:
-        for t in page_tweets:
+    dropped = max(0, fetched - max_backlog)
+    if dropped:
+        pages[-1] = pages[-1][:len(pages[-1]) - dropped]
+    if dropped or more_left:
+        logging.warning(f"⚠️ 밀린 트윗이 {max_backlog}개를 넘어 최신 {max_backlog}개만 전송합니다. "
+                        f"오래된 트윗 {dropped}건{' 이상' if more_left else ''} 건너뜀 (user_id={user_id})")
+        metrics.inc("items_total", dropped, kind="tweet_dropped")
+
+    if len(pages) > 1:
+        # 페이지 위치 저장 (오래된 페이지부터): [페이지 최신 id, 페이지 최소 id]
+        last_id_store.set_cursor(user_id, {
+            "since_id": since_id or 0,
+            "page_size": page_size,
+            "pages": [[records[0][0].id, records[-1][0].id] for records in reversed(pages)],
+        })
+
+    # 가장 오래된 페이지부터, 페이지 안에서도 오래된 트윗부터. 다 보낸 페이지는 바로 놓아줌
+    while pages:
+        records = pages.pop()
+        for t, includes in reversed(records):
             yield t, includes
+    last_id_store.set_cursor(user_id, None)
+
+def _search_query(usernames: List[str]) -> str:
+    # -is:retweet -is:reply 는 타임라인의 exclude=["replies", "retweets"]와 동일
+    return "(" + " OR ".join(f"from:{u}" for u in usernames) + ") -is:retweet -is:reply"
 
-def call_with_retry(func, *args, retries=5, base=1.8, **kwargs):
+def _build_search_queries(usernames: List[str], max_len: int = SEARCH_QUERY_MAX_LEN) -> List[List[str]]:
     """
-    - 5xx(503 등), 네트워크 일시 오류 → 지수 백오프 재시도
-    - 429(TooManyRequests) → API가 제공하는 재시도 시간 또는 백오프
+    'from:a OR from:b ...' 쿼리가 검색 API 길이 제한을 넘지 않도록 계정을 묶음으로 나눈다.
+    """
+    groups, current = [], []
+    for name in usernames:
+        candidate = current + [name]
+        if current and len(_search_query(candidate)) > max_len:
+            groups.append(current)
+            current = [name]
+        else:
+            current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+def _snowflake_time(tweet_id: int) -> float:
+    """트윗 ID(snowflake)에 담긴 작성 시각 (epoch 초)"""
+    return ((int(tweet_id) >> 22) + TWITTER_EPOCH_MS) / 1000
+
+def fetch_new_tweets_by_search(accounts: List[tuple], api_client=None,
+                               max_backlog: int = CATCHUP_MAX_TWEETS) -> dict:
+    """
+    최근 검색(search_recent_tweets)으로 여러 계정의 새 트윗을 한 번에 가져와 계정별로 분배.
+    반환: {user_id: [(CompactTweet, includes), ...]} (계정별로 오래된 것부터)
+    - 각 계정의 last_id(since_id)보다 큰 트윗만 남긴다.
+    - 결과에는 자기 since_id 경계까지 빠짐없이 훑은 계정만 담는다. 아래 계정은 빠지며,
+      process_account()가 기존 타임라인 방식(따라잡기 상한/경고/이어받기 포함)으로 처리한다.
+      · last_id가 없는 계정(warm-start 필요), last_id=0인 계정(warm-start 때 트윗 없음)
+        (0인 계정을 묶음에 넣으면 공용 since_id에 옛 트윗이 잘리거나, 묶음 전체가 0이면 7일치 검색 결과를 다시 보냄)
+      · last_id가 최근 검색 기간(7일)보다 오래된 계정 (검색으로는 그 사이 트윗을 다 볼 수 없음)
+      · 새 트윗이 계정당 max_backlog개를 넘은 계정, 페이지 상한에 걸려 경계까지 못 닿은 계정
+      · 검색이 실패한 묶음의 계정
+    - 페이지 상한은 묶음 계정 수 × max_backlog 만큼의 트윗 (모든 계정이 경계에 닿으면 그 전에 멈춤)
+    - api_client: 테스트용 가짜 tweepy.Client 주입 가능 (기본값은 전역 client)
+    """
+    api_client = api_client or client
+    since_ids = {}
+    name_by_id = {}
+    stale = []
+    window_start = time.time() - SEARCH_WINDOW_SECONDS
+    for user_id, username in accounts:
+        last_id = get_last_id(user_id)
+        if not last_id:
+            continue
+        if _snowflake_time(last_id) < window_start:
+            stale.append(username)
+            continue
+        since_ids[user_id] = last_id
+        name_by_id[user_id] = username.strip().lstrip("@")
+    if stale:
+        print(f"ℹ️ 마지막 트윗이 최근 검색 기간보다 오래돼 타임라인 방식으로 조회: {', '.join(stale)}")
+
+    result = {}
+    ids_by_name = {name.lower(): uid for uid, name in name_by_id.items()}
+    for group in _build_search_queries(list(name_by_id.values())):
+        group_ids = [ids_by_name[n.lower()] for n in group]
+        # 묶음 전체의 since_id는 가장 작은 값 (계정별 경계는 아래에서 다시 거름)
+        floor = min(since_ids[uid] for uid in group_ids)
+        query = _search_query(group)
+        per_account = {uid: [] for uid in group_ids}
+        pending = set(group_ids)  # 아직 자기 since_id 경계까지 훑지 못한 계정
+        overflow = set()          # 새 트윗이 max_backlog개를 넘은 계정
+        max_pages = max(1, math.ceil(max_backlog * len(group_ids) / SEARCH_PAGE_SIZE))
+        try:
+            next_token = None
+            pages = 0
+            while pending:
+                resp = call_with_retry(
+                    api_client.search_recent_tweets,
+                    query=query,
+                    since_id=floor,
+                    max_results=SEARCH_PAGE_SIZE,
+                    tweet_fields=["created_at", "id", "text", "attachments", "referenced_tweets", "author_id", "note_tweet"],
+                    expansions=TWEET_EXPANSIONS,
+                    media_fields=["url", "type"],
+                    next_token=next_token,
+                )
+                pages += 1
+                if not resp.data:
+                    pending.clear()
+                    break
+                for t, includes in _compact_page(resp, api_client):
+                    uid = str(t.author_id)
+                    if uid not in pending:
+                        continue  # 다른 계정이거나 이미 경계까지 훑은/넘친 계정
+                    if t.id <= since_ids[uid]:
+                        continue  # 이 계정 기준으로는 이미 전송한 트윗
+                    if len(per_account[uid]) >= max_backlog:
+                        overflow.add(uid)
+                        pending.discard(uid)
+                        per_account[uid] = []
+                        continue
+                    per_account[uid].append((t, includes))
+                # 검색 결과는 최신→과거 순 → 이 페이지의 가장 오래된 id 이하가 경계인 계정은 다 훑음
+                oldest = min(t.id for t in resp.data)
+                pending -= {uid for uid in pending if since_ids[uid] >= oldest}
+                next_token = getattr(resp.meta, "next_token", None)
+                if not next_token:
+                    pending.clear()
+                    break
+                if pages >= max_pages:
+                    break
+        except Exception as e:
+            explain_tweepy_error(e)
+            print(f"⚠️ 묶음 검색 실패 → 타임라인 방식으로 대체: {', '.join(group)} ({e})")
+            continue
+
+        incomplete = pending | overflow
+        if incomplete:
+            names = ", ".join(name_by_id[uid] for uid in group_ids if uid in incomplete)
+            print(f"⚠️ 묶음 검색으로 경계까지 못 가져옴(밀린 트윗 초과/페이지 상한) → 타임라인 방식으로 대체: {names}")
+        for uid, items in per_account.items():
+            if uid in incomplete:
+                continue
+            items.sort(key=lambda pair: pair[0].id)  # 오래된 것부터
+            result[uid] = items
+    return result
+
+def call_with_retry(func, *args, retries=3, base=1.8, max_wait=5.0, **kwargs):
+    """
+    - 5xx(503 등), 네트워크 일시 오류 → 짧은 지수 백오프 재시도 (한 번에 최대 max_wait초)
+    - 429/예산 소진 → 잠들지 않고 RateLimitDeferred로 바로 올림 (스케줄러가 계정을 리셋 이후로 미룸)
     """
     attempt = 0
     while True:
         try:
             return func(*args, **kwargs)
+        except RateLimitDeferred:
+            raise
         except TooManyRequests as e:
-            wait = getattr(e, "retry_after", None)
-            if not wait:
-                wait = base ** attempt
-            print(f"⏳ 429 대기 {wait:.1f}s")
-            time.sleep(wait)
-            attempt += 1
+            # BudgetedClient가 아닌 클라이언트(테스트용 등)의 429
+            reset = getattr(e, "reset_time", None)
+            retry_in = reset - time.time() if reset else RATE_LIMIT_DEFAULT_WAIT
+            raise RateLimitDeferred(getattr(func, "__name__", "X API"), max(0.0, retry_in)) from e
         except TweepyHTTPException as e:
             code = getattr(getattr(e, "response", None), "status_code", None)
             if code and 500 <= code < 600 and attempt < retries:
-                wait = base ** attempt
+                wait = min(max_wait, base ** attempt)
                 print(f"⏳ {code} 재시도 {attempt+1}/{retries} (대기 {wait:.1f}s)")
                 time.sleep(wait)
                 attempt += 1
@@ -613,78 +1781,138 @@ def call_with_retry(func, *args, retries=5, base=1.8, **kwargs):
             raise
         except TweepyException as e:
             if attempt < retries:
-                wait = base ** attempt
+                wait = min(max_wait, base ** attempt)
                 print(f"⏳ 일시 오류 재시도 {attempt+1}/{retries} (대기 {wait:.1f}s): {e}")
                 time.sleep(wait)
                 attempt += 1
                 continue
             raise
 
-def fetch_original_retweet(tweet, client, username):
-    if tweet.referenced_tweets:
-        for ref in tweet.referenced_tweets:
-            if ref.type == "retweeted":
-                response = client.get_tweet(
-                    id=ref.id,
-                    tweet_fields=["created_at", "text", "attachments"],
-                    expansions=["attachments.media_keys"],
-                    media_fields=["url", "type"]
-                )
+def start_original_retweet(tweet, client, username, includes=None, crawl: bool = True) -> Future:
+    """
+    리트윗이면 원본의 (전체 텍스트, 이미지 URL)을 담을 Future 반환.
+    원본은 페이지 includes(tweets)에서 먼저 찾고, 없을 때만 get_tweet으로 개별 조회한다.
+    원본 본문의 크롤링은 기다리지 않고 크롤링 대기열 결과에 연결만 한다 (블로킹 없음).
+    crawl=False면 긴 원본도 크롤링 없이 API 텍스트를 사용한다.
+    """
+    rid = _retweeted_id(tweet)
+    if rid is None:
+        # 리트윗이 아니면
+        return _done_future((tweet.text, []))
+
+    original_tweet = _index_tweets(includes).get(rid)
+    if original_tweet is not None:
+        print(f"🔁 리트윗 원본을 includes에서 확보: {rid}")
+        original_includes = includes
+    else:
+        response = call_with_retry(
+            client.get_tweet,
+            id=rid,
+            tweet_fields=["created_at", "text", "attachments", "note_tweet"],
+            expansions=["attachments.media_keys"],
+            media_fields=["url", "type"]
+        )
+        print(response.data)
+        print(response.includes)
+        original_tweet = response.data
+        original_includes = response.includes
 
-                print(response.data)
-                print(response.includes)
-                
-                # 원본 트윗의 전체 텍스트 가져오기 (크롤링 포함)
-                original_tweet = response.data
-                full_text = get_full_tweet_text(original_tweet, username)
-                
-                media_urls = extract_image_urls(original_tweet, response.includes)
-                
-                return full_text, media_urls
+    # 원본 트윗의 전체 텍스트 (크롤링 포함) + 이미지
+    media_urls = extract_image_urls(original_tweet, original_includes)
+    return _with_images(start_full_tweet_text(original_tweet, username, crawl), media_urls)
 
-    # 리트윗이 아니면
-    return tweet.text, []
+def fetch_original_retweet(tweet, client, username, includes=None, crawl: bool = True):
+    """리트윗이면 원본의 (전체 텍스트, 이미지 URL) 반환 (크롤링이 필요하면 결과나 마감까지 대기)"""
+    return start_original_retweet(tweet, client, username, includes, crawl).result()
 
-def get_full_tweet_text(tweet, username):
-    """트윗의 전체 텍스트를 가져오는 함수"""
-    api_text = tweet.text
-    
-    # 텍스트 길이가 임계값을 넘으면 크롤링 시도
-    if len(api_text) >= TEXT_LENGTH_THRESHOLD:
-        print(f"📏 텍스트 길이({len(api_text)}자)가 임계값({TEXT_LENGTH_THRESHOLD}자)을 초과하여 크롤링을 시도합니다.")
-        
-        # 크롤링 빈도 제한 (너무 자주 크롤링하지 않도록)
-        if hasattr(get_full_tweet_text, 'last_crawl_time'):
-            time_since_last = time.time() - get_full_tweet_text.last_crawl_time
-            if time_since_last < 30:  # 30초 내에 다시 크롤링하지 않음
-                wait_time = 30 - time_since_last + 2
-                print(f"⏰ 크롤링 빈도 제한: {wait_time:.1f}초 대기 후 크롤링 진행")
-                time.sleep(wait_time)
-                print("✅ 대기 완료, 크롤링 시작")
-        
+def _with_images(text_fut: Future, image_urls: List[str]) -> Future:
+    """본문 Future가 끝나면 (본문, 이미지 URL)로 완료되는 Future"""
+    result = Future()
+
+    def _finish(f: Future):
         try:
-            # 크롤링 전 랜덤 대기
-            pre_crawl_delay = random.uniform(1, 3)
-            print(f"🔄 크롤링 전 대기: {pre_crawl_delay:.1f}초")
-            time.sleep(pre_crawl_delay)
-            
-            crawled_text = get_crawler().crawl_full_tweet_text(tweet.id, username)
-            
-            # 크롤링 시간 기록
-            get_full_tweet_text.last_crawl_time = time.time()
-            
-            if crawled_text and len(crawled_text) > len(api_text):
-                print(f"✅ 크롤링으로 더 긴 텍스트를 가져왔습니다! ({len(crawled_text)}자)")
-                return crawled_text
-            else:
-                print(f"ℹ️ 크롤링 결과가 API 텍스트와 동일하거나 짧습니다. API 텍스트를 사용합니다.")
-                return api_text
+            result.set_result((f.result(), image_urls))
         except Exception as e:
-            print(f"❌ 크롤링 중 오류 발생: {e}")
-            return api_text
-    else:
+            result.set_exception(e)
+
+    text_fut.add_done_callback(_finish)
+    return result
+
+# 전체 텍스트를 어디서 얻었는지 집계 (브라우저 폴백이 얼마나 남았는지 확인용)
+full_text_stats = {"api_text": 0, "note_tweet": 0, "browser_fallback": 0, "browser_longer": 0}
+_full_text_stats_lock = threading.Lock()
+
+def _count_full_text(source: str):
+    with _full_text_stats_lock:
+        full_text_stats[source] += 1
+
+def get_full_text_stats() -> dict:
+    with _full_text_stats_lock:
+        return dict(full_text_stats)
+
+def print_full_text_stats():
+    st = get_full_text_stats()
+    print(f"📜 전체 텍스트: API {st['api_text']}건, note_tweet {st['note_tweet']}건, "
+          f"브라우저 폴백 {st['browser_fallback']}건 (더 긴 텍스트 {st['browser_longer']}건)")
+
+def note_tweet_text(tweet) -> Optional[str]:
+    """tweet_fields=["note_tweet"]로 받은 긴 글(long-form) 전체 텍스트. 없으면 None."""
+    note = getattr(tweet, "note_tweet", None)
+    if note is None:
+        data = getattr(tweet, "data", None)
+        if isinstance(data, dict):
+            note = data.get("note_tweet")
+    if isinstance(note, dict) and note.get("text"):
+        return note["text"]
+    return None
+
+def _pick_crawled_text(api_text: str, crawled_text: Optional[str]) -> str:
+    if crawled_text and len(crawled_text) > len(api_text):
+        print(f"✅ 크롤링으로 더 긴 텍스트를 가져왔습니다! ({len(crawled_text)}자)")
+        _count_full_text("browser_longer")
+        return crawled_text
+    print(f"ℹ️ 크롤링 결과가 없거나 API 텍스트보다 길지 않습니다. API 텍스트를 사용합니다.")
+    return api_text
+
+def start_full_tweet_text(tweet, username, crawl: bool = True) -> Future:
+    """
+    트윗의 전체 텍스트를 담을 Future 반환 (블로킹 없음).
+    1) API 응답의 note_tweet(긴 글 전체 텍스트)이 있으면 그대로 사용
+    2) 없고 텍스트가 임계값 이상일 때만 크롤링 대기열에 넣음 → 마감 내 결과가 없으면 API 텍스트
+       crawl=False(결과를 바로 기다리는 순차 처리)면 크롤링 없이 API 텍스트
+    """
+    api_text = tweet.text
+
+    long_text = note_tweet_text(tweet)
+    if long_text:
+        print(f"📜 note_tweet으로 전체 텍스트 확보 ({len(long_text)}자)")
+        _count_full_text("note_tweet")
+        return _done_future(long_text)
+
+    if len(api_text) < TEXT_LENGTH_THRESHOLD:
         print(f"📏 텍스트 길이({len(api_text)}자)가 임계값({TEXT_LENGTH_THRESHOLD}자) 미만입니다. API 텍스트를 사용합니다.")
-        return api_text
+        _count_full_text("api_text")
+        return _done_future(api_text)
+
+    if not crawl:
+        print(f"📏 텍스트 길이({len(api_text)}자)가 임계값을 넘지만 순차 처리라 크롤링 없이 API 텍스트를 사용합니다.")
+        _count_full_text("api_text")
+        return _done_future(api_text)
+
+    # 텍스트 길이가 임계값을 넘으면 크롤링 대기열로
+    print(f"📏 텍스트 길이({len(api_text)}자)가 임계값({TEXT_LENGTH_THRESHOLD}자)을 초과하여 크롤링을 예약합니다.")
+    _count_full_text("browser_fallback")
+    result = Future()
+
+    def _finish(crawl_fut: Future):
+        result.set_result(_pick_crawled_text(api_text, crawl_fut.result()))
+
+    crawl_queue.submit(tweet.id, username).add_done_callback(_finish)
+    return result
+
+def get_full_tweet_text(tweet, username, crawl: bool = True):
+    """트윗의 전체 텍스트 (crawl=True면 크롤링 결과나 마감까지 대기)"""
+    return start_full_tweet_text(tweet, username, crawl).result()
 
 def extract_image_urls(tweet, includes):
     media_urls = []
@@ -697,78 +1925,43 @@ def extract_image_urls(tweet, includes):
                 media_urls.append(media["url"])
     return media_urls
 
+def build_telegram_calls(message: str, image_urls: List[str]) -> List[tuple]:
+    """메시지+이미지를 텔레그램 API 호출 목록 [(method, payload, as_json), ...]으로 변환 (보낼 순서대로)"""
+    text_call = ("sendMessage", {"chat_id": TELEGRAM_CHANNEL_ID, "text": message}, False)
+    if not image_urls:
+        # 이미지가 없을 경우
+        return [text_call]
+    if len(image_urls) == 1:
+        # 이미지가 1장일 때는 sendPhoto
+        if len(message) <= MAX_CAPTION_LENGTH:
+            return [("sendPhoto", {"chat_id": TELEGRAM_CHANNEL_ID, "photo": image_urls[0], "caption": message}, False)]
+        # 메시지가 길면 사진만 보내고 텍스트 따로
+        return [("sendPhoto", {"chat_id": TELEGRAM_CHANNEL_ID, "photo": image_urls[0]}, False), text_call]
+    # 이미지가 여러 장일 때는 sendMediaGroup (최대 10장, 첫 장에만 캡션)
+    media = []
+    for i, u in enumerate(image_urls[:10]):
+        item = {"type": "photo", "media": u}
+        if i == 0 and len(message) <= MAX_CAPTION_LENGTH:
+            item["caption"] = message
+        media.append(item)
+    calls = [("sendMediaGroup", {"chat_id": TELEGRAM_CHANNEL_ID, "media": media}, True)]
+    if len(message) > MAX_CAPTION_LENGTH:
+        # 캡션 길이 초과분은 별도 메시지 전송
+        calls.append(text_call)
+    return calls
+
 def send_to_telegram_with_optional_image(message: str, image_urls: List[str]):
+    """
+    텔레그램 outbox(디스크 대기열)에 넣고 바로 반환.
+    실제 전송/재시도/전송 간격 조절은 outbox 워커가 담당한다.
+    """
     try:
-        send_text_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-
-        if image_urls:
-            if len(image_urls) == 1:
-                # 이미지가 1장일 때는 sendPhoto
-                send_photo_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendPhoto"
-                if len(message) <= MAX_CAPTION_LENGTH:
-                    photo_payload = {
-                        "chat_id": TELEGRAM_CHANNEL_ID,
-                        "photo": image_urls[0],
-                        "caption": message
-                    }
-                    response = requests.post(send_photo_url, data=photo_payload, timeout=TELEGRAM_TIMEOUT)
-                    response.raise_for_status()
-                    print("✅ 사진+메시지 전송 완료")
-                else:
-                    # 메시지가 길면 사진만 보내고 텍스트 따로
-                    response = requests.post(
-                        send_photo_url,
-                        data={"chat_id": TELEGRAM_CHANNEL_ID, "photo": image_urls[0]},
-                        timeout=TELEGRAM_TIMEOUT,
-                    )
-                    response.raise_for_status()
-                    print("✅ 사진 전송 완료 (텍스트는 별도 전송)")
-                    response = requests.post(
-                        send_text_url,
-                        data={"chat_id": TELEGRAM_CHANNEL_ID,"text": message},
-                        timeout=TELEGRAM_TIMEOUT,
-                    )
-                    response.raise_for_status()
-                    print("✅ 텍스트 전송 완료")
-            else:
-                # 이미지가 여러 장일 때는 sendMediaGroup
-                send_group_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMediaGroup"
-                media = []
-                for i, u in enumerate(image_urls[:10]):  # 최대 10장
-                    item = {"type": "photo", "media": u}
-                    if i == 0 and len(message) <= MAX_CAPTION_LENGTH:
-                        item["caption"] = message
-                    media.append(item)
-                response = requests.post(
-                    send_group_url,
-                    json={"chat_id": TELEGRAM_CHANNEL_ID, "media": media},
-                    timeout=TELEGRAM_TIMEOUT,
-                )
-                response.raise_for_status()
-                print(f"✅ 사진 {len(media)}장 전송 완료 (첫 장에만 캡션)")
-                if len(message) > MAX_CAPTION_LENGTH:
-                    # 캡션 길이 초과분은 별도 메시지 전송
-                    response = requests.post(
-                        send_text_url,
-                        data={"chat_id": TELEGRAM_CHANNEL_ID,"text": message},
-                        timeout=TELEGRAM_TIMEOUT,
-                    )
-                    response.raise_for_status()
-                    print("✅ 추가 텍스트 전송 완료")
-        else:
-            # 이미지가 없을 경우
-            response = requests.post(
-                send_text_url,
-                data={"chat_id": TELEGRAM_CHANNEL_ID, "text": message},
-                timeout=TELEGRAM_TIMEOUT,
-            )
-            response.raise_for_status()
-            print("✅ 텍스트 전송 완료 (이미지 없음)")
-    except (RequestException, Timeout) as e:
-        print("❌ 전송 실패(네트워크/타임아웃):", e)
-        print("📦 실패한 메시지:", message)
+        calls = build_telegram_calls(message, image_urls)
+        get_outbox().enqueue_many(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, calls, source="x")
+        metrics.inc("items_total", kind="message_queued")
+        print(f"📮 전송 대기열 등록 ({', '.join(c[0] for c in calls)})")
     except Exception as e:
-        print("❌ 전송 실패:", e)
+        print("❌ 전송 대기열 등록 실패:", e)
         print("📦 실패한 메시지:", message)
 
 # def send_to_telegram_with_optional_image(message: str, image_urls: List[str]):
@@ -820,19 +2013,11 @@ def send_to_telegram_with_optional_image(message: str, image_urls: List[str]):
 #         print("📦 실패한 메시지:", message)
 
 def send_to_telegram(message):
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHANNEL_ID,
-        "text": message
-    }
     try:
-        response = requests.post(url, data=payload, timeout=TELEGRAM_TIMEOUT)
-        response.raise_for_status()
-    except (RequestException, Timeout) as e:
-        print("❌ 텔레그램 전송 실패(네트워크/타임아웃):", e)
-        print("📦 실패한 메시지:", message)
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, message, source="x")
+        metrics.inc("items_total", kind="message_queued")
     except Exception as e:
-        print("❌ 텔레그램 전송 실패(기타):", e)
+        print("❌ 텔레그램 대기열 등록 실패:", e)
         print("📦 실패한 메시지:", message)
 
 def bootstrap_warm_start(user_id: str, username: str):
@@ -873,24 +2058,136 @@ def trump_load_last_ts() -> float:
     except Exception:
         return 0.0
 
-def trump_save_last_ts(ts: float):
-    with open(_ts_file_path(), "w", encoding="utf-8") as f:
-        f.write(str(ts))
-
-def trump_entry_ts(e) -> float:
+def _entry_published(e) -> Tuple[float, Optional[datetime]]:
+    """published/updated를 한 번만 파싱해 (timestamp, datetime) 반환. 실패하면 (0.0, None)"""
     for k in ("published", "updated"):
-        if k in e and e[k]:
+        raw = (e.get(k) or "").strip()
+        if raw:
             try:
-                return parsedate_to_datetime(e[k]).timestamp()
+                dt = parsedate_to_datetime(raw)
+                return dt.timestamp(), dt
             except Exception:
                 pass
-    return 0.0
+    return 0.0, None
+
+class RssSource:
+    """
+    RSS 피드 폴링 어댑터.
+    - 폴링마다 한 번만 요청, ETag/Last-Modified 조건부 GET → 304면 파싱 없이 끝
+    - 항목마다 시각을 한 번만 파싱해 {"key", "ts", "dt", "entry"}로 보관 (오래된 것부터 정렬)
+    - GUID(없으면 링크)와 시각 둘 다로 중복 제거 → 같은 초에 올라온 글도, 수정돼 시각이 바뀐 글도 한 번만
+    - 상태(마지막 시각, 검증자, 본 GUID)는 JSON 파일에 원자적으로 저장
+    - 새 검증자는 돌려준 글을 전부 처리(mark_seen)한 뒤 commit()에서만 저장
+      → 전송 도중 죽거나 실패해도 다음 폴링이 304로 남은 글을 건너뛰지 않음
+    """
+    def __init__(self, url: str, state_path: str, legacy_ts_path: Optional[str] = None,
+                 seen_limit: int = TRUMP_SEEN_LIMIT):
+        self.url = url
+        self.state_path = state_path
+        self.seen_limit = seen_limit
+        self.not_modified = 0
+        self.fetched = 0
+        self._state = self._load_state(legacy_ts_path)
+        self._seen = set(self._state["seen"])
+        self._pending_validators = None   # 마지막 200 응답의 (ETag, Last-Modified), 아직 저장 전
+        self._outstanding = set()         # poll()이 돌려줬지만 아직 mark_seen 안 된 글 key
+
+    def _load_state(self, legacy_ts_path: Optional[str]) -> dict:
+        state = {"last_ts": 0.0, "etag": None, "modified": None, "seen": []}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state.update(json.load(f))
+        except FileNotFoundError:
+            if legacy_ts_path and os.path.exists(legacy_ts_path):
+                # 예전 파일은 '이 시각의 글까지 보냄' 의미 → 같은 초의 글을 다시 보내지 않도록 0.5초 뒤로
+                state["last_ts"] = trump_load_last_ts() + 0.5
+        except Exception as e:
+            print(f"⚠️ [RSS] 상태 파일 읽기 오류: {e}")
+        return state
 
-def trump_fetch_entries_sorted():
-    feed = feedparser.parse(RSS_URL)
-    entries = feed.entries or []
-    entries.sort(key=trump_entry_ts)  # 오래된 → 최신
-    return entries
+    def _save_state(self):
+        self._state["seen"] = self._state["seen"][-self.seen_limit:]
+        self._seen = set(self._state["seen"])
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"⚠️ [RSS] 상태 저장 오류: {e}")
+
+    @property
+    def first_run(self) -> bool:
+        return not self._state["last_ts"] and not self._state["seen"]
+
+    def fetch(self) -> Optional[List[dict]]:
+        """
+        피드를 한 번 가져와 오래된 → 최신 순 레코드 목록 반환.
+        304(변경 없음)이면 None.
+        """
+        self._pending_validators = None
+        self._outstanding = set()
+        headers = {}
+        if self._state.get("etag"):
+            headers["If-None-Match"] = self._state["etag"]
+        if self._state.get("modified"):
+            headers["If-Modified-Since"] = self._state["modified"]
+        resp = session.get(self.url, headers=headers, timeout=HTTP_TIMEOUT)
+        if resp.status_code == 304:
+            self.not_modified += 1
+            return None
+        resp.raise_for_status()
+        self.fetched += 1
+        self._pending_validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+        records = []
+        with metrics.timer("parse", page="rss"):
+            entries = feedparser.parse(resp.content).entries or []
+        for e in entries:
+            ts, dt = _entry_published(e)
+            key = (e.get("id") or e.get("guid") or e.get("link") or "").strip()
+            records.append({"key": key or f"ts:{ts}", "ts": ts, "dt": dt, "entry": e})
+        records.sort(key=lambda r: r["ts"])
+        return records
+
+    def is_new(self, record: dict) -> bool:
+        return record["key"] not in self._seen and record["ts"] >= self._state["last_ts"]
+
+    def mark_seen(self, record: dict):
+        self._outstanding.discard(record["key"])
+        if record["key"] not in self._seen:
+            self._seen.add(record["key"])
+            self._state["seen"].append(record["key"])
+        self._state["last_ts"] = max(self._state["last_ts"], record["ts"])
+
+    def poll(self, backfill: int = TRUMP_BACKFILL_COUNT) -> List[dict]:
+        """
+        새 글 레코드(오래된 것부터) 반환.
+        첫 실행이면 최신 backfill개만 새 글로 돌려주고 나머지는 본 것으로 처리.
+        호출 측은 처리한 레코드마다 mark_seen() 후 commit()을 호출한다.
+        """
+        records = self.fetch()
+        if records is None:
+            return []  # 304: 저장된 상태 그대로
+        if self.first_run:
+            old, new = (records[:-backfill], records[-backfill:]) if backfill > 0 else (records, [])
+            for r in old:
+                self.mark_seen(r)
+            print(f"🚀 [TRUMP RSS] 첫 실행 백필: 최신 {len(new)}개 전송")
+        else:
+            new = [r for r in records if self.is_new(r)]
+        self._outstanding = {r["key"] for r in new}
+        self.commit()
+        return new
+
+    def commit(self):
+        """처리한 글(last_ts/seen) 저장. 돌려준 글을 전부 처리했을 때만 새 검증자도 함께 저장"""
+        if self._pending_validators is not None and not self._outstanding:
+            self._state["etag"], self._state["modified"] = self._pending_validators
+            self._pending_validators = None
+        self._save_state()
 
 def trump_clean_text(html_text: str) -> str:
     text = re.sub(r"<br\s*/?>", "\n", html_text or "", flags=re.I)
@@ -945,71 +2242,43 @@ def trump_format_message_like_twitter(entry_text: str, published_dt: Optional[da
     # msg += f"\n🔗 원문: {link}\n"
     return msg
 
-def trump_fetch_new_entries():
-    entries = trump_fetch_entries_sorted()
-    last_ts = trump_load_last_ts()
-    new_items = [e for e in entries if trump_entry_ts(e) > last_ts]
-    if entries:
-        newest_ts = max(trump_entry_ts(e) for e in entries)
-        trump_save_last_ts(newest_ts)
-    return new_items
-
-def trump_first_run_backfill(count: int = 3):
-    entries = trump_fetch_entries_sorted()
-    if not entries:
-        print("⚠️ [TRUMP RSS] 피드 비어있음, 백필 불가")
-        return
-    backfill = entries[-count:] if count > 0 else []
-    print(f"🚀 [TRUMP RSS] 첫 실행 백필: 최신 {len(backfill)}개 전송")
-    for e in backfill:
-        # 본문/링크/시각
-        link = (e.get("link") or "").strip()
-        body = trump_clean_text(e.get("summary") or "")
-        # 시각 파싱
-        pub_raw = (e.get("published") or e.get("updated") or "").strip()
-        pub_dt = None
-        try:
-            if pub_raw:
-                pub_dt = parsedate_to_datetime(pub_raw)
-        except Exception:
-            pub_dt = None
-        imgs = trump_extract_image_urls(e)
-        msg = trump_format_message_like_twitter(body, pub_dt, TRUMP_USERNAME, link, imgs)
-        send_to_telegram_with_optional_image(msg, imgs)
-    newest_ts = max(trump_entry_ts(e) for e in entries)
-    trump_save_last_ts(newest_ts)
+trump_source = RssSource(
+    RSS_URL,
+    os.path.join(BASE_DIR, TRUMP_STATE_JSON),
+    legacy_ts_path=_ts_file_path(),
+)
 
 def trump_poll_once():
     """트루스소셜 새 글을 한 번 폴링하여 X와 동일 포맷으로 텔레그램 전송"""
     try:
-        if trump_load_last_ts() == 0.0:
-            # 첫 실행이면 백필 후 상태 저장
-            trump_first_run_backfill(3)
-        new_entries = trump_fetch_new_entries()
-        if not new_entries:
+        new_records = trump_source.poll()
+        if not new_records:
             print("🔎 [TRUMP RSS] 새 글 없음")
             return
-        for e in new_entries:
+        for r in new_records:
+            e = r["entry"]
             link = (e.get("link") or "").strip()
             body = trump_clean_text(e.get("summary") or "")
             if not body.strip():
                 print("⚠️ [TRUMP RSS] 본문 없음, 스킵:", link)
+                trump_source.mark_seen(r)
                 continue
-            
-            pub_raw = (e.get("published") or e.get("updated") or "").strip()
-            pub_dt = None
-            try:
-                if pub_raw:
-                    pub_dt = parsedate_to_datetime(pub_raw)
-            except Exception:
-                pub_dt = None
             imgs = trump_extract_image_urls(e)
-            msg = trump_format_message_like_twitter(body, pub_dt, TRUMP_USERNAME, link, imgs)
+            msg = trump_format_message_like_twitter(body, r["dt"], TRUMP_USERNAME, link, imgs)
             send_to_telegram_with_optional_image(msg, imgs)
+            trump_source.mark_seen(r)
+            trump_source.commit()
             print("✅ [TRUMP RSS] 텔레그램 전송 완료")
+        trump_source.commit()
     except Exception as ex:
         print("❌ [TRUMP RSS] 처리 오류:", ex)
 
+def trump_poll_loop(stop_event: threading.Event, interval: float = TRUMP_POLL_INTERVAL):
+    """X 라운드와 별개로 TRUMP_POLL_INTERVAL마다 RSS 폴링 (stop_event가 설정되면 종료)"""
+    while not stop_event.is_set():
+        trump_poll_once()
+        stop_event.wait(interval)
+
 def explain_tweepy_error(e):
     try:
         code = getattr(getattr(e, "response", None), "status_code", None)
@@ -1018,9 +2287,558 @@ def explain_tweepy_error(e):
     except Exception:
         print(f"❌ Tweepy error: {repr(e)}")
 
+def start_enrich_tweet(tweet, includes, username: str, crawl: bool = True) -> Future:
+    """
+    (본문, 이미지 URL) Future 반환 (크롤링 결과를 기다리며 막히지 않음).
+    리트윗이면 원본 조회 후 원본 본문, 아니면 이미지는 바로 추출하고 본문은 필요 시 크롤링 대기열 결과에 연결.
+    crawl=False면 크롤링 없이 API 텍스트 (start_full_tweet_text 참고)
+    """
+    if tweet.referenced_tweets:
+        try:
+            return start_original_retweet(tweet, client, username, includes, crawl)
+        except Exception as e:
+            fut = Future()
+            fut.set_exception(e)
+            return fut
+    return _with_images(start_full_tweet_text(tweet, username, crawl), extract_image_urls(tweet, includes))
+
+def enrich_tweet(tweet, includes, username: str, crawl: bool = True):
+    """리트윗이면 원본 텍스트/이미지 추출, 아니면 (crawl=True면 필요 시 크롤링한) 본문과 이미지 반환"""
+    return start_enrich_tweet(tweet, includes, username, crawl).result()
+
+def translate_tweet_text(full_text: str) -> str:
+    # 번역 (None 가드)
+    translated_text = translate_preserving_emojis_and_urls(full_text)
+    if translated_text is None:
+        translated_text = "[번역 실패: 모든 엔진에서 오류 발생]"
+    return translated_text
+
+def build_tweet_message(full_text: str, translated_text: str, username: str, tweet) -> str:
+    created_at = tweet.created_at.strftime("%m/%d %H:%M")
+    return (
+        f"🐦 원문:\n{full_text}\n\n"
+        f"🌐 번역:\n{translated_text}\n\n🔗"
+        f"👤 작성자 : {username}\n"
+        f"🕒 작성 시각: {created_at}\n"
+    )
+
+class TweetPipeline:
+    """
+    수집 → 보강(원문/크롤링/이미지) → 번역 → 전송 단계를 큐로 연결한 파이프라인.
+    - 단계마다 워커 수를 따로 두고, 큐 크기/in-flight 상한으로 back-pressure
+    - 서로 다른 트윗의 크롤링·번역·전송이 겹쳐서 진행된다
+    - 전송은 단일 스레드가 계정별 투입 순서(seq)대로만 수행 → 계정별 작성 순서 유지
+      (긴 트윗 크롤링을 기다리는 동안에도 다른 계정의 트윗은 먼저 전송됨)
+    - last_id는 실제 전송(또는 제외 처리)이 끝난 뒤에 저장
+    - 한 트윗이 실패하면 이번 라운드에서 그 계정의 이후 트윗은 보내지 않음
+      (last_id가 실패 지점에 머물러 다음 라운드에 다시 시도)
+    """
+    def __init__(self, enrich_workers: int = ENRICH_WORKERS, translate_workers: int = TRANSLATE_WORKERS,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, max_in_flight: int = PIPELINE_MAX_IN_FLIGHT):
+        self._enrich_q = queue.Queue(maxsize=queue_size)
+        self._translate_q = queue.Queue(maxsize=queue_size)
+        self._deliver_q = queue.Queue(maxsize=queue_size)
+        # 보강 완료 → 번역 대기열 사이 전달용 (Future 콜백은 여기에만 넣고 바로 반환, 크기는 in-flight 상한으로 제한됨)
+        self._enriched = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._seq = defaultdict(itertools.count)  # user_id → 계정별 순번
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._failed_accounts = set()
+        self._threads = []
+        for i in range(enrich_workers):
+            self._start(self._enrich_worker, f"pipeline-enrich-{i}")
+        self._start(self._forward_worker, "pipeline-forward")
+        for i in range(translate_workers):
+            self._start(self._translate_worker, f"pipeline-translate-{i}")
+        self._start(self._deliver_worker, "pipeline-deliver")
+        self._enrich_workers = enrich_workers
+        self._translate_workers = translate_workers
+
+    def _start(self, target, name):
+        t = threading.Thread(target=target, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def submit(self, user_id: str, username: str, tweet, includes, skip: bool = False):
+        """트윗 하나를 투입. in-flight 상한에 걸리면 자리가 날 때까지 대기"""
+        self._slots.acquire()
+        with self._lock:
+            job = {
+                "seq": next(self._seq[user_id]),
+                "user_id": user_id,
+                "username": username,
+                "tweet": tweet,
+                "includes": includes,
+                "skip": skip,
+                "error": None,
+            }
+            self._pending += 1
+        if skip:
+            self._deliver_q.put(job)
+        else:
+            self._enrich_q.put(job)
+
+    def start_round(self):
+        with self._lock:
+            self._failed_accounts.clear()
+
+    def join(self):
+        """투입된 트윗이 모두 전송될 때까지 대기"""
+        with self._idle:
+            while self._pending:
+                self._idle.wait()
+
+    def close(self):
+        """남은 트윗을 모두 보낸 뒤 워커 종료 (큐가 비어 있으므로 단계별로 종료 신호만 넣음)"""
+        self.join()
+        for _ in range(self._enrich_workers):
+            self._enrich_q.put(None)
+        self._enriched.put(None)
+        for _ in range(self._translate_workers):
+            self._translate_q.put(None)
+        self._deliver_q.put(None)
+        for t in self._threads:
+            t.join(timeout=5)
+
+    def _enrich_worker(self):
+        while True:
+            job = self._enrich_q.get()
+            if job is None:
+                return
+            try:
+                fut = start_enrich_tweet(job["tweet"], job["includes"], job["username"])
+            except Exception as e:
+                fut = Future()
+                fut.set_exception(e)
+            # 크롤링이 필요한 긴 트윗은 대기열 결과(또는 마감)가 나올 때 번역 단계로 넘어감
+            # → 보강 워커는 바로 다음 트윗을 처리, 전송 순서는 재정렬 버퍼가 보장
+            fut.add_done_callback(lambda f, job=job: self._forward_enriched(job, f))
+
+    def _forward_enriched(self, job: dict, fut: Future):
+        # Future 콜백은 크롤링/보강 풀의 워커 스레드에서 돌기 때문에 막히면 안 됨
+        # → 크기 제한 없는 전달 큐에만 넣고, 번역 대기열(크기 제한)로는 _forward_worker가 옮긴다
+        try:
+            job["full_text"], job["image_urls"] = fut.result()
+        except Exception as e:
+            job["error"] = e
+        self._enriched.put(job)
+
+    def _forward_worker(self):
+        while True:
+            job = self._enriched.get()
+            if job is None:
+                return
+            self._translate_q.put(job)  # 번역 단계가 밀리면 여기서만 대기 (back-pressure)
+
+    def _translate_worker(self):
+        while True:
+            job = self._translate_q.get()
+            if job is None:
+                return
+            if job["error"] is None:
+                try:
+                    translated = translate_tweet_text(job["full_text"])
+                    job["message"] = build_tweet_message(job["full_text"], translated, job["username"], job["tweet"])
+                except Exception as e:
+                    job["error"] = e
+            self._deliver_q.put(job)
+
+    def _deliver_worker(self):
+        buffer = {}
+        next_seq = defaultdict(int)
+        while True:
+            job = self._deliver_q.get()
+            if job is None:
+                return
+            user_id = job["user_id"]
+            buffer[(user_id, job["seq"])] = job
+            # 같은 계정의 앞 순번이 다 도착한 것만 순서대로 전송
+            while (user_id, next_seq[user_id]) in buffer:
+                ready = buffer.pop((user_id, next_seq[user_id]))
+                next_seq[user_id] += 1
+                try:
+                    self._deliver(ready)
+                except Exception as e:
+                    print(f"⚠️ 파이프라인 전송 단계 오류: {e}")
+                finally:
+                    self._slots.release()
+                    with self._idle:
+                        self._pending -= 1
+                        if not self._pending:
+                            self._idle.notify_all()
+
+    def _deliver(self, job):
+        user_id, username, tweet = job["user_id"], job["username"], job["tweet"]
+        if user_id in self._failed_accounts:
+            print(f"⏭️ @{username} 앞선 트윗 실패로 이번 라운드 보류: {tweet.id}")
+            return
+        if job["error"] is not None:
+            self._failed_accounts.add(user_id)
+            explain_tweepy_error(job["error"])
+            print(f"⚠️ @{username} 트윗 {tweet.id} 처리 중 오류: {job['error']}")
+            return
+        if not job["skip"]:
+            try:
+                send_to_telegram_with_optional_image(job["message"], job["image_urls"])
+                print("텔레그램 전송 완료.")
+            except Exception as e:
+                self._failed_accounts.add(user_id)
+                print(f"⚠️ @{username} 전송 중 오류: {e}")
+                return
+        if tweet.id > (get_last_id(user_id) or 0):
+            save_last_id(user_id, tweet.id)
+
+def _start_pipeline() -> Optional[TweetPipeline]:
+    """기본은 파이프라인. 꺼져 있거나 워커를 띄우지 못하면 None → process_account가 순차 처리"""
+    if not PIPELINE_ENABLED:
+        return None
+    try:
+        return TweetPipeline()
+    except Exception as e:
+        print(f"⚠️ 파이프라인 시작 실패 → 순차 처리로 대체: {e}")
+        return None
+
+pipeline = _start_pipeline()
+
+POLL_DEFERRED = "deferred"  # process_account 반환값: 호출 예산이 없어 이번엔 폴링하지 못함
+
+def process_account(user_id: str, username: str, prefetched: Optional[list] = None):
+    """
+    한 계정의 since_id 이후 트윗을 '오래된 것부터' 순서대로 전송하고
+    마지막에 해당 계정의 last_id를 저장한다.
+    반환: 이번에 가져온 트윗들의 작성 시각 목록 (warm-start/오류면 None, 호출 예산 소진이면 POLL_DEFERRED)
+    계정 단위로 독립적이라 여러 계정을 동시에 돌려도 계정 내 순서는 유지된다.
+    - prefetched: 묶음 검색(fetch_new_tweets_by_search)으로 이미 가져온
+      [(tweet, includes), ...] (오래된 것부터). None이면 타임라인 API로 직접 조회.
+    """
+    try:
+        print(f"\n🚀 사용자 @{username} 확인 중...")
+
+        last_id = get_last_id(user_id)
+
+        # 🔰 last_id 파일이 없으면: 최신 ID만 저장하고 이번 라운드는 스킵
+        if last_id is None:
+            bootstrap_warm_start(user_id, username)
+            return None
+
+        max_tweet_id = last_id  # 이번 라운드에서 본 것 중 가장 큰 id 저장용
+        fetched_any = False
+        seen_times = []  # 새 트윗 작성 시각 (폴링 스케줄러 학습용)
+
+        print(user_id)
+
+        # ✅ 페이지네이션으로 since_id 이후 전부 가져오기 (묶음 검색 결과가 있으면 그대로 사용)
+        if prefetched is not None:
+            source = prefetched
+        else:
+            source = iterate_user_tweets(user_id, last_id, page_size=100)
+        for tweet, includes in source:
+            fetched_any = True
+            metrics.inc("items_total", kind="tweet_fetched")
+            if tweet.created_at:
+                seen_times.append(tweet.created_at)
+
+            # 엘론(44196397) + quote 제외 규칙이 있으면 유지
+            if user_id in EXCLUDE_QUOTE_USERS and tweet.referenced_tweets:
+                if any(ref.type == "quoted" for ref in tweet.referenced_tweets):
+                    print(f"🛑 @{username} quote 트윗 제외: {tweet.id}")
+                    if pipeline:
+                        # 앞선 트윗이 전송된 뒤에 last_id가 넘어가도록 순서만 맞춰 통과
+                        pipeline.submit(user_id, username, tweet, includes, skip=True)
+                        continue
+                    # 다음 트윗으로
+                    if max_tweet_id is None or tweet.id > max_tweet_id:
+                        max_tweet_id = tweet.id
+                        save_last_id(user_id, max_tweet_id)
+                    continue
+                
+            print("✅ 새 트윗 발견(id):", tweet.id)
+            print("✅ 새 트윗 작성 시각(created_at):", tweet.created_at)
+            print("✅ 새 트윗 발견(text):", tweet.text)
+
+            if pipeline:
+                # 보강/번역/전송과 last_id 저장은 파이프라인이 순서대로 처리
+                pipeline.submit(user_id, username, tweet, includes)
+                continue
+
+            # 순차 처리는 크롤링 결과(최대 CRAWL_DEADLINE초)를 기다리면 다른 계정까지 멈추므로 API 텍스트 사용
+            # (긴 트윗 크롤링은 크롤링 결과를 기다리지 않고 겹쳐 처리하는 파이프라인 경로에서만)
+            full_text, image_urls = enrich_tweet(tweet, includes, username, crawl=False)
+            message = build_tweet_message(full_text, translate_tweet_text(full_text), username, tweet)
+
+            send_to_telegram_with_optional_image(message, image_urls)
+            print("텔레그램 전송 완료.")
+
+            # 라운드 최대 tweet_id 업데이트 (트윗마다 저장 → 중간에 끊겨도 이어서 진행)
+            if max_tweet_id is None or tweet.id > max_tweet_id:
+                max_tweet_id = tweet.id
+                save_last_id(user_id, max_tweet_id)
+
+        # 이번 사용자 라운드에서 무언가 가져왔으면 last_id 갱신
+        if pipeline:
+            if not fetched_any:
+                print(f"👤 작성자 @{username} 🔍 새 트윗 없음.")
+        elif fetched_any and max_tweet_id:
+            save_last_id(user_id, max_tweet_id)
+            print(f"👤 작성자 @{username} 📌 max_tweet_id 저장됨: {max_tweet_id}")
+        else:
+            print(f"👤 작성자 @{username} 🔍 새 트윗 없음.")
+        return seen_times
+
+    except RateLimitDeferred as e:
+        # 예산 소진: 잠들지 않고 이 계정만 미룸 (이미 보낸 트윗까지는 last_id 저장됨)
+        print(f"⏸️ @{username} 폴링 연기: {e}")
+        metrics.inc("items_total", kind="account_deferred")
+        return POLL_DEFERRED
+    except Exception as e:
+        explain_tweepy_error(e)
+        metrics.inc("failures_total", stage="process_account")
+        # ✅ 여기서 잡아주면 503 등 일시 오류에도 프로세스가 죽지 않음
+        print(f"⚠️ @{username} 처리 중 오류: {e}")
+        time.sleep(10)  # 짧게 쉬고 다음 사용자/다음 라운드 진행
+        return None
+
+class PollScheduler:
+    """
+    계정별 폴링 간격 스케줄러.
+    - rate: 시간당 작성 수 EWMA (폴링 간 경과 시간으로 가중 → 폴링 빈도와 무관하게 같은 평활)
+    - hours: UTC 시간대(0~23)별 작성 분포 (POLL_HOURS_TAU로 서서히 잊음)
+    - 간격 = 지금 시간대의 예상 작성 속도로 POLL_TARGET_POSTS개가 쌓이는 시간, [하한, 상한]으로 제한
+    - 모든 계정의 시간당 폴링 합이 예산을 넘으면 간격을 같은 비율로 늘림
+    - 상태는 x_poll_schedule.json에 저장 → 재시작 후에도 유지
+    """
+    def __init__(self, path: str = POLL_SCHEDULE_PATH, base_interval: float = CHECK_INTERVAL_SECONDS,
+                 min_interval: float = POLL_MIN_INTERVAL, max_interval: float = POLL_MAX_INTERVAL,
+                 budget_per_hour: Optional[float] = POLL_BUDGET_PER_HOUR):
+        self.path = path
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget_per_hour = budget_per_hour
+        self._lock = threading.Lock()
+        self._state = self._load()
+        self._intervals = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ 폴링 스케줄 읽기 오류: {e}")
+            return {}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._state, ensure_ascii=False, indent=2)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ 폴링 스케줄 저장 오류: {e}")
+
+    def _account(self, user_id: str) -> dict:
+        acc = self._state.get(user_id)
+        if acc is None:
+            # 처음 보는 계정: 고정 주기와 같은 간격이 나오는 작성 빈도에서 시작
+            acc = {
+                "rate": POLL_TARGET_POSTS * 3600 / self.base_interval,
+                "hours": [0.0] * 24,
+                "last_poll": 0.0,
+            }
+            self._state[user_id] = acc
+        return acc
+
+    def _raw_interval(self, acc: dict, now: float) -> float:
+        hours = acc["hours"]
+        mean = sum(hours) / 24
+        hour = datetime.fromtimestamp(now, timezone.utc).hour
+        activity = min(4.0, max(0.25, (hours[hour] + 1) / (mean + 1)))
+        expected = max(acc["rate"] * activity, 1e-3)  # 지금 시간대의 시간당 예상 작성 수
+        return min(self.max_interval, max(self.min_interval, 3600 * POLL_TARGET_POSTS / expected))
+
+    def plan(self, user_ids: List[str], now: Optional[float] = None) -> dict:
+        """계정별 폴링 간격(초) 계산. 예산을 넘으면 전체를 같은 비율로 늘린다."""
+        now = now or time.time()
+        with self._lock:
+            raw = {uid: self._raw_interval(self._account(uid), now) for uid in user_ids}
+        budget = self.budget_per_hour or len(user_ids) * 3600 / self.base_interval
+        demand = sum(3600 / iv for iv in raw.values())
+        scale = max(1.0, demand / budget) if budget else 1.0
+        self._intervals = {uid: min(self.max_interval, iv * scale) for uid, iv in raw.items()}
+        return self._intervals
+
+    def due(self, user_ids: List[str], now: Optional[float] = None) -> List[str]:
+        """폴링할 때가 된 계정 (가장 오래 밀린 계정부터)"""
+        now = now or time.time()
+        intervals = self.plan(user_ids, now)
+        with self._lock:
+            due_at = {uid: self._account(uid)["last_poll"] + intervals[uid] for uid in user_ids}
+        return sorted((uid for uid in user_ids if due_at[uid] <= now), key=lambda uid: due_at[uid])
+
+    def seconds_until_next(self, user_ids: List[str], now: Optional[float] = None) -> float:
+        now = now or time.time()
+        intervals = self._intervals or self.plan(user_ids, now)
+        with self._lock:
+            waits = [self._account(uid)["last_poll"] + intervals.get(uid, self.base_interval) - now
+                     for uid in user_ids]
+        return max(0.0, min(waits, default=self.base_interval))
+
+    def record(self, user_id: str, created_times: Optional[list], now: Optional[float] = None):
+        """폴링 결과 반영. created_times가 None이면(오류 등) 시각만 갱신하고 학습은 건너뜀"""
+        now = now or time.time()
+        with self._lock:
+            acc = self._account(user_id)
+            last = acc["last_poll"]
+            acc["last_poll"] = now
+            if created_times is None or not last:
+                return
+            elapsed = max(now - last, 1.0)
+            sample = len(created_times) * 3600 / elapsed
+            alpha = 1 - math.exp(-elapsed / POLL_RATE_TAU)
+            acc["rate"] += alpha * (sample - acc["rate"])
+            decay = math.exp(-elapsed / POLL_HOURS_TAU)
+            acc["hours"] = [h * decay for h in acc["hours"]]
+            for ts in created_times:
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=timezone.utc)
+                acc["hours"][ts.astimezone(timezone.utc).hour] += 1
+
+    def summary(self, names: dict) -> str:
+        with self._lock:
+            rows = sorted(
+                ((self._intervals.get(uid, self.base_interval), names.get(uid, uid), acc["rate"])
+                 for uid, acc in self._state.items() if uid in names),
+            )
+        return ", ".join(f"@{n} {iv / 60:.0f}분({r:.1f}건/h)" for iv, n, r in rows)
+
+poll_scheduler = PollScheduler()
+
+def poll_all_accounts(max_workers: int = ACCOUNT_WORKERS, accounts: Optional[List[tuple]] = None):
+    """
+    모든 계정(또는 accounts로 준 계정들)을 한 라운드 폴링.
+    - max_workers <= 1: 기존처럼 계정 하나씩 순차 처리
+    - max_workers > 1: 계정별로 스레드 풀에서 동시 처리 (동시 실행 수 상한 = max_workers)
+    반환: {user_id: 작성 시각 목록 또는 None}
+    """
+    if accounts is None:
+        accounts = list(zip(TWITTER_USER_IDS, TWITTER_USERNAMES))
+    if pipeline:
+        pipeline.start_round()
+
+    # 묶음 검색 모드: 여러 계정의 새 글을 검색 요청 몇 번으로 가져와 계정별로 나눔
+    prefetched = {}
+    if FETCH_MODE == "search":
+        prefetched = fetch_new_tweets_by_search(accounts)
+
+    results = {}
+    if max_workers <= 1 or len(accounts) <= 1:
+        for user_id, username in accounts:
+            results[user_id] = process_account(user_id, username, prefetched.get(user_id))
+    else:
+        results = _poll_accounts_concurrently(accounts, prefetched, max_workers)
+
+    if pipeline:
+        # 이번 라운드에 투입한 트윗이 모두 전송될 때까지 대기
+        pipeline.join()
+    return results
+
+def _poll_accounts_concurrently(accounts: List[tuple], prefetched: dict, max_workers: int) -> dict:
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="x-account") as pool:
+        futures = {
+            pool.submit(process_account, user_id, username, prefetched.get(user_id)): (user_id, username)
+            for user_id, username in accounts
+        }
+        for fut in as_completed(futures):
+            user_id, username = futures[fut]
+            try:
+                results[user_id] = fut.result()
+            except Exception as e:
+                results[user_id] = None
+                print(f"⚠️ @{username} 워커 오류: {e}")
+    return results
+
+def _poll_endpoint() -> str:
+    if FETCH_MODE == "search":
+        return "GET /2/tweets/search/recent"
+    return "GET /2/users/:id/tweets"
+
+def poll_due_accounts(max_workers: int = ACCOUNT_WORKERS) -> float:
+    """
+    폴링할 때가 된 계정만 폴링하고 결과를 스케줄러에 반영.
+    호출 예산이 모자라면 가장 오래 밀린 계정부터 예산만큼만 폴링하고 나머지는 리셋 이후로 미룬다.
+    반환: 다음 계정 폴링까지 남은 시간(초)
+    """
+    accounts = list(zip(TWITTER_USER_IDS, TWITTER_USERNAMES))
+    user_ids = [uid for uid, _ in accounts]
+    if ADAPTIVE_POLLING:
+        due = poll_scheduler.due(user_ids)
+    else:
+        due = user_ids
+
+    endpoint = _poll_endpoint()
+    available = rate_limits.available(endpoint)
+    deferred = []
+    if available is not None:
+        # 검색 모드는 묶음 요청 몇 번으로 끝나므로 1개라도 남아 있으면 진행
+        limit = (len(due) if available > 0 else 0) if FETCH_MODE == "search" else available
+        due, deferred = due[:limit], due[limit:]
+    if deferred:
+        print(f"⏸️ 호출 예산 부족({endpoint} 잔여 {available}) → {len(deferred)}개 계정 "
+              f"{rate_limits.seconds_until_reset(endpoint):.0f}초 뒤로 연기")
+
+    names = dict(accounts)
+    results = poll_all_accounts(max_workers, [(uid, names[uid]) for uid in due]) if due else {}
+    deferred += [uid for uid, r in results.items() if r == POLL_DEFERRED]
+
+    if not ADAPTIVE_POLLING:
+        return CHECK_INTERVAL_SECONDS
+
+    now = time.time()
+    for uid, r in results.items():
+        if r != POLL_DEFERRED:  # 미룬 계정은 기록하지 않음 → 다음 확인 때 다시 '밀린 계정'
+            poll_scheduler.record(uid, r, now)
+    if results:
+        poll_scheduler.save()
+        print(f"⏱️ 폴링 간격: {poll_scheduler.summary(names)}")
+    wait = poll_scheduler.seconds_until_next(user_ids)
+    if deferred:
+        wait = max(wait, min(rate_limits.seconds_until_reset(endpoint), CHECK_INTERVAL_SECONDS))
+    return wait
+
+def get_rate_limit_budget() -> dict:
+    """엔드포인트별 X API 호출 예산 {endpoint: {limit, remaining, reset_in}} (모니터링용)"""
+    return rate_limits.snapshot()
+
+def print_rate_limit_budget():
+    budget = get_rate_limit_budget()
+    if not budget:
+        return
+    parts = [f"{ep} {b['remaining']}/{b['limit']} (리셋 {b['reset_in']}초)" for ep, b in sorted(budget.items())]
+    print(f"📉 X API 예산: {', '.join(parts)} | 연기 {rate_limits.deferred}회")
+
 def run():
     print("트윗 모니터링 시작...")
     print(f"📏 텍스트 길이 임계값: {TEXT_LENGTH_THRESHOLD}자")
+    print(f"🧵 계정 동시 처리 수: {ACCOUNT_WORKERS}")
+
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("x_bot")  # metrics/x_bot.prom (+ METRICS_PORT 설정 시 /metrics)
+
+    # 크롤러 풀은 백그라운드에서 미리 띄워 둠
+    threading.Thread(target=crawler_pool.warm, name="crawler-warm", daemon=True).start()
+
+    # 트루스소셜 RSS는 자체 주기로 별도 스레드에서 폴링
+    trump_stop = threading.Event()
+    threading.Thread(target=trump_poll_loop, args=(trump_stop,), name="trump-rss", daemon=True).start()
     
     # 메모리 모니터링 변수
     last_memory_check = time.time()
@@ -1028,98 +2846,31 @@ def run():
     
     try:
         while True:
-            # --- [TRUMP RSS] 먼저 한 번 폴링 ---
-            trump_poll_once()
-            
-            for idx, (user_id, username) in enumerate(zip(TWITTER_USER_IDS, TWITTER_USERNAMES)):
-                try:
-                    print(f"\n🚀 사용자 @{username} 확인 중...")
-
-                    last_id = get_last_id(user_id)
-
-                    # 🔰 last_id 파일이 없으면: 최신 ID만 저장하고 이번 라운드는 스킵
-                    if last_id is None:
-                        bootstrap_warm_start(user_id, username)
-                        continue
-
-                    max_tweet_id = last_id  # 이번 라운드에서 본 것 중 가장 큰 id 저장용
-                    fetched_any = False
-
-                    print(user_id)
-
-                    # ✅ 페이지네이션으로 since_id 이후 전부 가져오기
-                    for tweet, includes in iterate_user_tweets(user_id, last_id, page_size=100):
-                        fetched_any = True
-
-                        # 엘론(44196397) + quote 제외 규칙이 있으면 유지
-                        if user_id in EXCLUDE_QUOTE_USERS and tweet.referenced_tweets:
-                            if any(ref.type == "quoted" for ref in tweet.referenced_tweets):
-                                print(f"🛑 @{username} quote 트윗 제외: {tweet.id}")
-                                # 다음 트윗으로
-                                if max_tweet_id is None or tweet.id > max_tweet_id:
-                                    max_tweet_id = tweet.id
-                                continue
-                            
-                        print("✅ 새 트윗 발견(id):", tweet.id)
-                        print("✅ 새 트윗 작성 시각(created_at):", tweet.created_at)
-                        print("✅ 새 트윗 발견(text):", tweet.text)
-
-                        # 리트윗이면 원본 텍스트/이미지 추출, 아니면 그대로 처리
-                        if tweet.referenced_tweets:
-                            full_text, image_urls = fetch_original_retweet(tweet, client, username)
-                        else:
-                            full_text = get_full_tweet_text(tweet, username)
-                            image_urls = extract_image_urls(tweet, includes)
-
-                        created_at = tweet.created_at.strftime("%m/%d %H:%M")
-
-                        # 번역 (None 가드)
-                        translated_text = translate_preserving_emojis_and_urls(full_text)
-                        if translated_text is None:
-                            translated_text = "[번역 실패: 모든 엔진에서 오류 발생]"
-
-                        message = (
-                            f"🐦 원문:\n{full_text}\n\n"
-                            f"🌐 번역:\n{translated_text}\n\n🔗"
-                            f"👤 작성자 : {username}\n"
-                            f"🕒 작성 시각: {created_at}\n"
-                        )
-
-                        send_to_telegram_with_optional_image(message, image_urls)
-                        print("텔레그램 전송 완료.")
-
-                        # 라운드 최대 tweet_id 업데이트
-                        if max_tweet_id is None or tweet.id > max_tweet_id:
-                            max_tweet_id = tweet.id
-
-                    # 이번 사용자 라운드에서 무언가 가져왔으면 last_id 갱신
-                    if fetched_any and max_tweet_id:
-                        save_last_id(user_id, max_tweet_id)
-                        print(f"👤 작성자 @{username} 📌 max_tweet_id 저장됨: {max_tweet_id}")
-                    else:
-                        print(f"👤 작성자 @{username} 🔍 새 트윗 없음.")
-
-                    # 메모리 모니터링 및 정리
-                    current_time = time.time()
-                    if current_time - last_memory_check > MEMORY_CHECK_INTERVAL:
-                        monitor_memory_usage()
-                        last_memory_check = current_time
-
-                except Exception as e:
-                    explain_tweepy_error(e)
-                    # ✅ 여기서 잡아주면 503 등 일시 오류에도 프로세스가 죽지 않음
-                    print(f"⚠️ @{username} 처리 중 오류: {e}")
-                    time.sleep(10)  # 짧게 쉬고 다음 사용자/다음 라운드 진행
-                    continue
+            with metrics.timer("cycle"):
+                wait_seconds = poll_due_accounts(ACCOUNT_WORKERS)
+            # 라운드마다 last_id 변경분을 한 번에 저장
+            last_id_store.flush()
+            print_translation_stats()
+            print_translation_cache_stats()
+            print_full_text_stats()
+            print_rate_limit_budget()
+
+            # 메모리 모니터링 및 정리
+            current_time = time.time()
+            if current_time - last_memory_check > MEMORY_CHECK_INTERVAL:
+                monitor_memory_usage()
+                last_memory_check = current_time
                     
             print("마지막 실행 시간 : ", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            time.sleep(CHECK_INTERVAL_SECONDS)
+            # 다음으로 폴링할 계정 차례까지 대기 (너무 촘촘히 돌지 않도록 하한 적용)
+            time.sleep(max(wait_seconds, POLL_MIN_INTERVAL / 4))
 
     except KeyboardInterrupt:
         print("\n🛑 프로그램 종료 요청됨")
     except Exception as e:
         print(f"❌ 예상치 못한 오류: {e}")
     finally:
+        trump_stop.set()
         cleanup_resources()
         print("🧹 프로그램 정리 완료")
 
@@ -1143,11 +2894,36 @@ def monitor_memory_usage():
 
 def cleanup_resources():
     """리소스 정리"""
-    global crawler
     try:
-        if crawler:
-            crawler.close()
-            print("🧹 크롤러 정리 완료")
+        if pipeline:
+            pipeline.close()
+            print("🧹 파이프라인 정리 완료")
+    except Exception as e:
+        print(f"⚠️ 파이프라인 정리 중 오류: {e}")
+
+    try:
+        last_id_store.close()
+        print("🧹 last_id 저장 완료")
+    except Exception as e:
+        print(f"⚠️ last_id 저장 중 오류: {e}")
+
+    try:
+        get_outbox().close()
+        print("🧹 텔레그램 대기열 정리 완료")
+    except Exception as e:
+        print(f"⚠️ 텔레그램 대기열 정리 중 오류: {e}")
+
+    close_sessions()
+    metrics.stop_exporter()
+
+    try:
+        crawl_queue.close()
+    except Exception as e:
+        print(f"⚠️ 크롤링 대기열 정리 중 오류: {e}")
+
+    try:
+        crawler_pool.close_all()
+        print("🧹 크롤러 정리 완료")
     except Exception as e:
         print(f"⚠️ 크롤러 정리 중 오류: {e}")
     
@@ -1163,7 +2939,7 @@ def debug_single_tweet(tweet_id: str, username: str):
     try:
         resp = client.get_tweet(
             id=tweet_id,
-            tweet_fields=["created_at","text","attachments","referenced_tweets"],
+            tweet_fields=["created_at","text","attachments","referenced_tweets","note_tweet"],
             expansions=["attachments.media_keys","referenced_tweets.id"],
             media_fields=["url","type"]
         )
@@ -1202,8 +2978,50 @@ def debug_single_tweet(tweet_id: str, username: str):
     except Exception as e:
         print("❌ debug_single_tweet 오류:", e)
 
+def benchmark_mymemory_split(sizes=(2_000, 20_000, 200_000), repeat: int = 5, part_latency: float = 0.3):
+    """
+    MyMemory 분할 번역 마이크로 벤치마크 (네트워크 없이 실행)
+    1) 문장 분할: 예전 문자 단위 += 방식 vs 정규식/인덱스 방식
+    2) 2,000자 글 번역: 조각 순차 요청 vs 동시 요청 (조각당 part_latency초 응답 가정)
+    """
+    def legacy_split(text):
+        sentences, current = [], ""
+        for char in text:
+            current += char
+            if char in ".!?":
+                if current.strip():
+                    sentences.append(current.strip())
+                current = ""
+        if current.strip():
+            sentences.append(current.strip())
+        return sentences
+
+    sample = ("Trump said the U.S. will impose a 25% tariff, raising $1.5B. "
+              "Markets fell sharply! Is this the end? 한국 증시도 하락했다. ")
+    for size in sizes:
+        text = (sample * (size // len(sample) + 1))[:size]
+        for name, fn in (("legacy", legacy_split), ("regex", split_text_into_sentences)):
+            best = min(_time_call(fn, text) for _ in range(repeat))
+            print(f"⏱️ split {name:6s} {size:>7,}자: {best * 1000:8.2f}ms")
+
+    text = (sample * 40)[:2000]
+    chunks = chunk_text_by_sentences(text, MYMEMORY_CHUNK_LIMIT)
+    fake_part = lambda part: (time.sleep(part_latency), part)[1]
+    sequential = _time_call(lambda: [fake_part(c) for c in chunks])
+    with ThreadPoolExecutor(max_workers=MYMEMORY_PARALLEL) as pool:
+        parallel = _time_call(lambda: list(pool.map(fake_part, chunks)))
+    print(f"⏱️ MyMemory {len(chunks)}조각: 순차 {sequential:.2f}s → 동시({MYMEMORY_PARALLEL}) {parallel:.2f}s")
+
+def _time_call(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
 
 if __name__ == "__main__":
+    # 텔레그램 대기열/번역 캐시/metrics는 logging으로 기록 → 전송·재시도·포기 로그가 보이도록 설정
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s | %(message)s")
     # run() 대신 단일 테스트 실행
     # debug_single_tweet("1960800720061370580", "wallstengine")
+    # benchmark_mymemory_split()
     run()
\ No newline at end of file
@@ -6,7 +6,6 @@ import logging
 from typing import List
 from dotenv import load_dotenv
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
 # Selenium + undetected_chromedriver
@@ -19,6 +18,10 @@ from selenium.common.exceptions import TimeoutException
 # OpenAI
 from openai import OpenAI
 
+from telegram_outbox import get_outbox, enqueue_message
+from http_session import get_session
+import metrics
+
 
 # ─────────────────────────────────────────────
 # 환경 변수
@@ -28,6 +31,7 @@ OPENAI_API_KEY      = os.getenv("OPENAI_API_KEY")
 TELEGRAM_BOT_TOKEN  = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID")
 client = OpenAI(api_key=OPENAI_API_KEY)
+session = get_session()  # 공용 keep-alive HTTP 세션
 
 BASE_URL     = "https://home.barclays"
 LISTING_URL  = "https://home.barclays/insights/uk-unlocked/"
@@ -167,20 +171,24 @@ def extract_text(el: Tag | None) -> str:
 # requests 먼저 → 봇 감지 시 Selenium 폴백
 # ─────────────────────────────────────────────
 def get_soup_requests(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=20)
+    resp = session.get(url, headers=HEADERS, timeout=20)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    with metrics.timer("parse"):
+        return BeautifulSoup(resp.text, "html.parser")
 
 def get_soup_selenium(url: str, wait_selector: str = None) -> BeautifulSoup:
-    driver.get(url)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1.5)
-    if wait_selector:
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
-        except TimeoutException:
-            logging.warning(f"[Barclays] 로딩 대기 실패: {wait_selector}")
-    return BeautifulSoup(driver.page_source, "html.parser")
+    with metrics.timer("browser_render"):
+        driver.get(url)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(1.5)
+        if wait_selector:
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+            except TimeoutException:
+                logging.warning(f"[Barclays] 로딩 대기 실패: {wait_selector}")
+        html = driver.page_source
+    with metrics.timer("parse"):
+        return BeautifulSoup(html, "html.parser")
 
 def get_soup(url: str, wait_selector: str = None) -> BeautifulSoup:
     """requests 먼저 시도 → 실패 시 Selenium 폴백"""
@@ -360,32 +368,34 @@ def extract_article(url: str) -> tuple[str, str, str, str]:
 def translate_title(text: str) -> str:
     if not text:
         return ""
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.1,
-        messages=[
-            {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
-            {"role": "user", "content": f"다음 영어 제목을 한국어로 자연스럽게 번역해줘. 한 줄로.\n\n{text}"},
-        ]
-    )
+    with metrics.timer("llm", call="translate_title"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.1,
+            messages=[
+                {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
+                {"role": "user", "content": f"다음 영어 제목을 한국어로 자연스럽게 번역해줘. 한 줄로.\n\n{text}"},
+            ]
+        )
     return resp.choices[0].message.content.strip()
 
 def summarize_ko(text: str, max_chars: int = 800) -> str:
     if not text:
         return "[본문 없음]"
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        messages=[
-            {"role": "system", "content": "너는 금융·경제 기사 한국어 요약 전문가야."},
-            {"role": "user", "content": (
-                f"다음 영어 텍스트를 한국어로 요약 번역해줘.\n"
-                f"- 핵심 내용, 숫자, 인물, 날짜 유지\n"
-                f"- {max_chars}자 이내\n"
-                f"- 자연스러운 문어체\n\n{text}"
-            )},
-        ]
-    )
+    with metrics.timer("llm", call="summarize_ko"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": "너는 금융·경제 기사 한국어 요약 전문가야."},
+                {"role": "user", "content": (
+                    f"다음 영어 텍스트를 한국어로 요약 번역해줘.\n"
+                    f"- 핵심 내용, 숫자, 인물, 날짜 유지\n"
+                    f"- {max_chars}자 이내\n"
+                    f"- 자연스러운 문어체\n\n{text}"
+                )},
+            ]
+        )
     out = resp.choices[0].message.content.strip()
     return out[:max_chars] if len(out) > max_chars else out
 
@@ -397,17 +407,12 @@ def send_telegram(msg: str):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHANNEL_ID:
         logging.warning("TELEGRAM_BOT_TOKEN 또는 TELEGRAM_CHANNEL_ID 미설정")
         return
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     try:
-        resp = requests.post(
-            url,
-            data={"chat_id": TELEGRAM_CHANNEL_ID, "text": msg},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        logging.info("✅ 텔레그램 전송 완료")
+        # outbox(디스크 대기열)에 넣고 바로 반환 → 전송/재시도는 outbox 워커가 담당
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, msg, source="bu")
+        logging.info("📮 텔레그램 전송 대기열 등록")
     except Exception as e:
-        logging.error(f"❌ 텔레그램 전송 실패: {e}")
+        logging.error(f"❌ 텔레그램 대기열 등록 실패: {e}")
         logging.error("실패 메시지 일부: %s", msg[:200])
 
 
@@ -478,8 +483,10 @@ def run_once():
             logging.info(f"[Barclays] 메시지 길이: {len(msg)}자")
             send_telegram(msg)
             add_seen([url])
+            metrics.inc("items_total", kind="article_sent")
             time.sleep(3)
         except Exception as e:
+            metrics.inc("failures_total", stage="article")
             logging.error(f"[Barclays] 기사 처리 오류: {e}")
 
 
@@ -488,11 +495,14 @@ def run_once():
 # ─────────────────────────────────────────────
 if __name__ == "__main__":
     logging.info("Barclays UK Unlocked 크롤러 시작")
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("bu")  # metrics/bu.prom (+ METRICS_PORT 설정 시 /metrics)
 
     try:
         while True:
             try:
-                run_once()
+                with metrics.timer("cycle"):
+                    run_once()
             except Exception as e:
                 logging.error(f"주기 실행 오류: {e}")
 
@@ -500,6 +510,9 @@ if __name__ == "__main__":
             time.sleep(3600)
 
     finally:
+        # 대기열에 남은 메시지는 잠시 보내 보고, 못 보낸 건 다음 실행 때 이어서 전송
+        get_outbox().close()
+        metrics.stop_exporter()
         try:
             driver.quit()
         except Exception:
@@ -5,7 +5,6 @@ import logging
 from typing import List
 from dotenv import load_dotenv
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
 # Selenium + undetected_chromedriver
@@ -19,6 +18,9 @@ from selenium.common.exceptions import TimeoutException
 # OpenAI
 from openai import OpenAI
 
+from telegram_outbox import get_outbox, enqueue_message
+import metrics
+
 
 # ─────────────────────────────────────────────
 # 환경 변수
@@ -124,20 +126,22 @@ def normalize_ctee_url(url: str) -> str:
 # ─────────────────────────────────────────────
 def get_soup(url: str, wait_selector: str = None) -> BeautifulSoup:
     # 상세 페이지에서 브라우저가 차단 페이지로 튕기는지 확인할 때도 이 함수 한 군데만 보면 됨
-    driver.get(url)
+    with metrics.timer("browser_render"):
+        driver.get(url)
 
-    # lazy load 대비 스크롤
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1.2)
+        # lazy load 대비 스크롤
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(1.2)
 
-    if wait_selector:
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
-        except TimeoutException:
-            logging.warning(f"[CTEE] 로딩 대기 실패: {wait_selector}")
+        if wait_selector:
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+            except TimeoutException:
+                logging.warning(f"[CTEE] 로딩 대기 실패: {wait_selector}")
 
-    html = driver.page_source
-    return BeautifulSoup(html, "html.parser")
+        html = driver.page_source
+    with metrics.timer("parse"):
+        return BeautifulSoup(html, "html.parser")
 
 
 def extract_text(el: Tag | None) -> str:
@@ -234,14 +238,15 @@ def translate_title_ko(title_zh: str) -> str:
 {title_zh}
 """
 
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.1,
-        messages=[
-            {"role": "system", "content": "너는 경제·기술 기사 제목 번역 전문가야."},
-            {"role": "user", "content": prompt},
-        ]
-    )
+    with metrics.timer("llm", call="translate_title_ko"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.1,
+            messages=[
+                {"role": "system", "content": "너는 경제·기술 기사 제목 번역 전문가야."},
+                {"role": "user", "content": prompt},
+            ]
+        )
     return resp.choices[0].message.content.strip()
 
 
@@ -263,14 +268,15 @@ def summarize_ko(body_zh: str, max_chars=3000) -> str:
         {body_zh}
     """
 
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        messages=[
-            {"role": "system", "content": "너는 대만 경제 기사 한국어 요약 전문가야."},
-            {"role": "user", "content": prompt},
-        ]
-    )
+    with metrics.timer("llm", call="summarize_ko"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": "너는 대만 경제 기사 한국어 요약 전문가야."},
+                {"role": "user", "content": prompt},
+            ]
+        )
     out = resp.choices[0].message.content.strip()
     if len(out) > max_chars:
         out = out[:max_chars]
@@ -285,16 +291,12 @@ def send_telegram(msg: str):
         logging.warning("TELEGRAM_BOT_TOKEN 또는 TELEGRAM_CHANNEL_ID 미설정")
         return
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     try:
-        resp = requests.post(
-            url,
-            data={"chat_id": TELEGRAM_CHANNEL_ID, "text": msg}
-        )
-        resp.raise_for_status()
-        logging.info("텔레그램 전송 완료")
+        # outbox(디스크 대기열)에 넣고 바로 반환 → 전송/재시도는 outbox 워커가 담당
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, msg, source="ctee")
+        logging.info("텔레그램 전송 대기열 등록")
     except Exception as e:
-        logging.error(f"텔레그램 전송 실패: {e}")
+        logging.error(f"텔레그램 대기열 등록 실패: {e}")
         logging.error("실패 메시지 일부: %s", msg[:200])
 
 
@@ -354,8 +356,10 @@ def run_once():
             # print(msg)
             send_telegram(msg)
             add_seen([url])
+            metrics.inc("items_total", kind="article_sent")
             time.sleep(3)
         except Exception as e:
+            metrics.inc("failures_total", stage="article")
             logging.error(f"기사 처리 중 오류: {e}")
 
 
@@ -364,17 +368,23 @@ def run_once():
 # ─────────────────────────────────────────────
 if __name__ == "__main__":
     logging.info("CTEE Tech 크롤러 시작")
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("ctee")  # metrics/ctee.prom (+ METRICS_PORT 설정 시 /metrics)
 
     try:
         while True:
             try:
-                run_once()
+                with metrics.timer("cycle"):
+                    run_once()
             except Exception as e:
                 logging.error(f"주기 실행 오류: {e}")
 
             logging.info("다음 실행까지 30분 대기…")
             time.sleep(1800)
     finally:
+        # 대기열에 남은 메시지는 잠시 보내 보고, 못 보낸 건 다음 실행 때 이어서 전송
+        get_outbox().close()
+        metrics.stop_exporter()
         # 종료 시 드라이버 정리
         try:
             driver.quit()
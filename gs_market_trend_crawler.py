@@ -5,7 +5,6 @@ import logging
 from typing import List
 from dotenv import load_dotenv
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
 # Selenium + undetected_chromedriver
@@ -18,6 +17,10 @@ from selenium.common.exceptions import TimeoutException
 # OpenAI
 from openai import OpenAI
 
+from telegram_outbox import get_outbox, enqueue_message
+from http_session import get_session
+import metrics
+
 
 # ─────────────────────────────────────────────
 # 환경 변수
@@ -27,6 +30,7 @@ OPENAI_API_KEY      = os.getenv("OPENAI_API_KEY")
 TELEGRAM_BOT_TOKEN  = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID")
 client = OpenAI(api_key=OPENAI_API_KEY)
+session = get_session()  # 공용 keep-alive HTTP 세션
 
 BASE_URL      = "https://www.goldmansachs.com"
 INSIGHTS_URL  = "https://www.goldmansachs.com/insights"
@@ -170,20 +174,24 @@ def extract_text(el: Tag | None) -> str:
 # 상세 페이지 → requests 먼저 시도, 막히면 Selenium 폴백
 # ─────────────────────────────────────────────
 def get_soup_requests(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=20)
+    resp = session.get(url, headers=HEADERS, timeout=20)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    with metrics.timer("parse"):
+        return BeautifulSoup(resp.text, "html.parser")
 
 def get_soup_selenium(url: str, wait_selector: str = None) -> BeautifulSoup:
-    driver.get(url)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1.5)
-    if wait_selector:
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
-        except TimeoutException:
-            logging.warning(f"[GS] 로딩 대기 실패: {wait_selector}")
-    return BeautifulSoup(driver.page_source, "html.parser")
+    with metrics.timer("browser_render"):
+        driver.get(url)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(1.5)
+        if wait_selector:
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+            except TimeoutException:
+                logging.warning(f"[GS] 로딩 대기 실패: {wait_selector}")
+        html = driver.page_source
+    with metrics.timer("parse"):
+        return BeautifulSoup(html, "html.parser")
 
 def get_soup(url: str, wait_selector: str = None) -> BeautifulSoup:
     """requests 먼저 시도 → 403/차단 시 Selenium 폴백"""
@@ -413,46 +421,49 @@ def extract_podcast(url: str) -> tuple[str, str, str]:
 def translate_title(text: str) -> str:
     if not text:
         return ""
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.1,
-        messages=[
-            {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
-            {"role": "user", "content": f"다음 영어 제목을 한국어로 자연스럽게 번역해줘. 한 줄로.\n\n{text}"},
-        ]
-    )
+    with metrics.timer("llm", call="translate_title"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.1,
+            messages=[
+                {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
+                {"role": "user", "content": f"다음 영어 제목을 한국어로 자연스럽게 번역해줘. 한 줄로.\n\n{text}"},
+            ]
+        )
     return resp.choices[0].message.content.strip()
 
 def translate_takeaways(takeaways: list[str]) -> str:
     if not takeaways:
         return ""
     src = "\n".join(f"- {t}" for t in takeaways)
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.1,
-        messages=[
-            {"role": "system", "content": "너는 bullet 구조를 그대로 유지하는 번역가야."},
-            {"role": "user", "content": f"다음 bullet 목록을 한국어로 번역해줘. 개수·순서 유지, '- '형식 유지.\n\n{src}"},
-        ]
-    )
+    with metrics.timer("llm", call="translate_takeaways"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.1,
+            messages=[
+                {"role": "system", "content": "너는 bullet 구조를 그대로 유지하는 번역가야."},
+                {"role": "user", "content": f"다음 bullet 목록을 한국어로 번역해줘. 개수·순서 유지, '- '형식 유지.\n\n{src}"},
+            ]
+        )
     return resp.choices[0].message.content.strip()
 
 def summarize_ko(text: str, max_chars: int = 2000) -> str:
     if not text:
         return "[본문 없음]"
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        messages=[
-            {"role": "system", "content": "너는 금융·경제 기사 한국어 요약 전문가야."},
-            {"role": "user", "content": (
-                f"다음 영어 텍스트를 한국어로 요약 번역해줘.\n"
-                f"- 핵심 내용, 숫자, 인물, 날짜 유지\n"
-                f"- {max_chars}자 이내\n"
-                f"- 자연스러운 문어체\n\n{text}"
-            )},
-        ]
-    )
+    with metrics.timer("llm", call="summarize_ko"):
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": "너는 금융·경제 기사 한국어 요약 전문가야."},
+                {"role": "user", "content": (
+                    f"다음 영어 텍스트를 한국어로 요약 번역해줘.\n"
+                    f"- 핵심 내용, 숫자, 인물, 날짜 유지\n"
+                    f"- {max_chars}자 이내\n"
+                    f"- 자연스러운 문어체\n\n{text}"
+                )},
+            ]
+        )
     out = resp.choices[0].message.content.strip()
     return out[:max_chars] if len(out) > max_chars else out
 
@@ -464,17 +475,12 @@ def send_telegram(msg: str):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHANNEL_ID:
         logging.warning("TELEGRAM_BOT_TOKEN 또는 TELEGRAM_CHANNEL_ID 미설정")
         return
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     try:
-        resp = requests.post(
-            url,
-            data={"chat_id": TELEGRAM_CHANNEL_ID, "text": msg},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        logging.info("✅ 텔레그램 전송 완료")
+        # outbox(디스크 대기열)에 넣고 바로 반환 → 전송/재시도는 outbox 워커가 담당
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, msg, source="gs")
+        logging.info("📮 텔레그램 전송 대기열 등록")
     except Exception as e:
-        logging.error(f"❌ 텔레그램 전송 실패: {e}")
+        logging.error(f"❌ 텔레그램 대기열 등록 실패: {e}")
         logging.error("실패 메시지 일부: %s", msg[:200])
 
 
@@ -586,9 +592,11 @@ def run_once():
             logging.info(f"[GS] 메시지 길이: {len(msg)}자")
             send_telegram(msg)
             add_seen([url])
+            metrics.inc("items_total", kind="article_sent")
             time.sleep(3)
 
         except Exception as e:
+            metrics.inc("failures_total", stage="article")
             logging.error(f"[GS] 기사 처리 오류: {e}")
 
 
@@ -597,11 +605,14 @@ def run_once():
 # ─────────────────────────────────────────────
 if __name__ == "__main__":
     logging.info("Goldman Sachs Insights 크롤러 시작")
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("gs")  # metrics/gs.prom (+ METRICS_PORT 설정 시 /metrics)
 
     try:
         while True:
             try:
-                run_once()
+                with metrics.timer("cycle"):
+                    run_once()
             except Exception as e:
                 logging.error(f"주기 실행 오류: {e}")
 
@@ -609,6 +620,9 @@ if __name__ == "__main__":
             time.sleep(3600)
 
     finally:
+        # 대기열에 남은 메시지는 잠시 보내 보고, 못 보낸 건 다음 실행 때 이어서 전송
+        get_outbox().close()
+        metrics.stop_exporter()
         try:
             driver.quit()
         except Exception:
@@ -0,0 +1,179 @@
+# http_session.py
+# 모든 모듈이 함께 쓰는 HTTP 세션 (keep-alive 커넥션 풀)
+# - 호스트별 커넥션 풀 → 같은 호스트로 가는 요청은 TCP/TLS 핸드셰이크를 재사용
+# - 멱등 요청(GET/HEAD)만 전송 계층에서 재시도 (POST는 연결 실패 시에만)
+# - gzip/deflate(+brotli 모듈이 있으면 br) 압축 응답 요청
+# - timeout을 안 넘기면 기본 타임아웃 적용 (무한 대기 방지)
+# - 요청마다 호스트별 fetch 지연/응답 코드 계열을 metrics에 기록
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+DEFAULT_TIMEOUT = (5, 20)         # (연결, 읽기) 타임아웃(초)
+POOL_HOSTS = 20                   # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 10                 # 호스트당 유지할 최대 커넥션 수 (동시 요청 스레드 수 이상)
+GET_RETRIES = 3                   # GET/HEAD 전송 계층 재시도 횟수
+RETRY_BACKOFF = 0.5               # 재시도 간격 = RETRY_BACKOFF * 2^(n-1)
+RETRY_STATUSES = (500, 502, 503, 504)  # 429는 호출 측(쿼터/circuit breaker)이 직접 처리하도록 제외
+
+def _accept_encoding() -> str:
+    # urllib3는 brotli(또는 brotlicffi)가 설치돼 있을 때만 br 응답을 풀 수 있음
+    for mod in ("brotli", "brotlicffi"):
+        try:
+            __import__(mod)
+            return "gzip, deflate, br"
+        except ImportError:
+            continue
+    return "gzip, deflate"
+
+class PooledSession(requests.Session):
+    """timeout을 지정하지 않은 요청에 기본 타임아웃을 넣어 주는 Session (호스트별 fetch 지연도 기록)"""
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        host = urlsplit(url).hostname or "-"
+        with metrics.timer("fetch", host=host, method=method.upper()):
+            resp = super().request(method, url, **kwargs)
+        metrics.inc("http_responses_total", host=host, code=f"{resp.status_code // 100}xx")
+        return resp
+
+def create_session(headers: Optional[dict] = None, timeout=DEFAULT_TIMEOUT,
+                   pool_maxsize: int = POOL_MAXSIZE, retries: int = GET_RETRIES) -> requests.Session:
+    """새 풀링 세션 생성 (보통은 get_session()으로 공용 세션을 쓴다)"""
+    session = PooledSession(timeout)
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,   # 마지막 응답을 그대로 돌려줌 → 호출 측 raise_for_status()가 처리
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = _accept_encoding()
+    if headers:
+        session.headers.update(headers)
+    return session
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(name: str = "default") -> requests.Session:
+    """프로세스 공용 세션 (이름별로 하나, 지연 생성). 여러 스레드에서 같이 써도 된다."""
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = create_session()
+            _sessions[name] = session
+        return session
+
+def close_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for s in sessions:
+        s.close()
+
+# ─────────────────────────────────────────────
+# 벤치마크: 로컬 HTTPS 서버로 requests.get vs 공용 세션 비교
+# ─────────────────────────────────────────────
+def benchmark_keepalive(requests_per_cycle: int = 20, cycles: int = 3):
+    """
+    로컬 HTTPS 서버(자체 서명 인증서)에 같은 수의 GET을 보내
+    매번 새 연결(requests.get)과 풀링 세션(get_session)의 시간/핸드셰이크 수를 비교.
+    openssl CLI가 필요하다.
+    """
+    import ssl
+    import socket
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    tmpdir = tempfile.mkdtemp(prefix="http_bench_")
+    cert = os.path.join(tmpdir, "cert.pem")
+    key = os.path.join(tmpdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+
+    handshakes = [0]
+    lock = threading.Lock()
+    body = b"{\"ok\": true}" * 200
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 허용
+
+        def setup(self):
+            super().setup()
+            # 헤더/본문이 따로 나가도 Nagle+지연 ACK로 40ms씩 멈추지 않도록
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with lock:
+                handshakes[0] += 1  # 연결(=TLS 핸드셰이크)마다 한 번
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert, key)
+    server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"https://127.0.0.1:{server.server_address[1]}/"
+
+    def run(get):
+        with lock:
+            handshakes[0] = 0
+        t0 = time.perf_counter()
+        for _ in range(cycles):
+            for _ in range(requests_per_cycle):
+                get(url, verify=cert, timeout=DEFAULT_TIMEOUT).raise_for_status()
+        return (time.perf_counter() - t0) / cycles, handshakes[0] / cycles
+
+    try:
+        bare_t, bare_hs = run(requests.get)
+        session = create_session()
+        pooled_t, pooled_hs = run(session.get)
+        session.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    print(f"📊 사이클당 GET {requests_per_cycle}회 (평균 {cycles}사이클)")
+    print(f"   requests.get : {bare_t * 1000:.1f}ms, 핸드셰이크 {bare_hs:.1f}회")
+    print(f"   공용 세션    : {pooled_t * 1000:.1f}ms, 핸드셰이크 {pooled_hs:.1f}회")
+    if pooled_t:
+        print(f"   → {bare_t / pooled_t:.1f}배 빠름, 사이클당 핸드셰이크 {bare_hs - pooled_hs:.0f}회 절약")
+    return {"bare_s": bare_t, "bare_handshakes": bare_hs, "pooled_s": pooled_t, "pooled_handshakes": pooled_hs}
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    benchmark_keepalive()
@@ -0,0 +1,305 @@
+# metrics.py
+# 모든 봇이 함께 쓰는 단계별 지연/처리량 계측
+# - 히스토그램: 단계(stage)별 소요 시간 (fetch, parse, browser_render, llm, translate, telegram_send ...)
+# - 카운터: 처리 건수(items), 캐시 적중/미스, 실패
+# - Prometheus 텍스트 형식으로 metrics/<job>.prom 파일에 주기적으로 기록 (node_exporter textfile collector용)
+#   METRICS_PORT 환경 변수(또는 start_exporter(port=...))가 있으면 http://127.0.0.1:<port>/metrics 로도 제공
+# - 기록 1건 = perf_counter 2번 + 락 1번 + bisect → 운영 중 계속 켜 두어도 되는 수준 (benchmark_overhead 참고)
+import os
+import time
+import bisect
+import logging
+import tempfile
+import threading
+from functools import wraps
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_DIR = os.path.join(BASE_DIR, "metrics")   # <job>.prom 파일 위치
+METRICS_FLUSH_INTERVAL = 15                        # 텍스트 파일 갱신 주기(초)
+METRICS_PORT = os.getenv("METRICS_PORT")           # 설정 시 /metrics HTTP 엔드포인트 제공 (127.0.0.1)
+PREFIX = "bot_"                                    # 모든 메트릭 이름 접두사
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+_HELP = {
+    "stage_duration_seconds": "단계별 소요 시간(초)",
+    "items_total": "처리한 항목 수",
+    "cache_hits_total": "캐시 적중 수",
+    "cache_misses_total": "캐시 미스 수",
+    "failures_total": "단계별 실패(예외) 수",
+    "http_responses_total": "호스트/상태 코드 계열별 HTTP 응답 수",
+}
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _format_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+class MetricsRegistry:
+    """
+    프로세스 단위 메트릭 저장소 (스레드 안전).
+    - 히스토그램은 stage_duration_seconds 하나에 stage + 추가 라벨로 구분
+    - 카운터는 이름 + 라벨로 구분
+    라벨 값은 종류가 적은 것만 쓴다 (엔진명, 호스트, 함수명 등. URL/ID 금지)
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.const_labels = {}
+        self._hists = {}     # label_key -> [bucket counts..., sum, count]
+        self._counters = {}  # (name, label_key) -> value
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, **labels):
+        key = _label_key({"stage": stage, **labels})
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = [0] * (len(self.buckets) + 3)
+            h[i] += 1          # 마지막 칸(len(buckets))은 +Inf 전용
+            h[-2] += seconds
+            h[-1] += 1
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def quantile(self, stage: str, q: float, **labels) -> Optional[float]:
+        """버킷 경계 기준 근사 분위수 (로그 출력용). 기록이 없으면 None"""
+        key = _label_key({"stage": stage, **labels})
+        with self._lock:
+            h = list(self._hists.get(key) or [])
+        if not h or not h[-1]:
+            return None
+        rank = q * h[-1]
+        seen = 0
+        for i, n in enumerate(h[:-2]):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        const = _label_key(self.const_labels)
+        with self._lock:
+            hists = {k: list(v) for k, v in self._hists.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        if hists:
+            name = PREFIX + "stage_duration_seconds"
+            lines.append(f"# HELP {name} {_HELP['stage_duration_seconds']}")
+            lines.append(f"# TYPE {name} histogram")
+            for key in sorted(hists):
+                h = hists[key]
+                pairs = const + key
+                cumulative = 0
+                for le, n in zip(self.buckets + (float("inf"),), h[:-2]):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_format_labels(pairs + (('le', _format_value(le)),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(h[-2])}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {h[-1]}")
+
+        names = sorted({n for n, _ in counters})
+        for n in names:
+            full = PREFIX + n
+            lines.append(f"# HELP {full} {_HELP.get(n, n)}")
+            lines.append(f"# TYPE {full} counter")
+            for (cn, key), value in sorted(counters.items()):
+                if cn == n:
+                    lines.append(f"{full}{_format_labels(const + key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+
+registry = MetricsRegistry()
+
+def observe(stage: str, seconds: float, **labels):
+    registry.observe(stage, seconds, **labels)
+
+def inc(name: str, value: float = 1, **labels):
+    registry.inc(name, value, **labels)
+
+def quantile(stage: str, q: float, **labels) -> Optional[float]:
+    return registry.quantile(stage, q, **labels)
+
+class timer:
+    """
+    with timer("llm", call="summarize_ko"): ...
+    블록 소요 시간을 히스토그램에 기록. 예외가 나면 failures_total{stage=...}도 1 올리고 그대로 다시 던짐.
+    """
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage: str, **labels):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe(self.stage, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            registry.inc("failures_total", stage=self.stage, **self.labels)
+        return False
+
+def timed(stage: str, **labels):
+    """함수 전체를 timer로 감싸는 데코레이터"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ─────────────────────────────────────────────
+# 내보내기: 텍스트 파일(주기 갱신) + 선택적 /metrics HTTP
+# ─────────────────────────────────────────────
+_exporter = None
+_exporter_lock = threading.Lock()
+
+def textfile_path(job: str) -> str:
+    return os.path.join(METRICS_DIR, f"{job}.prom")
+
+def write_textfile(path: str):
+    """원자적 쓰기 (수집기가 반쯤 쓴 파일을 읽지 않도록)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = registry.render()
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".metrics_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+class _Exporter:
+    def __init__(self, job: str, interval: float, port: Optional[int]):
+        self.path = textfile_path(job)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._server = None
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        if port:
+            self._serve(int(port))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            write_textfile(self.path)
+        except Exception as e:
+            logging.warning(f"[metrics] 텍스트 파일 기록 실패: {e}")
+
+    def _serve(self, port: int):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        except OSError as e:
+            logging.warning(f"[metrics] /metrics 포트 {port} 열기 실패: {e}")
+            return
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        logging.info(f"[metrics] http://127.0.0.1:{port}/metrics")
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+def start_exporter(job: str, interval: float = METRICS_FLUSH_INTERVAL, port=METRICS_PORT):
+    """
+    이 프로세스의 메트릭 내보내기 시작 (스크립트 시작 시 한 번).
+    모든 메트릭에 job 라벨을 붙이고 metrics/<job>.prom 을 interval초마다 갱신.
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is not None:
+            return _exporter
+        registry.const_labels = {"job": job}
+        _exporter = _Exporter(job, interval, port)
+        return _exporter
+
+def stop_exporter():
+    """마지막 값을 파일에 쓰고 내보내기 종료"""
+    global _exporter
+    with _exporter_lock:
+        exporter, _exporter = _exporter, None
+    if exporter is not None:
+        exporter.close()
+
+# ─────────────────────────────────────────────
+# 벤치마크: 기록 1건당 오버헤드
+# ─────────────────────────────────────────────
+def benchmark_overhead(n: int = 200_000):
+    """빈 블록을 timer로 n번 감쌌을 때 1건당 추가 시간 (별도 레지스트리 사용)"""
+    global registry
+    saved, registry = registry, MetricsRegistry()
+    try:
+        start = time.perf_counter()
+        for _ in range(n):
+            pass
+        bare = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(n):
+            with timer("bench", engine="x"):
+                pass
+        timed_s = time.perf_counter() - start
+    finally:
+        registry = saved
+    per_call = (timed_s - bare) / n
+    print(f"📊 timer 1건당 오버헤드: {per_call * 1e6:.2f}µs ({n:,}회)")
+    return per_call
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    benchmark_overhead()
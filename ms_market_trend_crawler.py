@@ -7,11 +7,14 @@ from typing import Dict, List, Optional
 from urllib.parse import urljoin
 from dotenv import load_dotenv
 import re
-import requests
 from requests.exceptions import RequestException, Timeout
 from bs4 import BeautifulSoup, Tag
 from openai import OpenAI
 
+from telegram_outbox import get_outbox, enqueue_message
+from http_session import get_session
+import metrics
+
 # ─────────────────────────────────────────
 # 환경 변수
 # ─────────────────────────────────────────
@@ -27,13 +30,13 @@ MAX_TOTAL = 3800
 
 HTTP_TIMEOUT = 20        # Morgan Stanley/텔레그램용 기본 HTTP 타임아웃
 OPENAI_TIMEOUT = 30      # OpenAI 요약/번역 타임아웃
-TELEGRAM_TIMEOUT = 15    # 텔레그램 전송 타임아웃
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID")  # 필요시 바꿔도 됨
 
 client = OpenAI(api_key=OPENAI_API_KEY)
+session = get_session()  # 공용 keep-alive HTTP 세션
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
@@ -106,15 +109,16 @@ def summarize_and_translate(text: str, max_chars: int = 3800) -> str:
         {text}
     """
 
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": "너는 전문 번역가이자 요약가야."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.2,
-        timeout=OPENAI_TIMEOUT,
-    )
+    with metrics.timer("llm", call="summarize_and_translate"):
+        resp = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": "너는 전문 번역가이자 요약가야."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.2,
+            timeout=OPENAI_TIMEOUT,
+        )
 
     answer = resp.choices[0].message.content.strip()
 
@@ -149,15 +153,16 @@ def translate_takeaways(takeaways: list[str], max_chars: int = 1200) -> str:
         {src}
     """
 
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": "너는 요약하지 않고 원문 구조를 그대로 유지하는 전문 번역가야."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.1,
-        timeout=OPENAI_TIMEOUT,
-    )
+    with metrics.timer("llm", call="translate_takeaways"):
+        resp = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": "너는 요약하지 않고 원문 구조를 그대로 유지하는 전문 번역가야."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.1,
+            timeout=OPENAI_TIMEOUT,
+        )
 
     answer = resp.choices[0].message.content.strip()
     if len(answer) > max_chars:
@@ -178,15 +183,16 @@ def translate_title(text: str, max_chars: int = 200) -> str:
         제목:
         {text}
     """
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.1,
-        timeout=OPENAI_TIMEOUT,
-    )
+    with metrics.timer("llm", call="translate_title"):
+        resp = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": "너는 제목을 그대로 번역하는 전문 번역가야."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.1,
+            timeout=OPENAI_TIMEOUT,
+        )
     answer = resp.choices[0].message.content.strip()
     if len(answer) > max_chars:
         answer = answer[:max_chars]
@@ -201,23 +207,11 @@ def send_to_telegram(message: str) -> None:
         return
 
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        resp = requests.post(
-            url,
-            data={
-                "chat_id": TELEGRAM_CHANNEL_ID,
-                "text": message,
-            },
-            timeout=TELEGRAM_TIMEOUT,
-        )
-        resp.raise_for_status()
-        logging.info("✅ 텔레그램 전송 완료")
-
-    except (RequestException, Timeout) as e:
-        logging.exception(f"❌ 텔레그램 전송 실패(네트워크/타임아웃): {e}")
-        logging.error("📦 실패한 메시지 일부: %s", message[:200])
+        # outbox(디스크 대기열)에 넣고 바로 반환 → 전송/재시도는 outbox 워커가 담당
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, message, source="ms")
+        logging.info("📮 텔레그램 전송 대기열 등록")
     except Exception as e:
-        logging.exception(f"❌ 텔레그램 전송 실패(기타): {e}")
+        logging.exception(f"❌ 텔레그램 대기열 등록 실패: {e}")
         logging.error("📦 실패한 메시지 일부: %s", message[:200])
 
 # ─────────────────────────────────────────
@@ -229,14 +223,16 @@ def normalize_url(href: str) -> str:
     return urljoin(BASE_URL, href)
 
 def get_soup(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
+    resp = session.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    with metrics.timer("parse"):
+        return BeautifulSoup(resp.text, "html.parser")
 
 def fetch_soup(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
+    resp = session.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    with metrics.timer("parse"):
+        return BeautifulSoup(resp.text, "html.parser")
 
 # ─────────────────────────────────────────
 # 1) 목록 페이지 파싱
@@ -250,7 +246,7 @@ def fetch_listing() -> List[Dict]:
         kind ∈ {"article", "podcast"}
     """
     try:
-        resp = requests.get(MS_API_URL, headers=HEADERS, timeout=HTTP_TIMEOUT)
+        resp = session.get(MS_API_URL, headers=HEADERS, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
 
@@ -629,11 +625,13 @@ def run_once() -> None:
 
             send_to_telegram(msg)
             add_recent_seen([url])
+            metrics.inc("items_total", kind="article_sent")
 
             # 너무 잦은 요청을 피하기 위해 항목 사이 약간 쉬어가기
             time.sleep(3)
 
         except Exception:
+            metrics.inc("failures_total", stage="article")
             logging.exception("항목 처리 중 오류: %s", url)
             # 오류 나도 다른 항목은 계속
 
@@ -642,12 +640,17 @@ def run_once() -> None:
 # ─────────────────────────────────────────
 if __name__ == "__main__":
     logging.info("Morgan Stanley Market Trends 크롤러 시작")
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("ms")  # metrics/ms.prom (+ METRICS_PORT 설정 시 /metrics)
 
     while True:
         try:
-            run_once()
+            with metrics.timer("cycle"):
+                run_once()
         except KeyboardInterrupt:
             logging.info("사용자에 의해 중단되었습니다.")
+            get_outbox().close()
+            metrics.stop_exporter()
             break
         except Exception:
             logging.exception("주기 실행 중 오류 발생")
@@ -5,16 +5,22 @@ import json
 import time
 import html
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Dict, Optional, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 import shutil
 import textwrap
 from dotenv import load_dotenv
 
-import requests
 from requests.exceptions import RequestException, Timeout
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, Tag, NavigableString, CData
+
+from translation_cache import get_translation_cache
+from telegram_outbox import get_outbox, enqueue_message
+from http_session import get_session
+import metrics
 
 TRENDING_URL = "https://www.stocktitan.net/news/trending.html"
 STATE_FILE = "stocktitan_trending_state.json"  # 직전 Top7 기억용(기사 URL 세트 저장)
@@ -48,13 +54,54 @@ RECENT_SEEN_LIMIT = 100
 RECENT_EXPIRE_DAYS = 7  # 7일 동안만 '이미 전송한 URL'로 간주
 HTTP_TIMEOUT = 20      # StockTitan GET요청용
 OPENAI_TIMEOUT = 30    # GPT 번역용(이미 30초 쓰고 있었음)
-TELEGRAM_TIMEOUT = 10  # 텔레그램 전송용
+DETAIL_FETCH_WORKERS = 7   # 상세 페이지 동시 요청 스레드 수 (Top7 → 한 번에)
+PER_HOST_CONCURRENCY = 4   # 같은 호스트로 동시에 보낼 최대 요청 수 (공용 세션 풀 크기 이하)
+TRANSLATE_BATCH_MAX_CHARS = 12000  # 묶음 번역 요청 1건에 넣을 최대 원문 글자 수 (넘으면 여러 요청으로 나눔)
+session = get_session()  # 공용 keep-alive HTTP 세션
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s | %(message)s"
 )
 
+class LazyRecord(dict):
+    """
+    일부 값을 처음 읽을 때 계산하는 dict.
+    lazy={키: 인자 없는 함수} → record[키]/record.get(키) 때 한 번 계산해 저장, 안 읽으면 계산하지 않음.
+    (in/키 목록/반복/len/JSON 직렬화에는 계산된 값만 보임 — defaultdict와 같은 규칙 → 전부 필요하면 resolve())
+    """
+    def __init__(self, *args, lazy: Optional[Dict] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy = dict(lazy or {})
+
+    def __missing__(self, key):
+        loader = self._lazy.pop(key, None)
+        if loader is None:
+            raise KeyError(key)
+        value = self[key] = loader()
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def resolve(self) -> Dict:
+        """남은 지연 값을 모두 계산한 일반 dict"""
+        for key in list(self._lazy):
+            self[key]
+        return dict(self)
+
+def _memo(fn):
+    """인자 없는 함수를 처음 호출할 때 한 번만 실행 (여러 지연 필드가 같은 계산을 나눠 쓸 때)"""
+    box = []
+    def wrapper():
+        if not box:
+            box.append(fn())
+        return box[0]
+    return wrapper
+
 def normalize_url(href: str) -> str:
     if href.startswith("http"):
         return href
@@ -102,6 +149,10 @@ def load_prev_ids() -> set:
     # 기존 로직과 호환: 지난 사이클의 Top7
     return set(_load_state().get("last_top7_urls", []))
 
+def load_prev_ranks() -> Dict[str, int]:
+    """지난 사이클 Top7의 URL → 순위(1부터). last_top7_urls는 순위 순서로 저장돼 있음"""
+    return {url: i for i, url in enumerate(_load_state().get("last_top7_urls", []), start=1)}
+
 def save_curr_ids(curr_ids: List[str]) -> None:
     st = _load_state()
     st["last_top7_urls"] = curr_ids
@@ -119,8 +170,12 @@ def load_recent_seen() -> dict[str, float]:
         _save_state(st)
     return recent
 
-def add_recent_seen(urls: List[str]) -> None:
-    """새로 전송한 URL을 최근 목록에 추가 (기존 있으면 timestamp만 갱신)."""
+def load_recent_costs() -> Dict[str, int]:
+    """전송한 URL별로 처리할 때 든 GPT 호출 수 (다시 보면 이만큼 절약한 것으로 집계)"""
+    return _load_state().get("recent_llm_calls", {})
+
+def add_recent_seen(urls: List[str], llm_calls: Optional[Dict[str, int]] = None) -> None:
+    """새로 전송한 URL을 최근 목록에 추가 (기존 있으면 timestamp만 갱신). llm_calls: URL별 GPT 호출 수"""
     st = _load_state()
     recent: dict[str, float] = st.get("recent_urls", {})
     if isinstance(recent, list):
@@ -136,6 +191,9 @@ def add_recent_seen(urls: List[str]) -> None:
     recent = {u: ts for u, ts in recent.items() if ts >= cutoff}
 
     st["recent_urls"] = recent
+    costs = {u: n for u, n in st.get("recent_llm_calls", {}).items() if u in recent}
+    costs.update({u: n for u, n in (llm_calls or {}).items() if u in recent})
+    st["recent_llm_calls"] = costs
     _save_state(st)
 
 def get_unseen_items(data: list[dict]) -> list[dict]:
@@ -143,7 +201,7 @@ def get_unseen_items(data: list[dict]) -> list[dict]:
     아직 전송하지 않은(또는 기간 만료로 재전송 허용된) 항목만 필터링.
     """
     recent = load_recent_seen()
-    unseen = [d for d in data if d.get("url") not in recent]
+    unseen = [d for d in data if not d.get("already_sent") and d.get("url") not in recent]
     return unseen
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -151,44 +209,153 @@ def get_unseen_items(data: list[dict]) -> list[dict]:
 #  - 실제 서비스에선 Papago → MS → DeepL 순 fallback 연결 권장(사용자 선호 반영)
 # ─────────────────────────────────────────────────────────────────────────────
 
+GPT_TRANSLATE_RULES = (
+    "You are a precise translator. Translate ONLY natural language segments into the target language. "
+    "STRICTLY preserve as-is: emojis, URLs (https://...), emails, @mentions, #hashtags, $tickers, "
+    "any placeholders like [EMOJI_0], {EMOJI_1}, [[EMOJI_2]], code, and original line breaks/spaces. "
+)
+
+def _post_gpt(messages: List[Dict], call: str, **extra) -> str:
+    """chat/completions 호출 1회 → 응답 본문 문자열"""
+    with metrics.timer("llm", call=call):
+        resp = session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+            json={"model": "gpt-4o-mini", "temperature": 0, "messages": messages, **extra},
+            timeout=OPENAI_TIMEOUT,
+        )
+        resp.raise_for_status()
+    return (resp.json()["choices"][0]["message"]["content"] or "").strip()
+
 def translate_with_gpt4omini(text: str, target_lang: str = "ko", source_lang: Optional[str] = None) -> str:
     if not text or text.strip() == "":
         return text
     if not OPENAI_API_KEY:
         return text  # 키 없으면 원문 그대로
 
-    system_msg = (
-        "You are a precise translator. Translate ONLY natural language segments into the target language. "
-        "STRICTLY preserve as-is: emojis, URLs (https://...), emails, @mentions, #hashtags, $tickers, "
-        "any placeholders like [EMOJI_0], {EMOJI_1}, [[EMOJI_2]], code, and original line breaks/spaces. "
-        "Do not add extra text. Output only the translation."
-    )
+    system_msg = GPT_TRANSLATE_RULES + "Do not add extra text. Output only the translation."
     user_msg = (f"Source language: {source_lang}\n" if source_lang else "") + \
                f"Target language: {target_lang}\n\nText:\n{text}"
 
+    # X 봇과 같은 디스크 캐시/엔진 키를 사용 → 같은 문장은 어느 쪽에서든 한 번만 번역
+    cache = get_translation_cache()
+    cached = cache.get(text, target_lang, "translate_with_gpt4omini")
+    if cached:
+        return cached
+
     try:
-        resp = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-            json={
-                "model": "gpt-4o-mini",
-                "temperature": 0,
-                "messages": [
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg},
-                ],
-            },
-            timeout=OPENAI_TIMEOUT,
+        out = _post_gpt(
+            [{"role": "system", "content": system_msg}, {"role": "user", "content": user_msg}],
+            call="translate_with_gpt4omini",
         )
-        resp.raise_for_status()
-        out = (resp.json()["choices"][0]["message"]["content"] or "").strip()
+        if out:
+            cache.put(text, target_lang, "translate_with_gpt4omini", out)
         return out or text
     except Exception:
         return text  # 실패하면 원문 유지
 
+def _batch_chunks(items: List[Tuple[int, str]], max_chars: int) -> List[List[Tuple[int, str]]]:
+    chunks, cur, size = [], [], 0
+    for idx, text in items:
+        if cur and size + len(text) > max_chars:
+            chunks.append(cur)
+            cur, size = [], 0
+        cur.append((idx, text))
+        size += len(text)
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def _parse_batch_reply(reply: str, ids: List[int]) -> Dict[int, str]:
+    """
+    {"translations": [{"id": 0, "text": "..."}, ...]} 응답에서 유효한 항목만 {id: 번역문}으로.
+    개수/순서가 요청과 다르거나 형식이 깨진 항목은 빠짐 → 호출 측이 그 항목만 개별 재시도
+    """
+    try:
+        data = json.loads(reply)
+    except ValueError:
+        return {}
+    entries = data.get("translations") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+    if len(entries) != len(ids):
+        logging.warning(f"[translate_batch] 개수 불일치: 요청 {len(ids)}개, 응답 {len(entries)}개")
+    out = {}
+    for pos, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        idx, text = entry.get("id"), entry.get("text")
+        # 순서 확인: pos번째 응답은 pos번째 요청 id여야 함
+        if pos >= len(ids) or idx != ids[pos] or not isinstance(text, str) or not text.strip():
+            continue
+        out[idx] = text.strip()
+    return out
+
+def translate_batch_with_gpt4omini(texts: List[str], target_lang: str = "ko") -> Tuple[List[str], int]:
+    """
+    여러 문장을 한 번의 GPT 요청(JSON 배열)으로 번역.
+    - 캐시에 있는 문장/빈 문장은 요청에서 제외
+    - 응답 개수·순서(id)를 검증하고, 빠지거나 깨진 항목만 translate_with_gpt4omini로 개별 재시도
+    반환: (입력과 같은 순서의 번역 목록, 실제 GPT 호출 수)
+    """
+    out = list(texts)
+    if not OPENAI_API_KEY:
+        return out, 0  # 키 없으면 원문 그대로
+
+    cache = get_translation_cache()
+    pending = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        cached = cache.get(text, target_lang, "translate_with_gpt4omini")
+        if cached:
+            out[i] = cached
+        else:
+            pending.append((i, text))
+
+    calls = 0
+    system_msg = GPT_TRANSLATE_RULES + (
+        "The user sends a JSON array of {\"id\", \"text\"} objects. Translate each text independently. "
+        "Reply with a JSON object {\"translations\": [{\"id\": <same id>, \"text\": <translation>}, ...]} "
+        "containing exactly one entry per input, in the same order. Do not merge, split, or skip entries."
+    )
+    retry = []
+    for chunk in _batch_chunks(pending, TRANSLATE_BATCH_MAX_CHARS):
+        ids = [idx for idx, _ in chunk]
+        user_msg = f"Target language: {target_lang}\n\n" + json.dumps(
+            [{"id": idx, "text": text} for idx, text in chunk], ensure_ascii=False
+        )
+        try:
+            calls += 1
+            reply = _post_gpt(
+                [{"role": "system", "content": system_msg}, {"role": "user", "content": user_msg}],
+                call="translate_batch", response_format={"type": "json_object"},
+            )
+            got = _parse_batch_reply(reply, ids)
+        except Exception as e:
+            logging.warning(f"[translate_batch] 묶음 번역 실패({len(chunk)}개): {e}")
+            got = {}
+        for idx, text in chunk:
+            if idx in got:
+                out[idx] = got[idx]
+                cache.put(text, target_lang, "translate_with_gpt4omini", got[idx])
+            else:
+                retry.append((idx, text))
+
+    if retry:
+        logging.info(f"[translate_batch] 응답이 빠지거나 깨진 {len(retry)}개 항목만 개별 재번역")
+        metrics.inc("failures_total", len(retry), stage="translate_batch_entry")
+    for idx, text in retry:
+        calls += 1
+        out[idx] = translate_with_gpt4omini(text, target_lang=target_lang)
+    return out, calls
+
 def translate_text(text: str, target_lang: str = "ko") -> str:
     return translate_with_gpt4omini(text, target_lang=target_lang)
 
+def translate_texts(texts: List[str], target_lang: str = "ko") -> List[str]:
+    return translate_batch_with_gpt4omini(texts, target_lang=target_lang)[0]
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1) 트렌딩 Top7 파싱
@@ -196,13 +363,14 @@ def translate_text(text: str, target_lang: str = "ko") -> str:
 # ─────────────────────────────────────────────────────────────────────────────
 def fetch_trending_top7() -> List[Dict]:
     try:
-        resp = requests.get(TRENDING_URL, headers=HEADERS, timeout=HTTP_TIMEOUT)
+        resp = session.get(TRENDING_URL, headers=HEADERS, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
     except (RequestException, Timeout) as e:
         logging.error(f"[fetch_trending_top7] 요청 실패: {e}")
         return []
     
-    soup = BeautifulSoup(resp.text, "html.parser")
+    with metrics.timer("parse", page="trending"):
+        soup = BeautifulSoup(resp.text, "html.parser")
 
     items: List[Dict] = []
     seen = set()
@@ -240,22 +408,23 @@ def fetch_trending_top7() -> List[Dict]:
             m = re.search(r"/news/([A-Z0-9\.\-]+)/", url)
             ticker = m.group(1) if m else None
 
-            # ⭐ 카드 블록에서 요약/긍정/부정을 함께 추출
+            # ⭐ 카드 블록의 요약/긍정/부정은 처음 읽을 때만 추출
+            #    (상세 페이지에 Rhea 데이터가 없을 때의 fallback용 → 대부분의 사이클은 계산 안 함)
             card_block = a.parent
-            trending_summary = extract_rhea_summary_from_block(card_block) or None
-            tpos, tneg = extract_pos_neg_from_block(card_block)
+            pos_neg = _memo(lambda block=card_block: extract_pos_neg_from_block(block))
 
             rank += 1
-            items.append({
+            items.append(LazyRecord({
                 "rank": rank,
                 "title": title or "(No title)",
                 "ticker": ticker,
                 "url": url,
+            }, lazy={
                 # 트렌딩 카드의 Rhea 요약/긍/부정은 필요 시 아래 함수로 시도
-                "trending_summary": trending_summary,
-                "trending_positive": tpos,
-                "trending_negative": tneg,
-            })
+                "trending_summary": lambda block=card_block: extract_rhea_summary_from_block(block) or None,
+                "trending_positive": lambda pos_neg=pos_neg: pos_neg()[0],
+                "trending_negative": lambda pos_neg=pos_neg: pos_neg()[1],
+            }))
             seen.add(url)
             if rank >= 7:
                 break
@@ -355,24 +524,24 @@ def extract_rhea_from_detail(soup: BeautifulSoup) -> Dict:
     insights = [li.get_text(" ", strip=True) for li in tools.select(insights_li_sel)]
     insights += [p.get_text(" ", strip=True) for p in tools.select(insights_p_sel)]
 
-    # 중복 제거
-    def dedup(xs):
-        out, seen = [], set()
-        for x in xs:
-            k = x.strip().lower()
-            if k and k not in seen:
-                out.append(x.strip())
-                seen.add(k)
-        return out
-
     return {
         "summary_ko": summary_ko,
         "summary_en": summary_en,
-        "positive": dedup(positives),
-        "negative": dedup(negatives),
-        "insights": dedup(insights),
+        "positive": _dedup_stripped(positives),
+        "negative": _dedup_stripped(negatives),
+        "insights": _dedup_stripped(insights),
     }
 
+def _dedup_stripped(xs: List[str]) -> List[str]:
+    # 중복 제거 (앞뒤 공백 제거 + 대소문자 무시, 빈 문자열 제외)
+    out, seen = [], set()
+    for x in xs:
+        k = x.strip().lower()
+        if k and k not in seen:
+            out.append(x.strip())
+            seen.add(k)
+    return out
+
 
 def extract_pos_neg_from_block(block: Tag) -> Tuple[List[str], List[str]]:
     """
@@ -472,7 +641,7 @@ def dedup_list(xs: List[str]) -> List[str]:
 # ─────────────────────────────────────────────────────────────────────────────
 def parse_article_detail(url: str) -> Dict:
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
+        resp = session.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
     except (RequestException, Timeout) as e:
         logging.error(f"[parse_article_detail] 요청 실패 ({url}): {e}")
@@ -490,25 +659,16 @@ def parse_article_detail(url: str) -> Dict:
             "body": [],
         }
     
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    # 메타
-    title = (soup.select_one("h1") or soup.select_one("title"))
-    title_text = title.get_text(strip=True) if title else ""
-
-    published_at = extract_published_at(soup)
-    source_url = extract_source_url(soup)
-
-    # ✅ 상세 페이지의 Rhea-AI 블록(구조 기반) 파싱
-    rhea = extract_rhea_from_detail(soup)
-
-    # 기사 본문(헤더/볼드 감지 포함) — 기존 함수 유지
-    body_sections = extract_article_body_sections(soup)
-
-    return {
-        "title": title_text,
-        "published_at": published_at,
-        "source_url": source_url,
+    with metrics.timer("parse", page="detail"):
+        soup = BeautifulSoup(resp.text, "html.parser")
+        # 제목/게시 시각/원문 링크/Rhea 블록/본문을 DOM 한 번 순회로 추출
+        fields = extract_detail_fields(soup)
+    rhea = fields["rhea"]
+
+    return LazyRecord({
+        "title": fields["title"],
+        "published_at": fields["published_at"],
+        "source_url": fields["source_url"],
         "detail": {
             "summary_ko": rhea["summary_ko"],     # {"lang":"ko","text":"..."} or None
             "summary_en": rhea["summary_en"],
@@ -516,9 +676,38 @@ def parse_article_detail(url: str) -> Dict:
             "negative": rhea["negative"],    # list[str]
             "insights": rhea["insights"],    # list[str]
         },
-        "body": body_sections,
-    }
+    }, lazy={"body": lambda: fields["body"]})   # 본문 섹션은 읽을 때 계산
+
+
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
 
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).hostname or ""
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(PER_HOST_CONCURRENCY)
+        return slot
+
+def _parse_article_detail_limited(url: str) -> Dict:
+    with _host_slot(url):
+        return parse_article_detail(url)
+
+def fetch_article_details(urls: List[str]) -> Dict[str, Dict]:
+    """
+    여러 상세 페이지를 동시에 가져와 {url: parse_article_detail 결과}로 반환 (입력 순서 유지).
+    공용 keep-alive 세션을 쓰고, 호스트별 동시 요청은 PER_HOST_CONCURRENCY개로 제한
+    → 사이클 지연이 '페이지 n개'가 아니라 '가장 느린 페이지 1개' 수준
+    """
+    if not urls:
+        return {}
+    if len(urls) == 1:
+        return {urls[0]: parse_article_detail(urls[0])}
+    with ThreadPoolExecutor(max_workers=min(DETAIL_FETCH_WORKERS, len(urls)),
+                            thread_name_prefix="stocktitan-detail") as pool:
+        details = list(pool.map(_parse_article_detail_limited, urls))
+    return dict(zip(urls, details))
 
 def extract_published_at(soup: BeautifulSoup) -> Optional[str]:
     # 날짜 포맷이 기사마다 달라서 여러 후보를 탐색
@@ -590,13 +779,16 @@ def extract_article_body_sections(soup: BeautifulSoup) -> List[Dict]:
     - 문단/리스트: type='paragraph' / 'list_item'
     """
     container = find_main_article_container(soup) or soup
+    elements = container.find_all(["h1", "h2", "h3", "h4", "p", "li", "strong", "b"])
+    return _body_sections((el.name, el.get_text(" ", strip=True)) for el in elements)
 
+def _body_sections(elements) -> List[Dict]:
+    """(태그 이름, 텍스트) 목록 → 헤더/문단/리스트 섹션 (인접 중복 제거)"""
     sections: List[Dict] = []
 
     # 제목 계층
-    for el in container.find_all(["h1", "h2", "h3", "h4", "p", "li", "strong", "b"]):
-        name = el.name.lower()
-        text = el.get_text(" ", strip=True)
+    for name, text in elements:
+        name = name.lower()
         if not text or len(text) < 2:
             continue
 
@@ -640,22 +832,326 @@ def find_main_article_container(soup: BeautifulSoup) -> Optional[Tag]:
 def ends_with_punctuation(text: str) -> bool:
     return bool(re.search(r"[.!?…]$", text))
 
+# ─────────────────────────────────────────────────────────────────────────────
+# 2-1) 상세 페이지 단일 순회 추출기
+#    - 위 extract_* 함수들은 같은 soup를 여러 번 훑음 (CSS 셀렉터 십여 개, 전체 텍스트 노드 스캔,
+#      앵커마다 get_text, 겹치는 하위 트리마다 get_text)
+#    - 여기서는 DOM을 한 번만 돌면서 제목/게시 시각/원문 링크/Rhea 블록/본문 후보를 함께 모으고,
+#      텍스트는 순회 중 모아 둔 문자열 구간을 이어 붙여 만든다 (get_text(" ", strip=True)와 같은 결과)
+#    - 결과는 extract_detail_fields_legacy()와 동일해야 함 → benchmark_detail_parse()로 확인
+# ─────────────────────────────────────────────────────────────────────────────
+_MAIN_STRING_TYPES = (NavigableString, CData)   # Tag.get_text()가 기본으로 모으는 문자열 타입
+_SPECIAL_STRING_TAGS = {"script", "style", "template", "rt", "rp"}  # get_text 대상 타입이 다른 태그
+_PUBLISHED_RE = re.compile(r"\b(Published|Updated)\b", re.I)
+_POSITIVE_BOX = ({"positive-points", "rhea-positive", "news-card-pros", "news-card-positive"}, "news-card-positive")
+_NEGATIVE_BOX = ({"negative-points", "rhea-negative", "news-card-cons", "news-card-negative"}, "news-card-negative")
+_INSIGHT_BOX = {"insights", "key-insights", "takeaways"}
+_SUMMARY_BOX = ({"news-card-summary", "rhea-summary"}, "news-card-summary")
+_SUMMARY_KO = ({"summary-ko", "ko"}, "id-summary-ko", "ko")   # (클래스, id, lang)
+_SUMMARY_EN = ({"summary-en", "en"}, ("summary", "id-summary-en"), "en")
+_BODY_TAGS = {"h1", "h2", "h3", "h4", "p", "li", "strong", "b"}
+_CONTAINER_ORDER = ("article", ".article", ".post", ".news", "#content", ".content")  # find_main_article_container 순서
+
+class _Node:
+    """순회 중 기록해 둔 태그: pre(전위 순번) ~ last(마지막 자손 순번), 텍스트 구간 [s, e)"""
+    __slots__ = ("tag", "pre", "last", "s", "e")
+
+    def __init__(self, tag: Tag, pre: int, s: int):
+        self.tag, self.pre, self.last, self.s, self.e = tag, pre, pre, s, s
+
+    def inside(self, scope: Optional["_Node"]) -> bool:
+        # scope가 None이면 문서 전체(soup)가 범위
+        return scope is None or scope.pre < self.pre <= scope.last
+
+def extract_detail_fields(soup: BeautifulSoup) -> "LazyRecord":
+    """
+    상세 페이지에서 title/published_at/source_url/rhea/body를 DOM 한 번 순회로 추출.
+    body(본문 섹션)는 텔레그램 메시지에 안 쓰이므로 처음 읽을 때 만든다.
+    """
+    strings: List[str] = []           # 순회 순서대로 모은 strip된 본문 문자열
+    published_text = None             # 'Published/Updated'가 들어간 첫 짧은 텍스트 (메타 태그가 없을 때 사용)
+    first = {}                        # 처음 나온 h1/title/날짜 메타/rhea 도구 블록/본문 컨테이너 후보
+    anchors, boxes, ko_nodes, en_nodes = [], [], [], []
+    positives, negatives, insights_li, insights_p, body = [], [], [], [], []
+    depth = {"pos": 0, "neg": 0, "ins": 0, "experts": 0, "accordion": 0}  # 열려 있는 조상 중 해당 블록 수
+
+    pre = 0
+    open_nodes: List[Tuple[_Node, tuple]] = []
+    stack = [iter(soup.contents)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            if open_nodes:
+                node, bumps = open_nodes.pop()
+                node.last, node.e = pre - 1, len(strings)
+                for key in bumps:
+                    depth[key] -= 1
+            continue
+
+        if isinstance(child, NavigableString):
+            t = child.strip()
+            if not t:
+                continue
+            if type(child) in _MAIN_STRING_TYPES:
+                strings.append(t)
+            if published_text is None and len(t) < 120 and _PUBLISHED_RE.search(t):
+                published_text = t
+            continue
+        if not isinstance(child, Tag):
+            continue
+
+        node = _Node(child, pre, len(strings))
+        pre += 1
+        name = child.name
+        attrs = child.attrs
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        classes = set(classes)
+        tag_id = attrs.get("id")
+
+        if name == "h1":
+            first.setdefault("h1", node)
+        elif name == "title":
+            first.setdefault("title", node)
+        elif name == "a" and "href" in attrs:
+            anchors.append(node)
+        if "date_meta" not in first and (
+            (name == "meta" and (attrs.get("property") == "article:published_time" or attrs.get("name") == "pubdate"))
+            or (name == "time" and "datetime" in attrs)
+        ):
+            first["date_meta"] = node
+        if "article-rhea-tools" in classes or tag_id == "article-rhea-tools":
+            first.setdefault("tools", node)
+        if name == "article":
+            first.setdefault("article", node)
+        for sel, hit in ((".article", "article" in classes), (".post", "post" in classes),
+                         (".news", "news" in classes), ("#content", tag_id == "content"),
+                         (".content", "content" in classes)):
+            if hit:
+                first.setdefault(sel, node)
+
+        if classes & _SUMMARY_BOX[0] or tag_id == _SUMMARY_BOX[1]:
+            boxes.append(node)
+        if classes & _SUMMARY_KO[0] or tag_id == _SUMMARY_KO[1] or attrs.get("lang") == _SUMMARY_KO[2]:
+            ko_nodes.append(node)
+        if classes & _SUMMARY_EN[0] or tag_id in _SUMMARY_EN[1] or attrs.get("lang") == _SUMMARY_EN[2]:
+            en_nodes.append(node)
+
+        # 조상 블록 기준 분류 (자기 자신의 클래스는 제외 → 'X li'는 X가 조상이어야 함)
+        if name == "li":
+            if depth["pos"]:
+                positives.append(node)
+            if depth["neg"]:
+                negatives.append(node)
+            if depth["ins"]:
+                insights_li.append(node)
+        elif name == "p" and (depth["accordion"] or depth["ins"]):
+            insights_p.append(node)
+        if name in _BODY_TAGS:
+            body.append(node)
+
+        bumps = []
+        if classes & _POSITIVE_BOX[0] or tag_id == _POSITIVE_BOX[1]:
+            bumps.append("pos")
+        if classes & _NEGATIVE_BOX[0] or tag_id == _NEGATIVE_BOX[1]:
+            bumps.append("neg")
+        if classes & _INSIGHT_BOX:
+            bumps.append("ins")
+        if "accordion-body" in classes and depth["experts"]:
+            bumps.append("accordion")
+        if tag_id == "experts-container":
+            bumps.append("experts")
+        for key in bumps:
+            depth[key] += 1
+        open_nodes.append((node, tuple(bumps)))
+        stack.append(iter(child.contents))
+
+    def text(node: _Node, sep: str = " ") -> str:
+        if node.tag.name in _SPECIAL_STRING_TAGS:
+            return node.tag.get_text(sep, strip=True)
+        return sep.join(strings[node.s:node.e])
+
+    # 메타
+    title_node = first.get("h1") or first.get("title")
+    title_text = text(title_node, "") if title_node else ""
+
+    published_at = None
+    meta = first.get("date_meta")
+    if meta:
+        published_at = meta.tag.get("content") or meta.tag.get("datetime")
+    if not published_at:
+        published_at = published_text
+
+    source_url = None
+    for a in anchors:
+        # 'source'가 없으면 get_text 결과에도 'view source'/'source version'이 있을 수 없음 → 조인 생략
+        if not any("source" in s.lower() for s in strings[a.s:a.e]):
+            continue
+        label = text(a).lower()
+        if "view source" in label or "source version" in label:
+            href = a.tag.get("href")
+            if href and href.startswith("http"):
+                source_url = href
+                break
+
+    # Rhea 블록 (extract_rhea_from_detail과 같은 우선순위/범위)
+    tools = first.get("tools")
+    summary_ko = summary_en = None
+    box = next((n for n in boxes if n.inside(tools)), None)
+    if box:
+        ko = next((n for n in ko_nodes if n.inside(box)), None)
+        if ko and text(ko):
+            summary_ko = {"lang": "ko", "text": text(ko)}
+        en = next((n for n in en_nodes if n.inside(box)), None)
+        if en and text(en):
+            summary_en = {"lang": "en", "text": text(en)}
+
+    def texts_in(nodes: List[_Node]) -> List[str]:
+        return [text(n) for n in nodes if n.inside(tools)]
+
+    rhea = {
+        "summary_ko": summary_ko,
+        "summary_en": summary_en,
+        "positive": _dedup_stripped(texts_in(positives)),
+        "negative": _dedup_stripped(texts_in(negatives)),
+        "insights": _dedup_stripped(texts_in(insights_li) + texts_in(insights_p)),
+    }
+
+    # 본문 (find_main_article_container 우선순위 → 그 안의 헤더/문단/리스트), 읽을 때 계산
+    container = next((first[sel] for sel in _CONTAINER_ORDER if sel in first), None)
+
+    def body_sections() -> List[Dict]:
+        return _body_sections((n.tag.name, text(n)) for n in body if n.inside(container))
+
+    return LazyRecord({
+        "title": title_text,
+        "published_at": published_at,
+        "source_url": source_url,
+        "rhea": rhea,
+    }, lazy={"body": body_sections})
+
+def extract_detail_fields_legacy(soup: BeautifulSoup) -> Dict:
+    """예전 방식(함수마다 soup를 따로 훑음). extract_detail_fields 결과 비교/벤치마크용"""
+    title = (soup.select_one("h1") or soup.select_one("title"))
+    return {
+        "title": title.get_text(strip=True) if title else "",
+        "published_at": extract_published_at(soup),
+        "source_url": extract_source_url(soup),
+        "rhea": extract_rhea_from_detail(soup),
+        "body": extract_article_body_sections(soup),
+    }
+
+def diff_detail_fields(legacy: Dict, single: Dict) -> Dict[str, Tuple]:
+    """두 추출 결과를 필드별로 비교 → {필드: (legacy 값, single 값)} (rhea는 하위 필드 단위, 같으면 빈 dict)"""
+    diffs = {}
+    for key in sorted(set(legacy) | set(single)):
+        a, b = legacy.get(key), single.get(key)
+        if key == "rhea" and isinstance(a, dict) and isinstance(b, dict):
+            for sub in sorted(set(a) | set(b)):
+                if a.get(sub) != b.get(sub):
+                    diffs[f"rhea.{sub}"] = (a.get(sub), b.get(sub))
+        elif a != b:
+            diffs[key] = (a, b)
+    return diffs
+
+def benchmark_detail_parse(html_paths: Optional[List[str]] = None, repeat: int = 5, live: bool = False):
+    """
+    상세 페이지 추출: 예전 다중 순회 vs 단일 순회 시간 비교 + 필드별 결과 동일 여부 확인.
+    html_paths: 저장해 둔 상세 페이지 HTML 파일들 (live=False면 필수).
+    live=True: 지금 트렌딩 Top7 상세 페이지를 받아서 사용.
+    (soup 생성 시간은 양쪽 같으므로 제외)
+    """
+    pages = []
+    if not live:
+        if not html_paths:
+            raise ValueError("html_paths가 필요합니다 (또는 live=True)")
+        for path in html_paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((path, f.read()))
+    else:
+        for item in fetch_trending_top7():
+            resp = session.get(item["url"], headers=HEADERS, timeout=HTTP_TIMEOUT)
+            resp.raise_for_status()
+            pages.append((item["url"], resp.text))
+
+    total_legacy = total_single = 0.0
+    for label, page in pages:
+        soup = BeautifulSoup(page, "html.parser")
+        legacy = extract_detail_fields_legacy(soup)
+        single = extract_detail_fields(soup).resolve()
+        diffs = diff_detail_fields(legacy, single)
+        same = not diffs
+        t_legacy = min(_time_call(extract_detail_fields_legacy, soup) for _ in range(repeat))
+        t_single = min(_time_call(lambda s: extract_detail_fields(s).resolve(), soup) for _ in range(repeat))
+        t_lazy = min(_time_call(extract_detail_fields, soup) for _ in range(repeat))  # body를 안 읽는 평소 사이클
+        total_legacy += t_legacy
+        total_single += t_single
+        print(f"⏱️ {'✅' if same else '❌ 결과 다름'} 다중 순회 {t_legacy * 1000:7.1f}ms → 단일 순회 {t_single * 1000:7.1f}ms "
+              f"(body 미사용 {t_lazy * 1000:.1f}ms) | {label}")
+        for key, (a, b) in diffs.items():
+            print(f"   ↳ {key}: {str(a)[:200]} != {str(b)[:200]}")
+    if pages and total_single:
+        print(f"📊 {len(pages)}페이지 합계: {total_legacy * 1000:.1f}ms → {total_single * 1000:.1f}ms "
+              f"({total_legacy / total_single:.1f}배)")
+    return {"legacy_s": total_legacy, "single_s": total_single, "pages": len(pages)}
+
+def _time_call(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 실행 플로우(샘플)
 # ─────────────────────────────────────────────────────────────────────────────
 def run_once() -> List[Dict]:
+    """
+    트렌딩 Top7을 가져와 레코드 목록(순위 순)으로 반환.
+    - 이미 전송한 URL(recent_urls)은 상세 페이지/번역 없이 순위 정보만 담아 반환 (already_sent=True)
+    - 아직 안 보낸 URL만 상세 페이지 파싱 + 번역
+    - 건너뛴 상세 fetch/GPT 호출 수는 로그와 metrics(items_total)에 남김
+    """
     trending = fetch_trending_top7()
     curr_ids = [item["url"] for item in trending]
-    prev_ids = load_prev_ids()
+    prev_ranks = load_prev_ranks()
+    recent = load_recent_seen()
+    costs = load_recent_costs()
 
-    new_ids = set(curr_ids) - prev_ids
+    new_ids = set(curr_ids) - set(prev_ranks)
     logging.info(f"Top7 total: {len(curr_ids)}, new_in_rank: {len(new_ids)}")
 
+    # 아직 안 보낸 기사 상세 페이지는 한꺼번에 동시 요청 (결과는 아래에서 순위 순서대로 사용)
+    details = fetch_article_details([url for url in curr_ids if url not in recent])
+
     results = []
+    skipped_fetches = skipped_llm_calls = 0
     for item in trending:
         url = item["url"]
-        detail = parse_article_detail(url)
+        prev_rank = prev_ranks.get(url)
+        rank_info = {
+            "rank": item["rank"],
+            "prev_rank": prev_rank,                   # 지난 사이클 순위 (새 진입이면 None)
+            "rank_change": (prev_rank - item["rank"]) if prev_rank else None,  # +면 상승
+            "is_new_in_rank": url in new_ids,         # 이번 주기에서 새로 진입했는가?
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if url in recent:
+            # 이미 보낸 기사: 상세 fetch/번역 생략, 순위 변화만 기록
+            skipped_fetches += 1
+            skipped_llm_calls += costs.get(url, 0)
+            results.append({
+                **rank_info,
+                "ticker": item["ticker"],
+                "title": item["title"],
+                "url": url,
+                "already_sent": True,
+            })
+            continue
+
+        detail = details[url]
 
         # Rhea-AI 우선순위: 상세 → 트렌딩 fallback
         summary_ko = detail["detail"]["summary_ko"]
@@ -672,22 +1168,27 @@ def run_once() -> List[Dict]:
         #     negatives = [translate_text(x, "ko") for x in item["trending_negative"]]
 
         insights = detail["detail"]["insights"] or []
-
-        def _tko(s: Optional[str]) -> str:
-            return translate_text(s, "ko") if s else ""
-        
-        if not summary_ko and summary_en and summary_en.get("text"):
-            summary_ko = {"lang": "ko", "text": _tko(summary_en["text"])}
-        
-        positives_ko = [_tko(x) for x in positives] if positives else []
-        negatives_ko = [_tko(x) for x in negatives] if negatives else []
-        insights_ko = [_tko(x) for x in insights] if insights else []
-
-        results.append({
-            "rank": item["rank"],
+        title = detail["title"] or item["title"]
+
+        # 제목 + 요약 + 불릿 전부를 GPT 요청 1번으로 번역 (순서: 제목, 요약, 긍정, 부정, 인사이트)
+        need_summary = not summary_ko and summary_en and summary_en.get("text")
+        texts = [title] + ([summary_en["text"]] if need_summary else []) + positives + negatives + insights
+        translated, llm_calls = translate_batch_with_gpt4omini(texts, "ko")
+        translated = iter(translated)
+        title_ko = next(translated)
+        if need_summary:
+            summary_ko = {"lang": "ko", "text": next(translated)}
+        positives_ko = [next(translated) for _ in positives]
+        negatives_ko = [next(translated) for _ in negatives]
+        insights_ko = [next(translated) for _ in insights]
+
+        results.append(LazyRecord({
+            **rank_info,
             "ticker": item["ticker"],
-            "title": detail["title"] or item["title"],
+            "title": title,
+            "title_ko": title_ko,
             "url": url,
+            "already_sent": False,
             "published_at": detail["published_at"],
             "source_url": detail["source_url"],
             # 원문/영문 기반 블록
@@ -706,10 +1207,16 @@ def run_once() -> List[Dict]:
                 "insights": insights_ko         # list[str] (ko)
             },
 
-            "body": detail["body"],               # 섹션 리스트
-            "is_new_in_rank": url in new_ids,     # 이번 주기에서 새로 진입했는가?
-            "captured_at": datetime.now(timezone.utc).isoformat()
-        })
+            "llm_calls": llm_calls,               # 이 기사 처리에 든 GPT 호출 수
+        }, lazy={
+            "body": lambda detail=detail: detail["body"],   # 섹션 리스트 (메시지에 안 쓰임 → 읽을 때 계산)
+        }))
+
+    if skipped_fetches:
+        logging.info(f"이미 전송한 {skipped_fetches}건 건너뜀 → 상세 fetch {skipped_fetches}회, "
+                     f"GPT 호출 {skipped_llm_calls}회 절약")
+    metrics.inc("items_total", skipped_fetches, kind="detail_fetch_skipped")
+    metrics.inc("items_total", skipped_llm_calls, kind="llm_call_skipped")
 
     # 마지막에 Top7 URL 세트 갱신
     save_curr_ids(curr_ids)
@@ -724,32 +1231,24 @@ def build_tg_message(d: Dict) -> str:
 
 def send_to_telegram(message: str):
     try:
-        send_text_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-
-        response = requests.post(
-            send_text_url,
-            data={
-                "chat_id": TELEGRAM_CHANNEL_ID,
-                "text": message
-            },
-            timeout=TELEGRAM_TIMEOUT,
-        )
-        response.raise_for_status()
-        print("✅ 텍스트 전송 완료")
-    
-    except (RequestException, Timeout) as e:
-        print("❌ 전송 실패(네트워크/타임아웃):", e)
-        print("📦 실패한 메시지:", message[:300], "...")
-
+        # outbox(디스크 대기열)에 넣고 바로 반환 → 전송/재시도는 outbox 워커가 담당
+        enqueue_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID, message, source="stocktitan")
+        print("📮 전송 대기열 등록")
     except Exception as e:
-        print("❌ 전송 실패(기타):", e)
+        print("❌ 전송 대기열 등록 실패:", e)
         print("📦 실패한 메시지:", message[:300], "...")
 
 if __name__ == "__main__":
+    # 상세 페이지 추출 벤치마크만 실행하려면 (저장해 둔 HTML 경로 목록, 또는 live=True면 현재 Top7을 받아서 비교)
+    # import glob; benchmark_detail_parse(sorted(glob.glob("tests/fixtures/stocktitan/*.html"))); raise SystemExit
+    get_outbox().start()  # 이전 실행에서 못 보낸 텔레그램 메시지 이어서 전송
+    metrics.start_exporter("stocktitan")  # metrics/stocktitan.prom (+ METRICS_PORT 설정 시 /metrics)
 
     while True:
         try:
-            data = run_once()
+            with metrics.timer("cycle"):
+                data = run_once()
+            logging.info("번역 캐시: %s", get_translation_cache().stats())
 
             new_items = get_unseen_items(data)
 
@@ -760,6 +1259,7 @@ if __name__ == "__main__":
                 continue
 
             sent_urls_batch = []  # 이번 사이클에 실제 전송된 URL 누적
+            sent_llm_calls = {}   # URL별 GPT 호출 수 (다음 사이클부터 건너뛰면 절약량으로 집계)
 
             # 콘솔 출력(요약)
             for d in new_items:
@@ -785,7 +1285,7 @@ if __name__ == "__main__":
                     f"{_bullets(insights)}"
                 )
 
-                title_ko = translate_text(title, "ko")
+                title_ko = d.get("title_ko") or translate_text(title, "ko")
                 rs_ko = (d.get("rhea_ai_ko") or {}).get("summary") or {}
                 summary_text_ko = _truncate(rs_ko.get("text", ""))
                 positives_ko = (d.get("rhea_ai_ko") or {}).get("positive") or []
@@ -810,15 +1310,17 @@ if __name__ == "__main__":
                 # combined = f"{msg}\n\n{'─'*24}\n\n{msg_ko}"
 
                 send_to_telegram(msg_ko)
+                metrics.inc("items_total", kind="article_sent")
 
                 #send_to_telegram(msg)
 
                 # ③ 전송 성공한 URL을 배치에 모아둠
                 sent_urls_batch.append(d["url"])
+                sent_llm_calls[d["url"]] = d.get("llm_calls", 0)
 
             # ④ 한 번에 recent_urls 업데이트(중복 방지, 최대 100)
             if sent_urls_batch:
-                add_recent_seen(sent_urls_batch)
+                add_recent_seen(sent_urls_batch, sent_llm_calls)
                 
                 # # ─────────────────────────────
                 # # ① 제목
@@ -867,8 +1369,10 @@ if __name__ == "__main__":
 
         except KeyboardInterrupt:
             print("\n⏹️ Stopped by user.")
+            metrics.stop_exporter()
             break
         except Exception as e:
+            metrics.inc("failures_total", stage="cycle")
             logging.exception("cycle error")   # 전체 스택 출력
             # 에러 시도 조용히 대기 후 재시도 (원하면 로그로 바꿔도 됨)
             # print(f"[WARN] cycle error: {e}")
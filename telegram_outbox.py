@@ -0,0 +1,498 @@
+# telegram_outbox.py
+# 모든 봇/크롤러가 함께 쓰는 텔레그램 전송 대기열(outbox)
+# - 보낼 메시지는 먼저 SQLite 파일(spool)에 적고 바로 반환 → 전송이 느려도 크롤링은 멈추지 않음
+# - 백그라운드 워커가 채팅별/봇 전체 전송 간격을 지키며 오래된 것부터 전송
+# - 429 응답의 retry_after를 그대로 따르고, 네트워크/5xx 오류는 지수 백오프로 재시도
+# - 프로세스가 죽어도 spool에 남은 항목은 다음 시작 때 이어서 전송
+# - 한 번 보낸 이미지 URL은 텔레그램 file_id를 기억해 두었다가 재사용 (텔레그램이 다시 내려받지 않음)
+import os
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import requests
+
+import metrics
+from http_session import get_session
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTBOX_PATH = os.path.join(BASE_DIR, "telegram_outbox.sqlite3")
+
+CHAT_MIN_INTERVAL = 3.0        # 같은 채팅(채널)으로 보내는 최소 간격(초) → 채널/그룹 분당 20건 제한
+GLOBAL_MIN_INTERVAL = 1 / 25   # 같은 봇이 보내는 최소 간격(초) → 봇 전체 초당 30건 제한보다 약간 여유
+SEND_TIMEOUT = 15              # 텔레그램 API 요청 타임아웃(초)
+MAX_ATTEMPTS = 8               # 이 횟수를 넘게 실패하면 dead 처리 (429는 횟수에 포함하지 않음)
+BACKOFF_BASE = 2.0             # 재시도 대기 = BACKOFF_BASE * 2^(시도 횟수-1) (+지터)
+BACKOFF_MAX = 600.0            # 재시도 대기 상한(초)
+SENDING_STALE = 120            # 'sending' 상태로 이만큼 지나면 보내다 죽은 것으로 보고 다시 대기열로
+DEAD_RETENTION = 7 * 24 * 3600 # dead 항목 보관 기간(초)
+IDLE_POLL = 1.0                # 보낼 게 없을 때 spool을 다시 확인하는 간격(초, 다른 프로세스가 넣은 항목 포함)
+FILE_ID_MAX_ENTRIES = 5000     # 기억할 (봇, 이미지 URL) → file_id 최대 개수 (넘으면 오래 안 쓴 것부터 삭제)
+
+class FileIdCache:
+    """
+    (봇 토큰, 원본 이미지 URL) → 텔레그램 file_id.
+    outbox spool과 같은 SQLite 파일의 별도 테이블에 저장 → 재시작/다른 프로세스와도 공유.
+    file_id는 봇마다 다르므로 토큰도 키에 포함한다.
+    """
+    def __init__(self, conn_factory, max_entries: int = FILE_ID_MAX_ENTRIES):
+        self._conn = conn_factory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS file_ids ("
+            " token TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " file_id TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (token, source))"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_file_ids_last_used ON file_ids(last_used)")
+
+    def lookup(self, token: str, sources: List[str]) -> dict:
+        """찾은 것만 {source: file_id}로 반환하고 last_used 갱신"""
+        found = {}
+        conn = self._conn()
+        for src in sources:
+            row = conn.execute(
+                "SELECT file_id FROM file_ids WHERE token = ? AND source = ?", (token, src)
+            ).fetchone()
+            if row:
+                found[src] = row[0]
+        if found:
+            now = time.time()
+            conn.executemany(
+                "UPDATE file_ids SET last_used = ? WHERE token = ? AND source = ?",
+                [(now, token, src) for src in found],
+            )
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(sources) - len(found)
+        if found:
+            metrics.inc("cache_hits_total", len(found), cache="telegram_file_id")
+        if len(sources) > len(found):
+            metrics.inc("cache_misses_total", len(sources) - len(found), cache="telegram_file_id")
+        return found
+
+    def remember(self, token: str, pairs: dict):
+        if not pairs:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO file_ids (token, source, file_id, last_used) VALUES (?, ?, ?, ?)",
+            [(token, src, fid, now) for src, fid in pairs.items()],
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM file_ids").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM file_ids WHERE rowid IN (SELECT rowid FROM file_ids ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def forget(self, token: str, sources: List[str]):
+        self._conn().executemany(
+            "DELETE FROM file_ids WHERE token = ? AND source = ?", [(token, src) for src in sources]
+        )
+
+    def stats(self) -> dict:
+        (entries,) = self._conn().execute("SELECT COUNT(*) FROM file_ids").fetchone()
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+def _media_sources(method: str, payload: dict) -> List[str]:
+    """payload에서 URL로 지정된 이미지 목록 (file_id로 이미 지정된 것은 제외)"""
+    if method == "sendPhoto":
+        photo = payload.get("photo")
+        return [photo] if isinstance(photo, str) and photo.startswith("http") else []
+    if method == "sendMediaGroup":
+        return [m["media"] for m in payload.get("media", [])
+                if m.get("type") == "photo" and str(m.get("media", "")).startswith("http")]
+    return []
+
+def _with_file_ids(method: str, payload: dict, file_ids: dict) -> dict:
+    """URL 자리에 file_id를 넣은 payload 사본"""
+    if method == "sendPhoto":
+        return dict(payload, photo=file_ids.get(payload["photo"], payload["photo"]))
+    media = [dict(m, media=file_ids.get(m.get("media"), m.get("media"))) for m in payload.get("media", [])]
+    return dict(payload, media=media)
+
+def _sent_file_ids(method: str, payload: dict, body: dict) -> dict:
+    """전송 응답에서 {원본 URL: file_id} 추출 (사진은 가장 큰 해상도의 file_id 사용)"""
+    result = body.get("result")
+    if method == "sendPhoto":
+        messages, media = [result], [{"type": "photo", "media": payload.get("photo")}]
+    elif method == "sendMediaGroup":
+        messages, media = result or [], payload.get("media", [])
+    else:
+        return {}
+    pairs = {}
+    for m, msg in zip(media, messages):
+        src = m.get("media")
+        photos = (msg or {}).get("photo") or []
+        if m.get("type") == "photo" and isinstance(src, str) and src.startswith("http") and photos:
+            pairs[src] = photos[-1]["file_id"]
+    return pairs
+
+class TelegramOutbox:
+    """
+    텔레그램 Bot API 호출(sendMessage/sendPhoto/sendMediaGroup 등)의 디스크 기반 대기열.
+    - enqueue()/enqueue_many()는 spool에 기록만 하고 즉시 반환
+    - 같은 (봇, 채팅) 안에서는 넣은 순서대로만 전송 (앞 항목이 재시도 대기 중이면 뒤 항목도 대기)
+    - 전송 간격/retry_after 정보도 spool 파일에 두어 여러 프로세스가 같은 파일을 써도 함께 지켜짐
+    """
+    def __init__(self, path: str = OUTBOX_PATH, chat_interval: float = CHAT_MIN_INTERVAL,
+                 global_interval: float = GLOBAL_MIN_INTERVAL, session=None):
+        self.path = path
+        self.chat_interval = chat_interval
+        self.global_interval = global_interval
+        self.session = session or get_session()
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+        self._ensure_schema()
+        self.file_ids = FileIdCache(self._conn)
+        self._replay = self.pending_count()  # 이전 실행에서 못 보내고 남은 항목 수
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드마다 따로 사용, 트랜잭션은 직접 관리(BEGIN IMMEDIATE)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self):
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " token TEXT NOT NULL,"
+            " chat_id TEXT NOT NULL,"
+            " method TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " as_json INTEGER NOT NULL DEFAULT 0,"
+            " source TEXT,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " claimed_at REAL,"
+            " created_at REAL NOT NULL,"
+            " last_error TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_chat ON outbox(token, chat_id, status, id)")
+        # 전송 가능 시각: key = '<token>:<chat_id>' (채팅별) 또는 '<token>:*' (봇 전체)
+        conn.execute("CREATE TABLE IF NOT EXISTS pace (key TEXT PRIMARY KEY, next_allowed_at REAL NOT NULL)")
+
+    # ───────────── 생산자 쪽 ─────────────
+    def enqueue(self, token: str, chat_id, method: str, payload: dict,
+                as_json: bool = False, source: str = "") -> int:
+        """API 호출 하나를 spool에 기록하고 id 반환"""
+        return self.enqueue_many(token, chat_id, [(method, payload, as_json)], source=source)[0]
+
+    def enqueue_many(self, token: str, chat_id, calls: Iterable[Tuple[str, dict, bool]],
+                     source: str = "") -> List[int]:
+        """
+        한 메시지를 이루는 여러 호출(예: 사진 → 긴 본문)을 한 트랜잭션으로 기록.
+        같은 채팅 안에서는 이 순서 그대로 전송된다.
+        """
+        now = time.time()
+        ids = []
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for method, payload, as_json in calls:
+                cur = conn.execute(
+                    "INSERT INTO outbox (token, chat_id, method, payload, as_json, source, next_attempt_at, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (token, str(chat_id), method, json.dumps(payload, ensure_ascii=False),
+                     1 if as_json else 0, source, now, now),
+                )
+                ids.append(cur.lastrowid)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.start()
+        self._wakeup.set()
+        return ids
+
+    # ───────────── 전송 워커 ─────────────
+    def start(self):
+        """전송 워커 시작 (이미 떠 있으면 무시). 시작하면 spool에 남아 있던 항목부터 다시 보낸다."""
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        if self._replay:
+            logging.info(f"[outbox] 이전 실행에서 남은 {self._replay}건 전송 재개")
+            self._replay = 0
+        while not self._stop.is_set():
+            try:
+                item, wait = self._claim()
+            except Exception as e:
+                logging.warning(f"[outbox] spool 조회 실패: {e}")
+                item, wait = None, IDLE_POLL
+            if item is None:
+                self._wakeup.wait(min(wait, IDLE_POLL))
+                self._wakeup.clear()
+                continue
+            try:
+                self._deliver(item)
+            except Exception as e:
+                # 워커는 하나뿐 → 어떤 오류든 항목만 백오프 재시도로 돌리고 루프는 계속
+                logging.exception(f"[outbox] 전송 처리 중 오류 (id={item['id']})")
+                try:
+                    self._retry(item, f"처리 오류: {e!r}")
+                except Exception as e2:
+                    # 기록도 실패(DB 잠김 등) → 'sending'으로 남은 항목은 SENDING_STALE 뒤 다시 대기열로
+                    logging.warning(f"[outbox] 재시도 기록 실패 (id={item['id']}): {e2}")
+                    self._stop.wait(IDLE_POLL)
+
+    def _claim(self):
+        """
+        지금 보낼 수 있는 항목 하나를 'sending'으로 잡아 반환. (item, None) 또는 (None, 다음 확인까지 대기 초)
+        - 채팅마다 가장 오래된 미전송 항목만 후보 (순서 보장)
+        - 채팅/봇 전송 간격을 같은 트랜잭션에서 확인·갱신 (여러 프로세스 간에도 안전)
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 보내다 죽은 항목은 다시 대기열로
+            conn.execute(
+                "UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND claimed_at < ?",
+                (now - SENDING_STALE,),
+            )
+            purged = conn.execute(
+                "DELETE FROM outbox WHERE status = 'dead' AND created_at < ?", (now - DEAD_RETENTION,)
+            ).rowcount
+            if purged:
+                logging.warning(f"[outbox] 보관 기간이 지난 전송 포기 항목 {purged}건 삭제")
+            rows = conn.execute(
+                "SELECT o.id, o.token, o.chat_id, o.method, o.payload, o.as_json, o.attempts, o.source,"
+                "       o.created_at, o.next_attempt_at,"
+                "       COALESCE((SELECT next_allowed_at FROM pace WHERE key = o.token || ':' || o.chat_id), 0),"
+                "       COALESCE((SELECT next_allowed_at FROM pace WHERE key = o.token || ':*'), 0)"
+                " FROM outbox o"
+                " WHERE o.status = 'pending'"
+                "   AND o.id = (SELECT MIN(id) FROM outbox"
+                "               WHERE token = o.token AND chat_id = o.chat_id AND status IN ('pending', 'sending'))"
+                " ORDER BY o.id"
+            ).fetchall()
+            wait = IDLE_POLL
+            for (item_id, token, chat_id, method, payload, as_json, attempts, source,
+                 created_at, next_attempt_at, chat_allowed, bot_allowed) in rows:
+                ready_at = max(next_attempt_at, chat_allowed, bot_allowed)
+                if ready_at > now:
+                    wait = min(wait, ready_at - now)
+                    continue
+                conn.execute("UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?", (now, item_id))
+                self._set_pace(conn, f"{token}:{chat_id}", now + self.chat_interval)
+                self._set_pace(conn, f"{token}:*", now + self.global_interval)
+                conn.execute("COMMIT")
+                return {
+                    "id": item_id, "token": token, "chat_id": chat_id, "method": method,
+                    "payload": json.loads(payload), "as_json": bool(as_json),
+                    "attempts": attempts, "source": source, "created_at": created_at,
+                }, None
+            conn.execute("COMMIT")
+            return None, max(wait, 0.0)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _set_pace(conn: sqlite3.Connection, key: str, next_allowed_at: float):
+        conn.execute(
+            "INSERT INTO pace (key, next_allowed_at) VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET next_allowed_at = MAX(next_allowed_at, excluded.next_allowed_at)",
+            (key, next_allowed_at),
+        )
+
+    def _deliver(self, item: dict, use_file_ids: bool = True):
+        url = f"https://api.telegram.org/bot{item['token']}/{item['method']}"
+        method, payload = item["method"], item["payload"]
+        sources = _media_sources(method, payload)
+        cached = self.file_ids.lookup(item["token"], sources) if (sources and use_file_ids) else {}
+        if cached:
+            payload = _with_file_ids(method, payload, cached)
+        try:
+            with metrics.timer("telegram_send", method=method):
+                if item["as_json"]:
+                    resp = self.session.post(url, json=payload, timeout=SEND_TIMEOUT)
+                else:
+                    resp = self.session.post(url, data=payload, timeout=SEND_TIMEOUT)
+        except requests.RequestException as e:
+            self._retry(item, f"네트워크 오류: {e}")
+            return
+
+        body = {}
+        try:
+            body = resp.json()
+        except ValueError:
+            pass
+        if not isinstance(body, dict):
+            body = {}
+
+        if resp.status_code == 200:
+            if sources:
+                self.file_ids.remember(item["token"], _sent_file_ids(method, item["payload"], body))
+            self._finish(item)
+            return
+
+        description = body.get("description") or resp.text[:200]
+        if resp.status_code == 400 and cached:
+            # 저장된 file_id가 더 이상 유효하지 않음 → 잊고 원래 URL로 바로 다시 전송
+            self.file_ids.forget(item["token"], list(cached))
+            logging.warning(f"[outbox] file_id 재사용 실패 → URL로 재전송: {description}")
+            self._deliver(item, use_file_ids=False)
+            return
+        if resp.status_code == 429:
+            retry_after = (body.get("parameters") or {}).get("retry_after") or 5
+            self._throttle(item, float(retry_after), description)
+        elif resp.status_code >= 500:
+            self._retry(item, f"HTTP {resp.status_code}: {description}")
+        else:
+            # 400/403 등: 다시 보내도 같은 결과 → 보관만 하고 포기
+            self._give_up(item, f"HTTP {resp.status_code}: {description}")
+
+    def _finish(self, item: dict):
+        conn = self._conn()
+        conn.execute("DELETE FROM outbox WHERE id = ?", (item["id"],))
+        with self._lock:
+            self.sent += 1
+        # 대기열에 들어간 뒤 실제 전송까지 걸린 시간 (간격 제한/429/재시도 대기 포함)
+        metrics.observe("telegram_queue", time.time() - item["created_at"], source=item["source"] or "-")
+        metrics.inc("items_total", kind="telegram_sent", source=item["source"] or "-")
+        logging.info(f"[outbox] ✅ 텔레그램 전송 완료 ({item['method']}, id={item['id']})")
+
+    def _throttle(self, item: dict, retry_after: float, description: str):
+        """429: 해당 채팅 전체를 retry_after 동안 멈추고 같은 항목을 다시 대기 (시도 횟수는 그대로)"""
+        until = time.time() + retry_after
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._set_pace(conn, f"{item['token']}:{item['chat_id']}", until)
+            conn.execute(
+                "UPDATE outbox SET status = 'pending', next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (until, f"429: {description}", item["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.retried += 1
+        metrics.inc("items_total", kind="telegram_throttled", source=item["source"] or "-")
+        logging.warning(f"[outbox] ⏳ 텔레그램 429 → {retry_after:.0f}초 후 재전송 (id={item['id']})")
+
+    def _retry(self, item: dict, error: str):
+        attempts = item["attempts"] + 1
+        if attempts >= MAX_ATTEMPTS:
+            self._give_up(item, error)
+            return
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (attempts - 1))) * random.uniform(0.8, 1.2)
+        self._conn().execute(
+            "UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (attempts, time.time() + delay, error, item["id"]),
+        )
+        with self._lock:
+            self.retried += 1
+        metrics.inc("items_total", kind="telegram_retried", source=item["source"] or "-")
+        logging.warning(f"[outbox] ⚠️ 전송 실패({attempts}/{MAX_ATTEMPTS}) → {delay:.1f}초 후 재시도: {error}")
+
+    def _give_up(self, item: dict, error: str):
+        self._conn().execute(
+            "UPDATE outbox SET status = 'dead', attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (error, item["id"]),
+        )
+        with self._lock:
+            self.dead += 1
+        metrics.inc("items_total", kind="telegram_dead", source=item["source"] or "-")
+        text = item["payload"].get("text") or item["payload"].get("caption") or ""
+        logging.error(f"[outbox] ❌ 전송 포기({item['method']}, id={item['id']}): {error}")
+        logging.error("📦 실패한 메시지 일부: %s", text[:200])
+
+    # ───────────── 상태/종료 ─────────────
+    def pending_count(self) -> int:
+        (count,) = self._conn().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'sending')"
+        ).fetchone()
+        return count
+
+    def stats(self) -> dict:
+        try:
+            pending = self.pending_count()
+            (dead_total,) = self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status = 'dead'").fetchone()
+            file_ids = self.file_ids.stats()
+        except sqlite3.Error:
+            pending = dead_total = file_ids = None
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "retried": self.retried,
+                "dead": self.dead,
+                "pending": pending,
+                "dead_in_spool": dead_total,
+                "file_ids": file_ids,
+            }
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """남은 항목이 다 나갈 때까지(최대 timeout초) 대기. 다 나갔으면 True"""
+        self.start()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if not self.pending_count():
+                return True
+            self._wakeup.set()
+            time.sleep(0.2)
+        return not self.pending_count()
+
+    def close(self, timeout: float = 10.0):
+        """남은 항목을 잠시 보내 보고 워커 종료 (못 보낸 항목은 spool에 남아 다음 실행 때 전송)"""
+        self.flush(timeout)
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker:
+            self._worker.join(timeout=5)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_default_outbox = None
+_default_outbox_lock = threading.Lock()
+
+def get_outbox() -> TelegramOutbox:
+    """프로세스 공용 outbox 인스턴스 (지연 생성)"""
+    global _default_outbox
+    with _default_outbox_lock:
+        if _default_outbox is None:
+            _default_outbox = TelegramOutbox()
+        return _default_outbox
+
+def enqueue_message(token: str, chat_id, text: str, source: str = "") -> Optional[int]:
+    """sendMessage 한 건을 대기열에 넣는 단축 함수"""
+    if not token or not chat_id:
+        logging.warning("[outbox] TELEGRAM_BOT_TOKEN 또는 TELEGRAM_CHANNEL_ID 미설정")
+        return None
+    return get_outbox().enqueue(token, chat_id, "sendMessage", {"chat_id": chat_id, "text": text}, source=source)
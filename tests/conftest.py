@@ -0,0 +1,19 @@
+# tests/conftest.py
+# 저장소 루트의 모듈(flat 구조)을 import할 수 있게 하고, import 시점에 필요한 환경 변수를 채운다
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test")  # OpenAI 클라이언트는 키가 없으면 생성 단계에서 실패
+
+@pytest.fixture
+def last_ids(tmp_path, monkeypatch):
+    """X 봇 last_id 저장소를 임시 파일로 바꿔 끼움 (테스트끼리/실제 x_last_ids.json과 분리)"""
+    import auto_x_to_telegram_v2 as bot
+    monkeypatch.setattr(bot, "LAST_ID_JSON_PATH", str(tmp_path / "x_last_ids.json"))
+    store = bot.LastIdStore(flush_interval=3600)
+    monkeypatch.setattr(bot, "last_id_store", store)
+    yield store
+    store.close()
@@ -0,0 +1,111 @@
+# tests/test_stocktitan_detail.py
+# 단일 순회 추출기(extract_detail_fields)가 저장해 둔 StockTitan 상세 페이지에서
+# 예전 다중 순회 경로(extract_detail_fields_legacy)와 필드 하나하나까지 같은 결과를 내는지 확인
+import json
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import stocktitan_trending_crawler as st
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "stocktitan")
+FIXTURES = sorted(os.path.join(FIXTURE_DIR, name) for name in os.listdir(FIXTURE_DIR) if name.endswith(".html"))
+
+def _soup(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return BeautifulSoup(f.read(), "html.parser")
+
+def test_fixtures_present():
+    assert len(FIXTURES) >= 3
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_single_pass_matches_legacy(path):
+    soup = _soup(path)
+    legacy = st.extract_detail_fields_legacy(soup)
+    single = st.extract_detail_fields(soup).resolve()
+    assert st.diff_detail_fields(legacy, single) == {}
+    assert single == legacy
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_fixture_fields_not_empty(path):
+    # 비교가 빈 값끼리의 일치로 끝나지 않도록, 페이지마다 주요 필드가 실제로 채워지는지 확인
+    fields = st.extract_detail_fields(_soup(path))
+    assert fields["title"]
+    assert fields["published_at"]
+    assert fields["source_url"].startswith("http")
+    assert fields["body"]
+
+def test_rhea_fields_from_fixture():
+    fields = st.extract_detail_fields(_soup(os.path.join(FIXTURE_DIR, "acme_earnings.html")))
+    rhea = fields["rhea"]
+    assert rhea["summary_ko"]["lang"] == "ko"
+    assert rhea["summary_en"]["text"].startswith("ACME reported")
+    assert len(rhea["positive"]) == 3  # 중복 li 제거
+    assert len(rhea["negative"]) == 2
+    assert len(rhea["insights"]) == 2  # 빈 문단 제외
+
+def test_nested_rhea_and_special_strings():
+    # 중첩/중복 Rhea 컨테이너, 본문 안 <script>/<style>/<template>: 첫 컨테이너만, 특수 문자열은 제외
+    fields = st.extract_detail_fields(_soup(os.path.join(FIXTURE_DIR, "nested_rhea_containers.html")))
+    rhea = fields["rhea"]
+    assert rhea["summary_ko"]["text"] == "오빗랩스가 4천만 달러 규모 유상증자 가격을 확정했다."
+    assert rhea["summary_en"]["text"] == "Orbit Labs priced a $40 million public offering at $4.00 per share."
+    assert rhea["positive"] == [
+        "Strengthens cash runway into 2027",
+        "Offering priced near market",
+        "Nested positive inside another positive box",
+    ]
+    assert rhea["negative"] == ["Dilution of about 18% for existing holders", "Priced at a 9% discount"]
+    assert "Takeaway paragraph after template." in rhea["insights"]
+    texts = [block["text"] for block in fields["body"]]
+    assert texts[0].endswith("underwritten public offering.")
+    assert "Shares: 10,000,000 common shares" in texts
+    assert not any("Second container" in t or "second article" in t for t in texts)
+    assert not any("{" in t for t in texts)
+
+def test_benchmark_requires_paths():
+    with pytest.raises(ValueError):
+        st.benchmark_detail_parse()
+    result = st.benchmark_detail_parse(FIXTURES, repeat=1)
+    assert result["pages"] == len(FIXTURES)
+
+def test_body_is_lazy():
+    fields = st.extract_detail_fields(_soup(FIXTURES[0]))
+    # 계산 전: in/keys/len/dict()/JSON 모두 body 없음으로 일치
+    assert "body" not in fields
+    assert "body" not in fields.keys()
+    assert "body" not in dict(fields)
+    assert "body" not in json.loads(json.dumps(fields))
+    assert len(fields) == len(list(fields))
+    assert fields.get("body") == fields.resolve()["body"]
+    # 계산 후: 모두 body 있음
+    assert "body" in fields and "body" in dict(fields) and "body" in json.loads(json.dumps(fields))
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+def test_run_once_record_round_trips_with_body(monkeypatch, tmp_path):
+    path = os.path.join(FIXTURE_DIR, "acme_earnings.html")
+    with open(path, "r", encoding="utf-8") as f:
+        page = f.read()
+    url = "https://www.stocktitan.net/news/ACME/acme-earnings.html"
+    monkeypatch.setattr(st, "STATE_FILE", str(tmp_path / "state.json"))
+    monkeypatch.setattr(st, "fetch_trending_top7",
+                        lambda: [{"rank": 1, "title": "ACME", "ticker": "ACME", "url": url}])
+    monkeypatch.setattr(st.session, "get", lambda *a, **kw: _FakeResponse(page))
+    monkeypatch.setattr(st, "translate_batch_with_gpt4omini", lambda texts, target_lang="ko": (list(texts), 0))
+
+    [record] = st.run_once()
+    assert isinstance(record, st.LazyRecord)
+    assert "body" not in record
+
+    resolved = record.resolve()
+    expected_body = st.extract_detail_fields(_soup(path)).resolve()["body"]
+    assert resolved["body"] == expected_body
+    assert json.loads(json.dumps(record, ensure_ascii=False)) == json.loads(json.dumps(resolved, ensure_ascii=False))
+    assert json.loads(json.dumps(resolved))["body"] == expected_body
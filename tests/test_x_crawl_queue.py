@@ -0,0 +1,59 @@
+# tests/test_x_crawl_queue.py
+# X 봇 긴 트윗 크롤링 대기열(DeferredCrawlQueue): 마감 처리/스레드 수, 순차 처리의 비블로킹 — 실제 브라우저 없이 확인
+import threading
+import time
+from types import SimpleNamespace as NS
+
+import pytest
+
+import auto_x_to_telegram_v2 as bot
+
+@pytest.fixture
+def crawls(monkeypatch):
+    """_crawl_with_pool 대체: release 이벤트가 설정될 때까지 막혀 있다가 '<id> full' 반환"""
+    state = NS(release=threading.Event(), started=[])
+
+    def fake_crawl(tweet_id, username):
+        state.started.append(tweet_id)
+        state.release.wait(5)
+        return f"{tweet_id} full"
+
+    monkeypatch.setattr(bot, "_crawl_with_pool", fake_crawl)
+    yield state
+    state.release.set()
+
+def test_result_before_deadline(crawls):
+    q = bot.DeferredCrawlQueue(workers=1)
+    crawls.release.set()
+    assert q.submit(1, "u", deadline=5).result(timeout=5) == "1 full"
+    assert q.expired == 0
+    q.close()
+
+def test_deadlines_share_one_reaper_thread(crawls):
+    q = bot.DeferredCrawlQueue(workers=1)
+    before = threading.active_count()
+    futures = [q.submit(i, "u", deadline=0.2 + i * 0.01) for i in range(20)]
+    # 워커 1 + 감시 스레드 1만 늘어남 (작업마다 타이머 스레드를 만들지 않음)
+    assert threading.active_count() - before <= 2
+    start = time.monotonic()
+    assert [f.result(timeout=2) for f in futures] == [None] * 20  # 첫 작업은 크롤링 중, 나머지는 대기 중 마감
+    assert time.monotonic() - start < 1.5
+    assert q.expired == 20
+    crawls.release.set()
+    time.sleep(0.1)
+    assert crawls.started == [0]  # 마감 지난 작업은 크롤링 생략
+    q.close()
+
+def test_close_resolves_pending_futures(crawls):
+    q = bot.DeferredCrawlQueue(workers=1)
+    fut = q.submit(1, "u", deadline=60)
+    q.close()
+    assert fut.result(timeout=1) is None
+
+def test_sequential_path_does_not_wait_for_crawl(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(bot.crawl_queue, "submit", lambda *a, **kw: submitted.append(a))
+    tweet = NS(id=1, text="x" * (bot.TEXT_LENGTH_THRESHOLD + 10), note_tweet=None)
+    fut = bot.start_full_tweet_text(tweet, "u", crawl=False)
+    assert fut.done() and fut.result() == tweet.text
+    assert submitted == []
@@ -0,0 +1,182 @@
+# tests/test_x_fetch.py
+# X 봇 트윗 수집: 타임라인 따라잡기(iterate_user_tweets), 묶음 검색(fetch_new_tweets_by_search)
+# — 가짜 tweepy 클라이언트로 API 없이 확인
+import re
+import time
+from types import SimpleNamespace as NS
+
+import auto_x_to_telegram_v2 as bot
+
+def _tweet(tweet_id, author_id=None, **fields):
+    fields.setdefault("text", f"tweet {tweet_id}")
+    fields.setdefault("created_at", None)
+    fields.setdefault("attachments", None)
+    fields.setdefault("referenced_tweets", None)
+    return NS(id=tweet_id, author_id=author_id, **fields)
+
+class FakeTimeline:
+    """get_users_tweets: since_id/until_id/max_results/pagination_token을 X API처럼 (최신→과거) 처리"""
+    def __init__(self, ids):
+        self.ids = list(ids)
+        self.calls = []
+
+    def get_users_tweets(self, id, since_id=None, until_id=None, max_results=10, pagination_token=None, **kwargs):
+        self.calls.append({"since_id": since_id, "until_id": until_id, "pagination_token": pagination_token,
+                           "tweet_fields": kwargs.get("tweet_fields")})
+        ids = sorted((i for i in self.ids
+                      if (since_id is None or i > since_id) and (until_id is None or i < until_id)), reverse=True)
+        start = int(pagination_token) if pagination_token else 0
+        page = ids[start:start + max_results]
+        next_token = str(start + max_results) if start + max_results < len(ids) else None
+        return NS(data=[_tweet(i) for i in page] or None, includes={}, meta=NS(next_token=next_token))
+
+def _ids(records):
+    return [t.id for t, _ in records]
+
+def test_catchup_yields_compact_records_oldest_first(last_ids):
+    api = FakeTimeline(range(101, 113))
+    records = list(bot.iterate_user_tweets("u", 100, page_size=5, api_client=api))
+    assert _ids(records) == list(range(101, 113))
+    assert all(isinstance(t, bot.CompactTweet) for t, _ in records)
+    assert "note_tweet" in api.calls[0]["tweet_fields"]
+    assert last_ids.get_cursor("u") is None  # 끝까지 보냈으면 위치 삭제
+
+def test_catchup_drops_oldest_over_backlog(last_ids, caplog):
+    api = FakeTimeline(range(101, 120))
+    records = list(bot.iterate_user_tweets("u", 100, page_size=5, max_backlog=12, api_client=api))
+    assert _ids(records) == list(range(108, 120))
+    assert "최신 12개만" in caplog.text
+
+def test_interrupted_catchup_resumes_from_saved_pages(last_ids):
+    api = FakeTimeline(range(101, 113))
+    gen = bot.iterate_user_tweets("u", 100, page_size=5, api_client=api)
+    first = [next(gen) for _ in range(4)]
+    gen.close()  # 중간에 끊김 (호출 측은 보낸 트윗까지 last_id 저장)
+    cursor = last_ids.get_cursor("u")
+    assert cursor["since_id"] == 100 and len(cursor["pages"]) == 3
+
+    last_ids.flush()  # 위치는 last_id와 같은 파일에 저장 → 재시작해도 남음
+    reloaded = bot.LastIdStore(flush_interval=3600)
+    assert reloaded.get_cursor("u") == cursor
+
+    api.ids += [113, 114]  # 그 사이 새 트윗
+    api.calls.clear()
+    rest = list(bot.iterate_user_tweets("u", _ids(first)[-1], page_size=5, api_client=api))
+    assert _ids(first) + _ids(rest) == list(range(101, 115))
+    assert api.calls[0]["until_id"] is not None  # 처음부터 다시 훑지 않고 남은 페이지만 조회
+    assert last_ids.get_cursor("u") is None
+
+def test_stale_cursor_is_discarded(last_ids):
+    last_ids.set_cursor("u", {"since_id": 500, "page_size": 5, "pages": [[510, 501]]})
+    api = FakeTimeline(range(101, 104))
+    assert _ids(bot.iterate_user_tweets("u", 100, page_size=5, api_client=api)) == [101, 102, 103]
+    assert last_ids.get_cursor("u") is None
+
+def test_compact_tweet_keeps_note_and_refs():
+    tweet = _tweet(1, text="short", attachments={"media_keys": ["m1"]},
+                   referenced_tweets=[NS(type="quoted", id=7)], data={"note_tweet": {"text": "long form"}})
+    compact = bot.compact_tweet(tweet)
+    assert bot.note_tweet_text(compact) == "long form"
+    assert compact.referenced_tweets[0].type == "quoted" and compact.referenced_tweets[0].id == 7
+    assert compact.attachments == {"media_keys": ["m1"]}
+
+
+# ── 묶음 검색 ──────────────────────────────────────────────────────────────
+
+def _snowflake(seconds_ago: float, seq: int = 0) -> int:
+    ms = int((time.time() - seconds_ago) * 1000) - bot.TWITTER_EPOCH_MS
+    return (ms << 22) + seq
+
+class FakeSearch:
+    """search_recent_tweets: 쿼리의 from: 계정, since_id, next_token을 X API처럼 (최신→과거) 처리"""
+    def __init__(self, tweets, names, page_size=None, fail=False):
+        self.tweets = tweets          # [(tweet_id, author_id), ...]
+        self.names = names            # {author_id: username}
+        self.page_size = page_size    # 가짜 응답 페이지 크기 (None이면 max_results)
+        self.fail = fail
+        self.calls = []
+
+    def search_recent_tweets(self, query, since_id=None, max_results=10, next_token=None, **kwargs):
+        self.calls.append({"query": query, "since_id": since_id, "tweet_fields": kwargs.get("tweet_fields")})
+        if self.fail:
+            raise RuntimeError("search down")
+        users = {u.lower() for u in re.findall(r"from:(\w+)", query)}
+        ids = sorted(((i, a) for i, a in self.tweets
+                      if self.names[a].lower() in users and (since_id is None or i > since_id)), reverse=True)
+        size = self.page_size or max_results
+        start = int(next_token) if next_token else 0
+        page = ids[start:start + size]
+        token = str(start + size) if start + size < len(ids) else None
+        return NS(data=[_tweet(i, author_id=int(a)) for i, a in page] or None, includes={}, meta=NS(next_token=token))
+
+def test_build_search_queries_respects_length_limit():
+    names = [f"user{i:02d}" for i in range(40)]
+    groups = bot._build_search_queries(names, max_len=120)
+    assert [n for g in groups for n in g] == names
+    assert all(len(bot._search_query(g)) <= 120 for g in groups)
+    assert bot._search_query(["a", "b"]) == "(from:a OR from:b) -is:retweet -is:reply"
+
+def test_search_filters_each_account_by_its_own_since_id(last_ids):
+    base = [_snowflake(3600, i) for i in range(10)]
+    last_ids.set("1", base[2])
+    last_ids.set("2", base[5])
+    api = FakeSearch([(base[i], "1") for i in range(10)] + [(base[i] + 1, "2") for i in range(10)],
+                     {"1": "alice", "2": "bob"})
+    result = bot.fetch_new_tweets_by_search([("1", "alice"), ("2", "@bob")], api_client=api)
+    assert _ids(result["1"]) == base[3:]
+    assert _ids(result["2"]) == [b + 1 for b in base[5:]]
+    assert api.calls[0]["since_id"] == base[2]  # 묶음 공용 since_id는 가장 작은 값
+    assert "note_tweet" in api.calls[0]["tweet_fields"]
+    assert all(isinstance(t, bot.CompactTweet) for t, _ in result["1"])
+
+def test_unprimed_and_zero_accounts_stay_out_of_search(last_ids):
+    recent = _snowflake(60)
+    last_ids.set("1", recent)
+    last_ids.set("2", 0)  # warm-start 때 트윗 없음 → 타임라인 방식
+    api = FakeSearch([(recent + 10, "1"), (recent + 20, "2"), (recent + 30, "3")],
+                     {"1": "alice", "2": "bob", "3": "carol"})
+    result = bot.fetch_new_tweets_by_search([("1", "alice"), ("2", "bob"), ("3", "carol")], api_client=api)
+    assert set(result) == {"1"}
+    assert _ids(result["1"]) == [recent + 10]
+    assert api.calls[0]["query"].startswith("(from:alice)")
+
+def test_account_older_than_search_window_uses_timeline(last_ids):
+    last_ids.set("1", _snowflake(8 * 24 * 3600))
+    api = FakeSearch([], {"1": "alice"})
+    assert bot.fetch_new_tweets_by_search([("1", "alice")], api_client=api) == {}
+    assert api.calls == []
+
+def test_account_over_backlog_falls_back_to_timeline(last_ids):
+    base = _snowflake(3600)
+    last_ids.set("1", base)
+    last_ids.set("2", base)
+    tweets = [(base + i, "1") for i in range(1, 8)] + [(base + 100, "2")]
+    api = FakeSearch(tweets, {"1": "alice", "2": "bob"})
+    result = bot.fetch_new_tweets_by_search([("1", "alice"), ("2", "bob")], api_client=api, max_backlog=5)
+    assert "1" not in result  # 5개 넘음 → 타임라인 방식이 최신 5개 + 경고 처리
+    assert _ids(result["2"]) == [base + 100]
+
+def test_paging_stopped_before_boundary_falls_back_to_timeline(last_ids):
+    base = _snowflake(3600)
+    last_ids.set("1", base)        # 조용한 계정: 경계가 오래 전
+    last_ids.set("2", base + 500)  # 바쁜 계정
+    tweets = [(base + 500 + i, "2") for i in range(1, 6)] + [(base + 10, "1")]
+    api = FakeSearch(tweets, {"1": "alice", "2": "bob"}, page_size=2)
+    result = bot.fetch_new_tweets_by_search([("1", "alice"), ("2", "bob")], api_client=api, max_backlog=1)
+    # 페이지 상한(2계정 × 1개 → 1페이지)에서 멈춤: bob은 넘쳤고 alice는 경계까지 못 닿음
+    assert result == {}
+    assert len(api.calls) == 1
+
+def test_search_stops_once_every_account_reaches_its_boundary(last_ids):
+    base = _snowflake(3600)
+    last_ids.set("1", base + 8)
+    tweets = [(base + i, "1") for i in range(1, 13)]
+    api = FakeSearch(tweets, {"1": "alice"}, page_size=2)
+    result = bot.fetch_new_tweets_by_search([("1", "alice")], api_client=api)
+    assert _ids(result["1"]) == [base + 9, base + 10, base + 11, base + 12]
+    assert len(api.calls) == 2
+
+def test_failed_group_is_left_to_timeline(last_ids):
+    last_ids.set("1", _snowflake(60))
+    api = FakeSearch([], {"1": "alice"}, fail=True)
+    assert bot.fetch_new_tweets_by_search([("1", "alice")], api_client=api) == {}
@@ -0,0 +1,133 @@
+# tests/test_x_note_tweet.py
+# X 봇 긴 글 전체 텍스트: note_tweet 우선, 브라우저 폴백은 note_tweet이 없을 때만, 경로별 집계,
+# 트윗을 받는 모든 API 호출이 note_tweet 필드를 요청하는지 — 가짜 클라이언트로 확인
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace as NS
+
+import pytest
+
+import auto_x_to_telegram_v2 as bot
+
+LONG = "x" * (bot.TEXT_LENGTH_THRESHOLD + 10)
+
+def _tweet(tweet_id, text, **fields):
+    fields.setdefault("referenced_tweets", None)
+    fields.setdefault("attachments", None)
+    fields.setdefault("created_at", None)
+    return NS(id=tweet_id, text=text, **fields)
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = dict.fromkeys(bot.full_text_stats, 0)
+    monkeypatch.setattr(bot, "full_text_stats", fresh)
+    return fresh
+
+@pytest.fixture
+def crawl_jobs(monkeypatch):
+    """크롤링 대기열 대체: 투입된 (tweet_id, Future)를 기록만 하고 결과는 테스트가 정함"""
+    jobs = []
+
+    def fake_submit(tweet_id, username):
+        fut = Future()
+        jobs.append((tweet_id, fut))
+        return fut
+
+    monkeypatch.setattr(bot.crawl_queue, "submit", fake_submit)
+    return jobs
+
+def test_note_tweet_from_data_is_preferred(stats, crawl_jobs):
+    # tweepy.Tweet은 note_tweet을 data(dict)에만 담기도 함 → data["note_tweet"]["text"]를 사용
+    tweet = _tweet(1, LONG, data={"note_tweet": {"text": "full long-form text"}})
+    assert bot.start_full_tweet_text(tweet, "u").result(timeout=1) == "full long-form text"
+    assert crawl_jobs == []  # note_tweet이 있으면 브라우저 폴백 없음
+    assert stats["note_tweet"] == 1 and stats["browser_fallback"] == 0
+
+def test_note_tweet_attribute_is_preferred(stats, crawl_jobs):
+    tweet = _tweet(1, "short", note_tweet={"text": "attribute long-form"})
+    assert bot.start_full_tweet_text(tweet, "u").result(timeout=1) == "attribute long-form"
+    assert crawl_jobs == []
+
+def test_short_tweet_uses_api_text(stats, crawl_jobs):
+    assert bot.start_full_tweet_text(_tweet(1, "short"), "u").result(timeout=1) == "short"
+    assert crawl_jobs == []
+    assert stats["api_text"] == 1
+
+def test_browser_fallback_only_without_note_tweet(stats, crawl_jobs):
+    fut = bot.start_full_tweet_text(_tweet(7, LONG, data={}), "u")
+    assert [tweet_id for tweet_id, _ in crawl_jobs] == [7]
+    assert stats["browser_fallback"] == 1
+    crawl_jobs[0][1].set_result(LONG + " and the rest")
+    assert fut.result(timeout=1) == LONG + " and the rest"
+    assert stats["browser_longer"] == 1
+
+def test_browser_fallback_keeps_api_text_when_crawl_fails(stats, crawl_jobs):
+    fut = bot.start_full_tweet_text(_tweet(7, LONG), "u")
+    crawl_jobs[0][1].set_result(None)  # 마감 초과/크롤링 실패
+    assert fut.result(timeout=1) == LONG
+    assert stats["browser_longer"] == 0
+
+def test_full_text_stats_count_each_path(stats, crawl_jobs):
+    bot.start_full_tweet_text(_tweet(1, "short"), "u")
+    bot.start_full_tweet_text(_tweet(2, LONG, note_tweet={"text": LONG + "!"}), "u")
+    bot.start_full_tweet_text(_tweet(3, LONG), "u")
+    crawl_jobs[0][1].set_result(LONG + " more")
+    assert bot.get_full_text_stats() == {"api_text": 1, "note_tweet": 1, "browser_fallback": 1, "browser_longer": 1}
+
+# ── 트윗을 받는 API 호출마다 tweet_fields에 note_tweet 포함 ────────────────────
+
+class RecordingClient:
+    def __init__(self, original=None):
+        self.calls = {}
+        self.original = original
+
+    def _record(self, name, kwargs, data=None):
+        self.calls.setdefault(name, []).append(kwargs)
+        return NS(data=data, includes={}, meta=NS(next_token=None))
+
+    def get_users_tweets(self, **kwargs):
+        return self._record("get_users_tweets", kwargs)
+
+    def search_recent_tweets(self, **kwargs):
+        return self._record("search_recent_tweets", kwargs)
+
+    def get_tweets(self, **kwargs):
+        return self._record("get_tweets", kwargs)
+
+    def get_tweet(self, **kwargs):
+        return self._record("get_tweet", kwargs, data=self.original)
+
+def _requests_note_tweet(api, name):
+    return api.calls[name] and all("note_tweet" in call["tweet_fields"] for call in api.calls[name])
+
+def test_get_latest_tweet_requests_note_tweet(monkeypatch):
+    api = RecordingClient()
+    monkeypatch.setattr(bot, "client", api)
+    bot.get_latest_tweet("1", last_id=5)
+    assert _requests_note_tweet(api, "get_users_tweets")
+
+def test_iterate_user_tweets_requests_note_tweet(last_ids):
+    api = RecordingClient()
+    assert list(bot.iterate_user_tweets("1", 5, api_client=api)) == []
+    assert _requests_note_tweet(api, "get_users_tweets")
+
+def test_resolve_missing_originals_requests_note_tweet():
+    api = RecordingClient()
+    retweet = _tweet(2, "RT", referenced_tweets=[NS(type="retweeted", id=1)])
+    bot._resolve_missing_originals([retweet], {}, {}, api)
+    assert _requests_note_tweet(api, "get_tweets")
+
+def test_search_requests_note_tweet(last_ids):
+    recent = (int((time.time() - 60) * 1000) - bot.TWITTER_EPOCH_MS) << 22
+    last_ids.set("1", recent)
+    api = RecordingClient()
+    assert bot.fetch_new_tweets_by_search([("1", "alice")], api_client=api) == {"1": []}
+    assert _requests_note_tweet(api, "search_recent_tweets")
+
+def test_fetch_original_retweet_requests_note_tweet(stats, crawl_jobs):
+    original = _tweet(1, "short original", data={"note_tweet": {"text": "long original"}})
+    api = RecordingClient(original=original)
+    retweet = _tweet(2, "RT", referenced_tweets=[NS(type="retweeted", id=1)])
+    assert bot.fetch_original_retweet(retweet, api, "u") == ("long original", [])
+    assert _requests_note_tweet(api, "get_tweet")
+    assert crawl_jobs == []
@@ -0,0 +1,106 @@
+# tests/test_x_pipeline.py
+# X 봇 TweetPipeline: 계정별 전송 순서(재정렬 버퍼), 큐/in-flight 상한(back-pressure), 실패 시 보류
+# — 보강/번역/전송 단계를 가짜로 바꿔 끼워 네트워크 없이 확인
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace as NS
+
+import pytest
+
+import auto_x_to_telegram_v2 as bot
+
+def _wait_until(cond, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout")
+        time.sleep(0.01)
+
+def _tweet(tweet_id):
+    return NS(id=tweet_id, text=f"tweet {tweet_id}", created_at=None, referenced_tweets=None)
+
+@pytest.fixture
+def stages(monkeypatch, last_ids):
+    """보강: 기본은 바로 완료, held에 넣은 id는 테스트가 Future를 완료할 때까지 대기 / 번역: gate / 전송: 기록"""
+    state = NS(held={}, sent=[], translate_gate=threading.Event())
+    state.translate_gate.set()
+
+    def fake_enrich(tweet, includes, username, crawl=True):
+        if tweet.id in state.held:
+            return state.held[tweet.id]
+        fut = Future()
+        fut.set_result((tweet.text, []))
+        return fut
+
+    def fake_translate(text):
+        state.translate_gate.wait(5)
+        return text
+
+    monkeypatch.setattr(bot, "start_enrich_tweet", fake_enrich)
+    monkeypatch.setattr(bot, "translate_tweet_text", fake_translate)
+    monkeypatch.setattr(bot, "build_tweet_message", lambda full, tr, username, tweet: f"{username}:{tweet.id}")
+    monkeypatch.setattr(bot, "send_to_telegram_with_optional_image", lambda message, urls: state.sent.append(message))
+    yield state
+    state.translate_gate.set()
+
+def test_per_account_order_kept_while_other_accounts_flow(stages, last_ids):
+    p = bot.TweetPipeline(enrich_workers=2, translate_workers=2, queue_size=4, max_in_flight=10)
+    stages.held[1] = Future()  # 계정 a의 첫 트윗: 크롤링 대기 중
+    p.submit("A", "a", _tweet(1), {})
+    p.submit("A", "a", _tweet(2), {})
+    p.submit("B", "b", _tweet(3), {})
+    _wait_until(lambda: "b:3" in stages.sent)
+    time.sleep(0.1)
+    assert stages.sent == ["b:3"]  # a:2는 준비됐어도 a:1 뒤에서 대기
+    assert last_ids.get("A") is None
+
+    stages.held[1].set_result(("tweet 1", []))
+    p.join()
+    assert stages.sent == ["b:3", "a:1", "a:2"]
+    assert last_ids.get("A") == 2 and last_ids.get("B") == 3
+    p.close()
+
+def test_failed_tweet_holds_rest_of_account(stages, last_ids):
+    p = bot.TweetPipeline(enrich_workers=1, translate_workers=1, queue_size=4, max_in_flight=10)
+    last_ids.set("A", 0)
+    stages.held[1] = Future()
+    stages.held[1].set_exception(RuntimeError("enrich failed"))
+    for tweet_id in (1, 2):
+        p.submit("A", "a", _tweet(tweet_id), {})
+    p.join()
+    assert stages.sent == []
+    assert last_ids.get("A") == 0  # 다음 라운드에 실패 지점부터 다시
+    p.close()
+
+def test_bounded_queues_and_in_flight_apply_back_pressure(stages, last_ids):
+    p = bot.TweetPipeline(enrich_workers=1, translate_workers=1, queue_size=1, max_in_flight=3)
+    stages.translate_gate.clear()  # 번역 단계가 막힘
+    for tweet_id in (1, 2, 3):
+        p.submit("A", "a", _tweet(tweet_id), {})
+
+    blocked = threading.Thread(target=p.submit, args=("A", "a", _tweet(4), {}), daemon=True)
+    blocked.start()
+    blocked.join(0.3)
+    assert blocked.is_alive()  # in-flight 상한 → 투입 쪽이 대기
+    assert p._translate_q.qsize() <= 1  # 단계 사이 큐는 크기 제한을 넘지 않음
+
+    stages.translate_gate.set()
+    blocked.join(3)
+    assert not blocked.is_alive()
+    p.join()
+    assert stages.sent == ["a:1", "a:2", "a:3", "a:4"]
+    p.close()
+
+def test_retweet_enrich_does_not_wait_for_crawl(monkeypatch):
+    crawl = Future()
+    monkeypatch.setattr(bot.crawl_queue, "submit", lambda tweet_id, username: crawl)
+    original = NS(id=9, text="o" * (bot.TEXT_LENGTH_THRESHOLD + 10), note_tweet=None,
+                  attachments={"media_keys": ["m1"]})
+    retweet = NS(id=10, text="RT", referenced_tweets=[NS(type="retweeted", id=9)], attachments=None)
+    includes = {"tweets": [original], "media": [{"media_key": "m1", "type": "photo", "url": "https://img/1"}]}
+
+    fut = bot.start_enrich_tweet(retweet, includes, "a")
+    assert not fut.done()  # 보강 워커는 크롤링 결과를 기다리지 않고 바로 다음 트윗으로
+    crawl.set_result("full original text " * 20)
+    assert fut.result(timeout=1) == ("full original text " * 20, ["https://img/1"])
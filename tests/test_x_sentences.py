@@ -0,0 +1,29 @@
+# tests/test_x_sentences.py
+# X 봇 번역 전 문장 분할/조각 나누기 (MyMemory 요청 크기 제한용)
+import auto_x_to_telegram_v2 as bot
+
+def test_abbreviations_do_not_split():
+    text = "Mr. Smith said the U.S. economy grew. J. Powell spoke at 2 p.m. today."
+    assert bot.split_text_into_sentences(text) == [
+        "Mr. Smith said the U.S. economy grew.",
+        "J. Powell spoke at 2 p.m. today.",
+    ]
+
+def test_korean_sentence_ending_in_one_syllable_word():
+    # '다.' / '것.' 처럼 한 글자 단어로 끝나는 한국어 문장도 문장 끝
+    text = "시장은 오늘도 올랐다. 문제는 금리 것. 내일 발표가 핵심 변수다."
+    assert bot.split_text_into_sentences(text) == [
+        "시장은 오늘도 올랐다.",
+        "문제는 금리 것.",
+        "내일 발표가 핵심 변수다.",
+    ]
+
+def test_single_letter_i_ends_sentence():
+    assert bot.split_text_into_sentences("So did I. Then we left.") == ["So did I.", "Then we left."]
+
+def test_korean_chunks_stay_within_limit():
+    text = "가격이 오른 건 수요 때문 것. " * 60
+    chunks = bot.chunk_text_by_sentences(text, 100)
+    assert "".join(chunks) == text
+    assert max(len(c) for c in chunks) <= 100
+    assert all(c.endswith("것. ") for c in chunks)
@@ -0,0 +1,156 @@
+# translation_cache.py
+# X 봇(auto_x_to_telegram_v2.py)과 StockTitan 크롤러가 함께 쓰는 디스크 번역 캐시
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Iterable, Optional, Tuple
+
+import metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "translation_cache.sqlite3")
+CACHE_MAX_ENTRIES = 5000             # 이 개수를 넘으면 가장 오래 안 쓴 항목부터 삭제(LRU)
+CACHE_TTL_SECONDS = 14 * 24 * 3600   # 14일 지난 번역은 만료
+
+class TranslationCache:
+    """
+    (원문, 대상 언어, 엔진) → 번역문 캐시.
+    - SQLite(WAL) 파일에 저장 → 재시작 후에도 유지, 여러 프로세스가 같이 써도 안전
+    - 조회 시 last_used 갱신(LRU), created_at 기준 TTL 만료, 개수 상한 초과분 정리
+    - hits/misses 카운터 제공 (프로세스 단위)
+    원문은 마스킹(이모지/URL 플레이스홀더 치환)이 끝난 텍스트를 넣는다.
+    """
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ensure_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드마다 따로 사용
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self):
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY,"
+                " engine TEXT NOT NULL,"
+                " target TEXT NOT NULL,"
+                " translated TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+
+    @staticmethod
+    def make_key(text: str, target: str, engine: str) -> str:
+        raw = f"{engine}\x00{target}\x00{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, text: str, target: str, engine: str) -> Optional[str]:
+        found = self.get_any(text, target, [engine])
+        return found[0] if found else None
+
+    def get_any(self, text: str, target: str, engines: Iterable[str]) -> Optional[Tuple[str, str]]:
+        """engines 순서대로 찾아 처음 나온 (번역문, 엔진) 반환. 없으면 None."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            for engine in engines:
+                key = self.make_key(text, target, engine)
+                row = conn.execute(
+                    "SELECT translated, created_at FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if not row:
+                    continue
+                translated, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    with conn:
+                        conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                    continue
+                with conn:
+                    conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (now, key))
+                with self._lock:
+                    self.hits += 1
+                metrics.inc("cache_hits_total", cache="translation")
+                return translated, engine
+        except sqlite3.Error as e:
+            logging.warning(f"[translation_cache] 조회 실패: {e}")
+        with self._lock:
+            self.misses += 1
+        metrics.inc("cache_misses_total", cache="translation")
+        return None
+
+    def put(self, text: str, target: str, engine: str, translated: str):
+        if not text or not translated:
+            return
+        now = time.time()
+        key = self.make_key(text, target, engine)
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, engine, target, translated, created_at, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, engine, target, translated, now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logging.warning(f"[translation_cache] 저장 실패: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM translations WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                " SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self) -> dict:
+        try:
+            (entries,) = self._conn().execute("SELECT COUNT(*) FROM translations").fetchone()
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_translation_cache() -> TranslationCache:
+    """프로세스 공용 캐시 인스턴스 (지연 생성)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TranslationCache()
+        return _default_cache